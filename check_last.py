@@ -1,28 +1,23 @@
 import asyncio
 import csv
-from decimal import Decimal
-from eth_account import Account
-from modules import *
-
-import random
-import sys
-import os
-import signal
-from typing import Union
-
-from config import ACCOUNTS, RECIPIENTS
-from settings import (
-    RANDOM_WALLET,
-    SLEEP_TO,
-    SLEEP_FROM,
-    QUANTITY_THREADS,
-    THREAD_SLEEP_FROM,
-    THREAD_SLEEP_TO,
-    REMOVE_WALLET
-)
-from utils.helpers import remove_wallet
-from utils.sleeping import sleep
-from eth_account import Account as EthereumAccount
+import time
+
+from config import (ACCOUNTS,
+                    RECIPIENTS,
+                    SKYDROME_CONTRACTS,
+                    KYBERSWAP_CONTRACTS,
+                    SUSHISWAP_CONTRACTS,
+                    SYNCSWAP_CONTRACTS,
+                    OPENOCEAN_CONTRACTS,
+                    AMBIENT_FINANCE_CONTRACTS,
+                    AAVE_CONTRACT,
+                    LAYERBANK_CONTRACT,
+                    COMPOUND_FINANCE_BULKER_CONTRACT,
+                    SAFE_CONTRACT)
+from settings import CHECK_LAST_CONCURRENCY
+from utils.explorer import explorer_client
+from utils.history import tx_history
+from utils.wallets import wallet_registry
 
 
 def retry(retries: int = 5, delay: float = 1, raise_exception: bool = False):
@@ -75,79 +70,69 @@ def get_wallets(use_recipients: bool = False):
     return wallets
 
 def get_modules():
-    return [Skydrome,
-    KyberSwap,
-    SushiSwap,
-    SyncSwap,
-    OpenOcean,
-    SyncSwap,
-    AmbientFinance,
-    Aave,
-    LayerBank,
-    CompoundFinance,
-    GnosisSafe]
+    # модуль -> контракт, транзакции в который проверяем
+    return {
+        "Skydrome": SKYDROME_CONTRACTS["router"],
+        "KyberSwap": KYBERSWAP_CONTRACTS["router"],
+        "SushiSwap": SUSHISWAP_CONTRACTS["router"],
+        "SyncSwap": SYNCSWAP_CONTRACTS["router"],
+        "OpenOcean": OPENOCEAN_CONTRACTS["router"],
+        "AmbientFinance": AMBIENT_FINANCE_CONTRACTS["router"],
+        "Aave": AAVE_CONTRACT,
+        "LayerBank": LAYERBANK_CONTRACT,
+        "CompoundFinance": COMPOUND_FINANCE_BULKER_CONTRACT,
+        "GnosisSafe": SAFE_CONTRACT,
+    }
+
 
 async def main():
     wallets = get_wallets()
+    modules = get_modules()
 
-    tasks = []
     module_cooldown = 888888888
-    aggregated_results = {}
-    async def _worker(module, account_id, key, recipient):
-            module_instance = module(account_id, key, recipient)
-            last = await module_instance.check_last_iteration(module_cooldown)
-
-            return module_instance.address, module_instance.get_name(), not last
-
-    for _, account in enumerate(wallets, start=1):
-        for module in get_modules():
-            task = asyncio.create_task(_worker(module, account.get("id"), account.get("key"), None))
-            tasks.append(task)
-
-    results = await asyncio.gather(*tasks)
-
-    count_failed = 0
-    count_success = 0
-
-    # Сбор итоговых данных
-    for result in results:
-        if not result:
-            count_failed += 1
-            continue
+    sem = asyncio.Semaphore(CHECK_LAST_CONCURRENCY)
 
-        address, module_name, last = result
+    async def _worker(key):
+        async with sem:
+            address = wallet_registry.get_address(key)
 
-        if address not in aggregated_results:
-            aggregated_results[address] = {}
+            # одна загрузка истории на кошелёк, все модули проверяем по ней
+            actions = await tx_history.get_actions(address, "scroll")
 
-        aggregated_results[address][module_name] = last
-
-        count_success += 1
+            row = {"address": address}
+            for module_name, contract_address in modules.items():
+                last_tx = actions.get(contract_address.lower(), {}).get("last_tx")
+                row[module_name] = last_tx is not None and time.time() - int(last_tx["timeStamp"]) < module_cooldown
 
-    print(f"Успешно сделали {count_success} запросов, не смогли получить для {count_failed}")
+            return row
 
-    # Порядок столбцов в CSV файле (добавляем название модулей
-    fieldnames = ["address"]
-    for module in get_modules():
-        module_instance = module(wallets[0].get("id"), wallets[0].get("key"), None)
-        module_name = module_instance.get_name()
-        fieldnames.append(module_name)
+    tasks = [asyncio.create_task(_worker(account.get("key"))) for account in wallets]
 
+    count_failed = 0
     count_rows = 0
 
-    # Запись результатов в CSV файл
+    # Запись результатов в CSV файл по мере готовности
     with open("accounts_stat.csv", "w", newline="") as csvfile:
-        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+        writer = csv.DictWriter(csvfile, fieldnames=["address", *modules])
         writer.writeheader()
-        for address, modules_result in aggregated_results.items():
-            row = {"address": address}
-            for module_name, result in modules_result.items():
-                row[module_name] = result
+
+        for task in asyncio.as_completed(tasks):
+            try:
+                row = await task
+            except Exception as e:
+                print(f"Не смогли получить статус: {e}")
+                count_failed += 1
+                continue
+
             writer.writerow(row)
+            csvfile.flush()
             count_rows += 1
 
+    print(f"Успешно сделали {count_rows} запросов, не смогли получить для {count_failed}")
     print(f"Успешно записано {count_rows} строк")
 
+    await explorer_client.close()
+
 
 if __name__ == "__main__":
     asyncio.run(main())
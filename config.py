@@ -1,8 +1,11 @@
 import json
 import os
+import marshal
 from dotenv import load_dotenv
+from eth_utils import is_hex_address
 from web3 import Web3
 
+from settings import ABI_CACHE_DIR
 from utils.helpers import find_duplicate_in_dict
 
 load_dotenv()
@@ -10,8 +13,56 @@ load_dotenv()
 with open('data/rpc.json') as file:
     RPC = json.load(file)
 
-with open('data/abi/erc20_abi.json') as file:
-    ERC20_ABI = json.load(file)
+# ABI загружаются при первом обращении (from config import X_ABI), см. __getattr__ ниже
+ABI_FILES = {
+    "ERC20_ABI": "data/abi/erc20_abi.json",
+    "DEPOSIT_ABI": "data/abi/bridge/deposit.json",
+    "DEPOSIT_ECONOMY_ABI": "data/abi/bridge/deposit_economy.json",
+    "WITHDRAW_ABI": "data/abi/bridge/withdraw.json",
+    "ORACLE_ABI": "data/abi/bridge/oracle.json",
+    "WETH_ABI": "data/abi/scroll/weth.json",
+    "SYNCSWAP_ROUTER_ABI": "data/abi/syncswap/router.json",
+    "SYNCSWAP_CLASSIC_POOL_ABI": "data/abi/syncswap/classic_pool.json",
+    "SYNCSWAP_CLASSIC_POOL_DATA_ABI": "data/abi/syncswap/classic_pool_data.json",
+    "SKYDROME_ROUTER_ABI": "data/abi/skydrome/abi.json",
+    "SUSHISWAP_ROUTER_ABI": "data/abi/sushiswap/abi.json",
+    "KYBERSWAP_ROUTER_ABI": "data/abi/kyberswap/abi.json",
+    "ODOS_ROUTER_ABI": "data/abi/odos/abi.json",
+    "AMBIENT_FINANCE_ROUTER_ABI": "data/abi/ambient_finance/abi_cmd.json",
+    "RSETH_ABI": "data/abi/rseth/abi.json",
+    "AMBIENT_FINANCE_CROC_ABI": "data/abi/ambient_finance/abi_croc.json",
+    "ZEBRA_ROUTER_ABI": "data/abi/zebra/abi.json",
+    "AAVE_ABI": "data/abi/aave/abi.json",
+    "RHOMARKETS_ABI": "data/abi/rhomarkets/abi.json",
+    "COMPOUND_FINANCE_BULKER_ABI": "data/abi/compound_finance/abi_bulker.json",
+    "COMPOUND_FINANCE_COMET_ABI": "data/abi/compound_finance/abi_comet.json",
+    "LAYERBANK_ABI": "data/abi/layerbank/abi.json",
+    "ZERIUS_ABI": "data/abi/zerius/abi.json",
+    "L2PASS_ABI": "data/abi/l2pass/abi.json",
+    "DMAIL_ABI": "data/abi/dmail/abi.json",
+    "OPENOCEAN_ROUTER_ABI": "data/abi/open_ocean/abi.json",
+    "OMNISEA_ABI": "data/abi/omnisea/abi.json",
+    "NFTS2ME_ABI": "data/abi/nft2me/abi.json",
+    "SAFE_ABI": "data/abi/gnosis/abi.json",
+    "DEPLOYER_ABI": "data/deploy/abi.json",
+    "ZKSTARS_ABI": "data/abi/zkstars/abi.json",
+    "SCROLL_CITIZEN_ABI": "data/abi/scroll_citizen/abi.json",
+    "RUBYSCORE_VOTE_ABI": "data/abi/rubyscore/abi.json",
+    "L2TELEGRAPH_MESSAGE_ABI": "data/abi/l2telegraph/send_message.json",
+    "L2TELEGRAPH_NFT_ABI": "data/abi/l2telegraph/bridge_nft.json",
+    "NFT_ORIGINS_ABI": "data/abi/nft-origins/abi.json",
+    "KELP_ABI": "data/abi/kelp/abi.json",
+    "SCROLL_CANVAS_ABI": "data/abi/scroll/canvas.json",
+    "SCROLL_CANVAS_BADGES_CONTRACT_ABI": "data/abi/scroll/canvas_badges.json",
+    "SCROLL_CANVAS_ETHEREUM_YEAR_BADGE_CONTRACT_ABI": "data/abi/scroll/scroll_canvas_ethereum_year_badge.json",
+    "SCROLL_CANVAS_AMBIENT_PROVIDOOR_BADGE_CONTRACT_ABI": "data/abi/scroll/scroll_canvas_ambient_providoor_badge.json",
+    "SCROLL_CANVAS_AMBIENT_SWAPOOOR_BADGE_CONTRACT_ABI": "data/abi/scroll/scroll_canvas_ambient_swapooor_badge.json",
+    "MULTICALL_ABI": "data/abi/multicall/abi.json",
+}
+
+RAW_FILES = {
+    "DEPLOYER_BYTECODE": "data/deploy/bytecode.txt",
+}
 
 with open("accounts.txt", "r") as file:
     ACCOUNTS = [row.strip() for row in file]
@@ -31,132 +82,6 @@ with open("fromto.txt", "r") as file:
     if duplicate_deposits_addresses:
         raise Exception(f"Following addresses have duplicate deposits addresses: {duplicate_deposits_addresses}")
 
-with open('data/abi/bridge/deposit.json') as file:
-    DEPOSIT_ABI = json.load(file)
-
-with open('data/abi/bridge/deposit_economy.json') as file:
-    DEPOSIT_ECONOMY_ABI = json.load(file)
-
-with open('data/abi/bridge/withdraw.json') as file:
-    WITHDRAW_ABI = json.load(file)
-
-with open('data/abi/bridge/oracle.json') as file:
-    ORACLE_ABI = json.load(file)
-
-with open('data/abi/scroll/weth.json') as file:
-    WETH_ABI = json.load(file)
-
-with open("data/abi/syncswap/router.json", "r") as file:
-    SYNCSWAP_ROUTER_ABI = json.load(file)
-
-with open('data/abi/syncswap/classic_pool.json') as file:
-    SYNCSWAP_CLASSIC_POOL_ABI = json.load(file)
-
-with open('data/abi/syncswap/classic_pool_data.json') as file:
-    SYNCSWAP_CLASSIC_POOL_DATA_ABI = json.load(file)
-
-with open("data/abi/skydrome/abi.json", "r") as file:
-    SKYDROME_ROUTER_ABI = json.load(file)
-
-with open("data/abi/sushiswap/abi.json", "r") as file:
-    SUSHISWAP_ROUTER_ABI = json.load(file)
-
-with open("data/abi/kyberswap/abi.json", "r") as file:
-    KYBERSWAP_ROUTER_ABI = json.load(file)
-
-with open("data/abi/odos/abi.json", "r") as file:
-    ODOS_ROUTER_ABI = json.load(file)
-
-with open("data/abi/ambient_finance/abi_cmd.json", "r") as file:
-    AMBIENT_FINANCE_ROUTER_ABI = json.load(file)
-
-with open("data/abi/rseth/abi.json", "r") as file:
-    RSETH_ABI = json.load(file)
-
-with open("data/abi/ambient_finance/abi_croc.json", "r") as file:
-    AMBIENT_FINANCE_CROC_ABI = json.load(file)
-
-with open("data/abi/zebra/abi.json", "r") as file:
-    ZEBRA_ROUTER_ABI = json.load(file)
-
-with open("data/abi/aave/abi.json", "r") as file:
-    AAVE_ABI = json.load(file)
-
-with open("data/abi/rhomarkets/abi.json", "r") as file:
-    RHOMARKETS_ABI = json.load(file)
-
-with open("data/abi/compound_finance/abi_bulker.json", "r") as file:
-    COMPOUND_FINANCE_BULKER_ABI = json.load(file)
-
-with open("data/abi/compound_finance/abi_comet.json", "r") as file:
-    COMPOUND_FINANCE_COMET_ABI = json.load(file)
-
-with open("data/abi/layerbank/abi.json", "r") as file:
-    LAYERBANK_ABI = json.load(file)
-
-with open("data/abi/zerius/abi.json", "r") as file:
-    ZERIUS_ABI = json.load(file)
-
-with open("data/abi/l2pass/abi.json", "r") as file:
-    L2PASS_ABI = json.load(file)
-
-with open("data/abi/dmail/abi.json", "r") as file:
-    DMAIL_ABI = json.load(file)
-
-with open("data/abi/open_ocean/abi.json", "r") as file:
-    OPENOCEAN_ROUTER_ABI = json.load(file)
-
-with open("data/abi/omnisea/abi.json", "r") as file:
-    OMNISEA_ABI = json.load(file)
-
-with open("data/abi/nft2me/abi.json", "r") as file:
-    NFTS2ME_ABI = json.load(file)
-
-with open("data/abi/gnosis/abi.json", "r") as file:
-    SAFE_ABI = json.load(file)
-
-with open("data/deploy/abi.json", "r") as file:
-    DEPLOYER_ABI = json.load(file)
-
-with open("data/deploy/bytecode.txt", "r") as file:
-    DEPLOYER_BYTECODE = file.read()
-
-with open("data/abi/zkstars/abi.json", "r") as file:
-    ZKSTARS_ABI = json.load(file)
-
-with open("data/abi/scroll_citizen/abi.json", "r") as file:
-    SCROLL_CITIZEN_ABI = json.load(file)
-
-with open("data/abi/rubyscore/abi.json", "r") as file:
-    RUBYSCORE_VOTE_ABI = json.load(file)
-
-with open("data/abi/l2telegraph/send_message.json", "r") as file:
-    L2TELEGRAPH_MESSAGE_ABI = json.load(file)
-
-with open("data/abi/l2telegraph/bridge_nft.json", "r") as file:
-    L2TELEGRAPH_NFT_ABI = json.load(file)
-
-with open("data/abi/nft-origins/abi.json", "r") as file:
-    NFT_ORIGINS_ABI = json.load(file)
-
-with open("data/abi/kelp/abi.json", "r") as file:
-    KELP_ABI = json.load(file)
-
-with open("data/abi/scroll/canvas.json", "r") as file:
-    SCROLL_CANVAS_ABI = json.load(file)
-
-with open("data/abi/scroll/canvas_badges.json", "r") as file:
-    SCROLL_CANVAS_BADGES_CONTRACT_ABI = json.load(file)
-
-with open("data/abi/scroll/scroll_canvas_ethereum_year_badge.json", "r") as file:
-    SCROLL_CANVAS_ETHEREUM_YEAR_BADGE_CONTRACT_ABI = json.load(file)
-
-with open("data/abi/scroll/scroll_canvas_ambient_providoor_badge.json", "r") as file:
-    SCROLL_CANVAS_AMBIENT_PROVIDOOR_BADGE_CONTRACT_ABI = json.load(file)
-
-with open("data/abi/scroll/scroll_canvas_ambient_swapooor_badge.json", "r") as file:
-    SCROLL_CANVAS_AMBIENT_SWAPOOOR_BADGE_CONTRACT_ABI = json.load(file)
-
 ZERO_ADDRESS = "0x0000000000000000000000000000000000000000"
 
 BRIDGE_CONTRACTS = {
@@ -166,6 +91,18 @@ BRIDGE_CONTRACTS = {
     "oracle": "0x0d7E906BD9cAFa154b048cFa766Cc1E54E39AF9B"
 }
 
+# Multicall3 по сетям из data/rpc.json, в zkSync Era он задеплоен по другому адресу
+MULTICALL_CONTRACTS = {
+    "ethereum": "0xcA11bde05977b3631167028862bE2a173976CA11",
+    "arbitrum": "0xcA11bde05977b3631167028862bE2a173976CA11",
+    "optimism": "0xcA11bde05977b3631167028862bE2a173976CA11",
+    "polygon_zkevm": "0xcA11bde05977b3631167028862bE2a173976CA11",
+    "zksync": "0xF9cda624FBC7e059355ce98a31693d299FACd963",
+    "base": "0xcA11bde05977b3631167028862bE2a173976CA11",
+    "linea": "0xcA11bde05977b3631167028862bE2a173976CA11",
+    "scroll": "0xcA11bde05977b3631167028862bE2a173976CA11",
+}
+
 ORBITER_CONTRACT = "0x80c67432656d59144ceff962e8faf8926599bcf8"
 
 SCROLL_TOKENS = {
@@ -175,6 +112,14 @@ SCROLL_TOKENS = {
     "WRSETH": "0xa25b25548B4C98B0c7d3d27dcA5D5ca743d68b7F"
 }
 
+# symbol/decimals не меняются, не запрашиваем их из сети для известных токенов
+SCROLL_TOKENS_METADATA = {
+    "ETH": {"symbol": "WETH", "decimal": 18},
+    "WETH": {"symbol": "WETH", "decimal": 18},
+    "USDC": {"symbol": "USDC", "decimal": 6},
+    "WRSETH": {"symbol": "wrsETH", "decimal": 18}
+}
+
 SYNCSWAP_CONTRACTS = {
     "router": "0x80e38291e06339d10aab483c65695d004dbd5c69",
     "classic_pool": "0x37BAc764494c8db4e54BDE72f6965beA9fa0AC2d"
@@ -264,7 +209,68 @@ SCROLL_CANVAS_AMBIENT_SWAPOOOR_BADGE_CONTRACT = "0xDaf958ec36dB494e82709a3AaB9FA
 
 SCROLL_CANVAS_BADGES_CONTRACT = "0x39fb5E85C7713657c2D9E869E974FF1e0B06F20C"
 
+# адреса контрактов и токенов приводим к checksum один раз при загрузке конфига
+for _name, _value in list(globals().items()):
+    if not _name.endswith(("_CONTRACT", "_CONTRACTS", "_TOKENS")):
+        continue
+    if isinstance(_value, str) and is_hex_address(_value):
+        globals()[_name] = Web3.to_checksum_address(_value)
+    elif isinstance(_value, dict):
+        _value.update({
+            key: Web3.to_checksum_address(address)
+            for key, address in _value.items() if isinstance(address, str) and is_hex_address(address)
+        })
+del _name, _value
+
 OKEX_API_KEY = os.getenv("OKEX_API_KEY", None)
 OKEX_SECRET_KEY = os.getenv("OKEX_SECRET_KEY", None)
 OKEX_PASSPHRASE = os.getenv("OKEX_PASSPHRASE", None)
 OKEX_PROXY = os.getenv("OKEX_PROXY", None)
+
+
+def _abi_cache_file(path: str) -> str:
+    return os.path.join(ABI_CACHE_DIR, os.path.normpath(path).replace(os.sep, "_") + ".marshal")
+
+
+def load_abi(path: str):
+    """
+    Parse an ABI file once, using its pre-parsed cache file while the file's mtime is unchanged
+    """
+    mtime = os.stat(path).st_mtime_ns
+
+    # один файл кэша на ABI - читается и пишется только нужный; marshal хранит только данные, без исполнения кода
+    cache_file = _abi_cache_file(path) if ABI_CACHE_DIR else None
+    if cache_file and os.path.exists(cache_file):
+        try:
+            with open(cache_file, "rb") as file:
+                cached_mtime, abi = marshal.load(file)
+            if cached_mtime == mtime:
+                return abi
+        except Exception:
+            pass
+
+    with open(path, "r") as file:
+        abi = json.load(file)
+
+    if cache_file:
+        os.makedirs(ABI_CACHE_DIR, exist_ok=True)
+        tmp_file = f"{cache_file}.tmp"
+        with open(tmp_file, "wb") as file:
+            marshal.dump((mtime, abi), file)
+        os.replace(tmp_file, cache_file)
+
+    return abi
+
+
+def __getattr__(name: str):
+    if name in ABI_FILES:
+        value = load_abi(ABI_FILES[name])
+    elif name in RAW_FILES:
+        with open(RAW_FILES[name], "r") as file:
+            value = file.read()
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    globals()[name] = value
+
+    return value
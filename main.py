@@ -1,6 +1,5 @@
 import random
 import sys
-import os
 import signal
 from datetime import datetime
 from typing import Union
@@ -20,10 +19,17 @@ from settings import (
     REMOVE_WALLET,
     MAX_TX_COUNT_FOR_WALLET, MIN_TIME_AFTER_LAST_TX_S
 )
+from modules import Account
 from modules_settings import *
 from utils.helpers import remove_wallet, get_last_tx
-from utils.sleeping import sleep
-from eth_account import Account as EthereumAccount
+from utils.explorer import explorer_client
+from utils.fees import stop_fee_oracles
+from utils.gas_checker import gas_watcher
+from utils.http import http_client
+from utils.rpc import close_sessions
+from utils.sleeping import sleep, scheduler
+from utils.state import state_store
+from utils.wallets import wallet_registry
 
 
 class MaxTxCountExceeded(Exception):
@@ -99,7 +105,8 @@ def get_module():
             Choice("53) Adjust Ambient wrsETH/ETH position", adjust_ambient_wrseth_eth_position_scenario),
             Choice("54) Withdrawal And Mint Ambient Providoor Badge", mint_ambient_providoor_badge),
             Choice("55) Withdrawal Ambient Finance and sell wrsETH", withdraw_ambient_and_sell_wrseth),
-            Choice("56) Exit", "exit"),
+            Choice("56) Check native balances", "balance_checker"),
+            Choice("57) Exit", "exit"),
         ],
         qmark="⚙️ ",
         pointer="✅ "
@@ -168,7 +175,7 @@ async def run_module(module, account_id, key, recipient: Union[str, None] = None
             logger.error(e)
 
     if REMOVE_WALLET:
-        remove_wallet(key)
+        remove_wallet(wallet_registry.get_address(key))
 
     if result is not False:
         await sleep(SLEEP_FROM, SLEEP_TO)
@@ -182,15 +189,14 @@ async def main(module):
     else:
         wallets = get_wallets()
 
-    if os.path.exists('wl.txt'):
-        wallet_addresses = {EthereumAccount.from_key(wallet['key']).address.lower(): wallet for wallet in wallets}
-        existing_addresses = set()
+    whitelist = wallet_registry.load_whitelist()
+    if whitelist is not None:
+        wallets = wallet_registry.filter_addresses(wallets, whitelist)
 
-        with open('wl.txt', 'r') as file:
-            existing_addresses = {line.strip().lower() for line in file.readlines()}
-
-        filtered_wallets = [wallet for address, wallet in wallet_addresses.items() if address in existing_addresses]
-        wallets = filtered_wallets
+    if REMOVE_WALLET:
+        # кошельки, обработанные до падения прошлого запуска
+        removed = state_store.removed_wallets()
+        wallets = [wallet for wallet in wallets if wallet_registry.get_address(wallet["key"]).lower() not in removed]
 
     if RANDOM_WALLET:
         random.shuffle(wallets)
@@ -204,10 +210,31 @@ async def main(module):
     tasks = []
     for index, account in enumerate(wallets, start=1):
         task = asyncio.create_task(
-            _worker(module, account.get("id"), account.get("key"), account.get("recipient", None), index))
+            _worker(module, account.get("id"), account.get("key"), account.get("recipient", None), index),
+            name=f"wallet-{account.get('id')}"
+        )
         tasks.append(task)
 
-    await asyncio.gather(*tasks)
+    try:
+        await asyncio.gather(*tasks)
+
+        scheduler.report()
+        http_client.report()
+    finally:
+        # txt файлы обновляем и при Ctrl+C - прогресс прерванного запуска не теряется
+        state_store.export_files()
+        if REMOVE_WALLET:
+            state_store.export_accounts(
+                "accounts.txt", {wallet["key"]: wallet["address"] for wallet in wallet_registry.get_wallets()}
+            )
+
+        # фоновые задачи останавливаем до закрытия сессий, которыми они пользуются
+        await stop_fee_oracles()
+        await gas_watcher.stop()
+        await scheduler.stop()
+        await close_sessions()
+        await explorer_client.close()
+        await http_client.close()
 
 
 if __name__ == '__main__':
@@ -216,5 +243,7 @@ if __name__ == '__main__':
     module = get_module()
     if module == "tx_checker":
         get_tx_count()
+    elif module == "balance_checker":
+        get_native_balances()
     else:
         asyncio.run(main(module))
@@ -1,39 +1,54 @@
-from .account import Account
-from .ambient_finance import AmbientFinance
-from .scroll import Scroll
-from .orbiter import Orbiter
-from .nitro import Nitro
-from .rhomarkets import Rhomarkets
-from .kelp import Kelp
-from .scenarios import Scenarios
-from .layerswap import LayerSwap
-from .skydrome import Skydrome
-from .kyberswap import KyberSwap
-from .open_ocean import OpenOcean
-from .sushi_swap import SushiSwap
-from .zebra import Zebra
-from .syncswap import SyncSwap
-from .xyswap import XYSwap
-from .odosprotocol import Odos
-from .aave import Aave
-from .compound import CompoundFinance
-from .layerbank import LayerBank
-from .zerius import Zerius
-from .l2pass import L2Pass
-from .zkstars import ZkStars
-from .scrollcitizen import ScrollCitizen
-from .dmail import Dmail
-from .omnisea import Omnisea
-from .nfts2me import Minter
-from .rubyscore import RubyScore
-from .safe import GnosisSafe
-from .l2telegraph import L2Telegraph
-from .nftorigins import NftOrigins
-from .deploy import Deployer
-from .swap_tokens import SwapTokens
-from .multiswap import Multiswap
-from .multibridge import Multibridge
-from .multilanding import Multilanding
-from .routes import Routes
-from .transfer import Transfer
-from .tx_checker import check_tx
+import importlib
+
+# модули протоколов импортируются при первом обращении (from modules import Scroll)
+_LAZY = {
+    "Account": ".account",
+    "AmbientFinance": ".ambient_finance",
+    "Scroll": ".scroll",
+    "Orbiter": ".orbiter",
+    "Nitro": ".nitro",
+    "Rhomarkets": ".rhomarkets",
+    "Kelp": ".kelp",
+    "Scenarios": ".scenarios",
+    "LayerSwap": ".layerswap",
+    "Skydrome": ".skydrome",
+    "KyberSwap": ".kyberswap",
+    "OpenOcean": ".open_ocean",
+    "SushiSwap": ".sushi_swap",
+    "Zebra": ".zebra",
+    "SyncSwap": ".syncswap",
+    "XYSwap": ".xyswap",
+    "Odos": ".odosprotocol",
+    "Aave": ".aave",
+    "CompoundFinance": ".compound",
+    "LayerBank": ".layerbank",
+    "Zerius": ".zerius",
+    "L2Pass": ".l2pass",
+    "ZkStars": ".zkstars",
+    "ScrollCitizen": ".scrollcitizen",
+    "Dmail": ".dmail",
+    "Omnisea": ".omnisea",
+    "Minter": ".nfts2me",
+    "RubyScore": ".rubyscore",
+    "GnosisSafe": ".safe",
+    "L2Telegraph": ".l2telegraph",
+    "NftOrigins": ".nftorigins",
+    "Deployer": ".deploy",
+    "SwapTokens": ".swap_tokens",
+    "Multiswap": ".multiswap",
+    "Multibridge": ".multibridge",
+    "Multilanding": ".multilanding",
+    "Routes": ".routes",
+    "Transfer": ".transfer",
+    "check_tx": ".tx_checker",
+    "check_balances": ".balance_checker",
+}
+
+def __getattr__(name: str):
+    if name not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(_LAZY[name], __name__), name)
+    globals()[name] = value
+
+    return value
@@ -1,21 +1,30 @@
 import asyncio
-import time
 import random
 
-from typing import Union, Type, Dict, Any
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Union, Type, Dict, Any, List, Optional
 
 from hexbytes import HexBytes
 from loguru import logger
-from web3 import AsyncWeb3
-from eth_account import Account as EthereumAccount
 from web3.contract import Contract
-from web3.exceptions import TransactionNotFound
-from web3.middleware import async_simple_cache_middleware, async_geth_poa_middleware
 
 from config import RPC, ERC20_ABI, SCROLL_TOKENS
 from settings import GAS_MULTIPLIER, GAS_LIMIT_MULTIPLIER
+from utils.contracts import get_contract, to_checksum
+from utils.fees import get_fee_oracle
 from utils.helpers import float_floor
+from utils.history import tx_history
+from utils.multicall import get_token_balances
+from utils.nonce import nonce_manager
+from utils.receipts import get_receipt_watcher
+from utils.rpc import get_w3
 from utils.sleeping import sleep
+from utils.wallets import wallet_registry
+
+
+# модуль, внутри shared_context() которого создаются модули протоколов того же кошелька
+_context_owner: ContextVar[Optional["Account"]] = ContextVar("context_owner", default=None)
 
 
 class Account:
@@ -28,34 +37,54 @@ class Account:
 
         self.recipient = recipient
 
-        self.w3 = AsyncWeb3(
-            AsyncWeb3.AsyncHTTPProvider(random.choice(RPC[chain]["rpc"])),
-            middlewares=[async_simple_cache_middleware, async_geth_poa_middleware],
-            request_kwargs={'timeout': 60}
-        )
+        owner = _context_owner.get()
+        if owner is not None and owner.chain == chain and owner.private_key == private_key:
+            # провайдер, аккаунт и подписанные nonce общие с составным модулем
+            self.w3 = owner.w3
+            self.address = owner.address
+            self.signed_nonces = owner.signed_nonces
+        else:
+            self.w3 = get_w3(chain)
+            self.address = wallet_registry.get_address(private_key)
+            self.signed_nonces = {}
 
-        self.account = EthereumAccount.from_key(private_key)
-        self.address = self.account.address
         self.log_prefix = f"[{self.account_id}][{self.address}]"
 
+    @property
+    def account(self):
+        # один LocalAccount на ключ на весь процесс, в том числе после смены кошелька в load_account
+        return wallet_registry.get_account(self.private_key)
+
+    @contextmanager
+    def shared_context(self):
+        """
+        Modules of the same wallet and chain created inside share this module's wallet context
+        """
+        token = _context_owner.set(self)
+        try:
+            yield self
+        finally:
+            _context_owner.reset(token)
+
     def get_name(self):
         return type(self).__name__
 
     async def get_transaction_count(self):
         return await self.w3.eth.get_transaction_count(self.address)
 
+    async def get_fees(self) -> [int, int]:
+        return await get_fee_oracle(self.chain).get_fees()
+
     async def get_tx_data(self, value: int = 0, gas_price: bool = True):
+        # nonce выделяется только при подписи, после оценки газа: ревертнувшая сборка не оставляет дырку
         tx = {
             "chainId": await self.w3.eth.chain_id,
             "from": self.address,
             "value": value,
-            "nonce": await self.w3.eth.get_transaction_count(self.address),
         }
 
         if gas_price:
-            fee_history = await self.w3.eth.fee_history(1, 'latest', [10])
-            base_fee = int(fee_history['baseFeePerGas'][-1] * GAS_MULTIPLIER)
-            priority_fee = await self.w3.eth.max_priority_fee
+            base_fee, priority_fee = await self.get_fees()
             max_fee = base_fee + priority_fee
             gas_price = max_fee
             tx.update({"gasPrice": gas_price})
@@ -63,32 +92,24 @@ class Account:
         return tx
 
     async def transaction_fee(self, tx_data: dict):
-        gas_price = await self.w3.eth.gas_price * GAS_MULTIPLIER
-        gas = await self.w3.eth.estimate_gas(tx_data)
+        gas_price, gas = await asyncio.gather(
+            get_fee_oracle(self.chain).get_gas_price(),
+            self.w3.eth.estimate_gas(tx_data)
+        )
 
         return int(gas * gas_price)
 
     def get_contract(self, contract_address: str, abi=None) -> Union[Type[Contract], Contract]:
-        contract_address = self.w3.to_checksum_address(contract_address)
-
         if abi is None:
             abi = ERC20_ABI
 
-        contract = self.w3.eth.contract(address=contract_address, abi=abi)
-
-        return contract
+        return get_contract(self.w3, contract_address, abi)
 
     async def get_balance(self, contract_address: str) -> Dict:
-        contract_address = self.w3.to_checksum_address(contract_address)
-        contract = self.get_contract(contract_address)
-
-        symbol = await contract.functions.symbol().call()
-        decimal = await contract.functions.decimals().call()
-        balance_wei = await contract.functions.balanceOf(self.address).call()
+        return (await self.get_balances([contract_address]))[0]
 
-        balance = balance_wei / 10 ** decimal
-
-        return {"balance_wei": balance_wei, "balance": balance, "symbol": symbol, "decimal": decimal}
+    async def get_balances(self, contract_addresses: List[str]) -> List[Dict]:
+        return await get_token_balances(self.w3, self.chain, [(address, self.address) for address in contract_addresses])
 
     async def get_amount(
             self,
@@ -126,19 +147,14 @@ class Account:
         return amount_wei, amount, balance
 
     async def check_allowance(self, token_address: str, contract_address: str) -> int:
-        token_address = self.w3.to_checksum_address(token_address)
-        contract_address = self.w3.to_checksum_address(contract_address)
-
-        contract = self.w3.eth.contract(address=token_address, abi=ERC20_ABI)
-        amount_approved = await contract.functions.allowance(self.address, contract_address).call()
+        contract = self.get_contract(token_address)
+        amount_approved = await contract.functions.allowance(self.address, to_checksum(contract_address)).call()
 
         return amount_approved
 
     async def approve(self, amount: float, token_address: str, contract_address: str, gas_price: bool = True) -> None:
-        token_address = self.w3.to_checksum_address(token_address)
-        contract_address = self.w3.to_checksum_address(contract_address)
-
-        contract = self.w3.eth.contract(address=token_address, abi=ERC20_ABI)
+        contract_address = to_checksum(contract_address)
+        contract = self.get_contract(token_address)
 
         allowance_amount = await self.check_allowance(token_address, contract_address)
 
@@ -163,32 +179,48 @@ class Account:
             await sleep(5, 20)
 
     async def wait_until_tx_finished(self, hash: str, max_wait_time=1200) -> None:
-        start_time = time.time()
-        while True:
-            try:
-                receipts = await self.w3.eth.get_transaction_receipt(hash)
-                status = receipts.get("status")
-                if status == 1:
-                    logger.success(f"[{self.account_id}][{self.address}] {self.explorer}{hash} successfully!")
-                    return
-                elif status is None:
-                    await asyncio.sleep(0.3)
-                else:
-                    logger.error(f"[{self.account_id}][{self.address}] {self.explorer}{hash} transaction failed!")
-                    raise Exception(f"Transaction {hash} failed!")
-                    # return
-            except TransactionNotFound:
-                if time.time() - start_time > max_wait_time:
-                    print(f'TX NOT FOUND: {hash}')
-                    return
-                await asyncio.sleep(1)
+        receipt = await get_receipt_watcher(self.chain).wait(hash, max_wait_time)
+
+        if receipt is None:
+            logger.warning(f"[{self.account_id}][{self.address}] {self.explorer}{hash} not found in {max_wait_time} s.")
+            return
+
+        if int(receipt["status"], 16) == 1:
+            logger.success(f"[{self.account_id}][{self.address}] {self.explorer}{hash} successfully!")
+        else:
+            logger.error(f"[{self.account_id}][{self.address}] {self.explorer}{hash} transaction failed!")
+            raise Exception(f"Transaction {hash} failed!")
 
     async def sign(self, transaction, gas=None, sub_fee_from_value=False) -> Any:
-        if transaction.get("gasPrice", None) is None:
-            fee_history = await self.w3.eth.fee_history(1, 'latest', [10])
-            base_fee = int(fee_history['baseFeePerGas'][-1] * GAS_MULTIPLIER)
-            priority_fee = await self.w3.eth.max_priority_fee
-            max_fee = base_fee + priority_fee 
+        try:
+            signed_txn = await self._sign(transaction, gas, sub_fee_from_value)
+        except Exception:
+            if transaction.get("nonce") is not None:
+                nonce_manager.release(self.chain, self.address, transaction["nonce"])
+            raise
+
+        self.signed_nonces[signed_txn.hash] = transaction.get("nonce")
+
+        return signed_txn
+
+    async def _sign(self, transaction, gas=None, sub_fee_from_value=False) -> Any:
+        need_fees = transaction.get("gasPrice", None) is None
+
+        # комиссии и оценка газа не зависят друг от друга, запрашиваем одновременно
+        if need_fees and gas is None:
+            (base_fee, priority_fee), gas = await asyncio.gather(
+                self.get_fees(),
+                self.w3.eth.estimate_gas(transaction)
+            )
+            gas = int(gas * GAS_LIMIT_MULTIPLIER)
+        elif need_fees:
+            base_fee, priority_fee = await self.get_fees()
+        elif gas is None:
+            gas = await self.w3.eth.estimate_gas(transaction)
+            gas = int(gas * GAS_LIMIT_MULTIPLIER)
+
+        if need_fees:
+            max_fee = base_fee + priority_fee
 
             max_priority_fee_per_gas = priority_fee
             max_fee_per_gas = max_fee
@@ -206,10 +238,6 @@ class Account:
             transaction.update({"gasPrice": gasPrice})
         """
 
-        if gas is None:
-            gas = await self.w3.eth.estimate_gas(transaction)
-            gas = int(gas * GAS_LIMIT_MULTIPLIER)
-
         transaction.update({"gas": gas})
 
         if sub_fee_from_value is True:
@@ -220,11 +248,27 @@ class Account:
                 }
             )
 
+        if transaction.get("nonce") is None:
+            pending_count = await self.w3.eth.get_transaction_count(self.address, "pending")
+            transaction["nonce"] = nonce_manager.allocate(self.chain, self.address, pending_count)
+
         signed_txn = self.w3.eth.account.sign_transaction(transaction, self.private_key)
 
         return signed_txn
 
     async def send_raw_transaction(self, signed_txn) -> HexBytes:
-        txn_hash = await self.w3.eth.send_raw_transaction(signed_txn.rawTransaction)
+        nonce = self.signed_nonces.pop(signed_txn.hash, None)
+
+        try:
+            txn_hash = await self.w3.eth.send_raw_transaction(signed_txn.rawTransaction)
+        except Exception:
+            if nonce is not None:
+                nonce_manager.release(self.chain, self.address, nonce)
+            raise
+
+        if nonce is not None:
+            nonce_manager.mark_sent(self.chain, self.address, nonce)
+
+        tx_history.invalidate(self.chain, self.address)
 
         return txn_hash
@@ -1,68 +1,37 @@
-import math
+import asyncio
 import random
-from typing import List
-
-import aiohttp
+from typing import List, Tuple
 
 from loguru import logger
 from web3 import Web3
 from web3.exceptions import ContractLogicError
-from eth_abi import encode
+from eth_abi import encode, decode
 from config import (AMBIENT_FINANCE_ROUTER_ABI,
                     AMBIENT_FINANCE_CROC_ABI,
                     AMBIENT_FINANCE_CONTRACTS,
                     SCROLL_TOKENS,
                     RSETH_ABI,
                     RSETH_CONTRACT)
+from settings import (MULTICALL_BATCH_SIZE,
+                      AMBIENT_DEPOSIT_PRICE_TOLERANCE,
+                      AMBIENT_DEPOSIT_GAS_LIMIT,
+                      GAS_LIMIT_MULTIPLIER)
+from utils.ambient_indexer import ambient_indexer
+from utils.ambient_math import (price_to_tick,
+                                tick_to_price,
+                                sqrt_price_at_tick,
+                                tick_at_sqrt_price,
+                                sqrt_price_to_price,
+                                solve_base_deposit)
 from utils.gas_checker import check_gas
 from utils.helpers import retry, checkLastIteration, get_action_tx_count
+from utils.multicall import aggregate
 from utils.sleeping import sleep
 from .account import Account
 
-q64 = 2 ** 64
 wrsETH = "WRSETH"
 
 
-def price_to_tick(p):
-    return math.floor(math.log(p, 1.0001))
-
-
-def tick_to_price(p):
-    return 1.0001 ** p
-
-
-def price_to_sqrtp(p):
-    return int(math.sqrt(p) * q64)
-
-
-def sqrtp_to_price(p):
-    return (p / q64) ** 2
-
-
-def liquidity0(amount, pa, pb):
-    if pa > pb:
-        pa, pb = pb, pa
-    return (amount * (pa * pb) / q64) / (pb - pa)
-
-
-def liquidity1(amount, pa, pb):
-    if pa > pb:
-        pa, pb = pb, pa
-    return amount * q64 / (pb - pa)
-
-
-def calc_amount0(liq, pa, pb):
-    if pa > pb:
-        pa, pb = pb, pa
-    return int(liq * q64 * (pb - pa) / pa / pb)
-
-
-def calc_amount1(liq, pa, pb):
-    if pa > pb:
-        pa, pb = pb, pa
-    return int(liq * (pb - pa) / q64)
-
-
 class AmbientFinance(Account):
     def __init__(self, account_id: int, private_key: str, recipient: str) -> None:
         super().__init__(account_id=account_id, private_key=private_key, chain="scroll", recipient=recipient)
@@ -119,6 +88,14 @@ class AmbientFinance(Account):
 
         return transaction
 
+    async def send_raw_transaction(self, signed_txn):
+        txn_hash = await super().send_raw_transaction(signed_txn)
+
+        # позиции и транзакции кошелька изменились, кэш индексатора больше не актуален
+        ambient_indexer.invalidate(self.address)
+
+        return txn_hash
+
     async def get_curve_price(self,
                               base: str,
                               quote: str):
@@ -134,7 +111,7 @@ class AmbientFinance(Account):
             quote: str,
             is_buy: bool
     ):
-        price = (await self.get_curve_price(base, quote) / q64) ** 2
+        price = sqrt_price_to_price(await self.get_curve_price(base, quote))
 
         return 1 / price if is_buy else price
 
@@ -216,8 +193,7 @@ class AmbientFinance(Account):
                       max_percent: int,
                       range_width: float = 1,
                       min_left_eth_balance: float = 0,
-                      max_left_eth_balance: float = 0,
-                      max_deposit_attempts: int = 15):
+                      max_left_eth_balance: float = 0):
         amount_wei_wrseth, amount_wrseth, balance = await self.get_amount(
             wrsETH,
             min_amount,
@@ -250,8 +226,18 @@ class AmbientFinance(Account):
         base = self.eth_address
         quote = self.wrseth_address
 
-        eth_wrs_curve_price = await self.get_curve_price(base, quote)
-        price = sqrtp_to_price(eth_wrs_curve_price)
+        min_left_eth_balance = round(random.uniform(min_left_eth_balance, max_left_eth_balance),
+                                     decimal) if min_left_eth_balance > 0 or max_left_eth_balance > 0 else 0
+        min_left_eth_balance_wei = self.w3.to_wei(min_left_eth_balance, "ether")
+
+        eth_wrs_curve_price, balance_eth_wei, (base_fee, priority_fee) = await asyncio.gather(
+            self.get_curve_price(base, quote),
+            self.w3.eth.get_balance(self.address),
+            self.get_fees(),
+        )
+        # на газ депозита оставляем максимум, который нода проверит при оценке (gas limit * maxFeePerGas)
+        gas_reserve_wei = int(AMBIENT_DEPOSIT_GAS_LIMIT * GAS_LIMIT_MULTIPLIER * (base_fee + priority_fee))
+        price = sqrt_price_to_price(eth_wrs_curve_price)
 
         low_tick = price_to_tick(price * (1 - range_width / 100))
         low_tick = int(low_tick / 4) * 4
@@ -262,186 +248,118 @@ class AmbientFinance(Account):
         low_price = tick_to_price(low_tick)
         upper_price = tick_to_price(upper_tick)
 
-        limitLower = price_to_sqrtp(low_price)
-        limitHigher = price_to_sqrtp(upper_price)
+        limitLower = sqrt_price_at_tick(low_tick)
+        limitHigher = sqrt_price_at_tick(upper_tick)
         settleFlags = 0
         lpConduit = self.eth_address
 
-        amount_wei_eth = int(amount_wei_wrseth * (1 / price))
-
-        liq_eth = liquidity0(amount_wei_eth, eth_wrs_curve_price, limitHigher)
-        liq_wrseth = liquidity1(amount_wei_wrseth, eth_wrs_curve_price, limitLower)
-        liq = int(min(liq_eth, liq_wrseth))
-
-        amount_wei_eth = calc_amount0(liq, limitHigher, eth_wrs_curve_price)
-        amount_wei_wrseth = calc_amount1(liq, limitLower, eth_wrs_curve_price)
-
-        amount_eth = amount_wei_eth / 10 ** 18
-        amount_wrseth = (amount_wei_wrseth / 10 ** 18)
-
-        min_left_eth_balance = round(random.uniform(min_left_eth_balance, max_left_eth_balance),
-                                     decimal) if min_left_eth_balance > 0 or max_left_eth_balance > 0 else 0
-
         # мы проверяем что после депозита на аккаунте останется минимальный баланс из настроек
-        balance_eth_wei = await self.w3.eth.get_balance(self.address)
-        balance_eth = balance_eth_wei / 10 ** 18
-        if self.w3.to_wei(min_left_eth_balance, "ether") >= balance_eth_wei:
+        if min_left_eth_balance_wei + gas_reserve_wei >= balance_eth_wei:
             logger.info(
-                f"[{self.account_id}][{self.address}] Cannot deposit {amount_eth} ETH, " +
-                f"because current balance: {balance_eth} ETH less than min left balance setting: {min_left_eth_balance} ETH"
+                f"[{self.account_id}][{self.address}] Cannot deposit, " +
+                f"because current balance: {balance_eth_wei / 10 ** 18} ETH less than min left balance setting: {min_left_eth_balance} ETH " +
+                f"plus gas reserve: {gas_reserve_wei / 10 ** 18} ETH"
             )
 
             return
-        if min_left_eth_balance > 0 and balance_eth_wei - amount_wei_eth < self.w3.to_wei(min_left_eth_balance,"ether"):
-            logger.info(
-                f"[{self.account_id}][{self.address}] Cannot deposit {amount_eth} ETH, " +
-                f"because left balance would be less than {min_left_eth_balance} ETH, " +
-                f"new deposit amount is {(balance_eth_wei - self.w3.to_wei(min_left_eth_balance, 'ether')) / 10 ** 18}"
-            )
 
-            # уменьшаем амаунт депозита, чтобы на балансе осталось мин баланс
-            amount_wei_eth = balance_eth_wei - self.w3.to_wei(min_left_eth_balance, "ether")
+        # цена пула - ETH (base) за wrsETH (quote), берём максимальный депозит, который оплачивается
+        # суммой wrsETH и балансом ETH (минус мин баланс и газ), с запасом на падение цены до отправки транзакции
+        amount_wei_eth, liq, amount_wei_wrseth = solve_base_deposit(
+            balance_eth_wei - min_left_eth_balance_wei - gas_reserve_wei,
+            amount_wei_wrseth,
+            eth_wrs_curve_price,
+            limitLower,
+            limitHigher,
+            AMBIENT_DEPOSIT_PRICE_TOLERANCE
+        )
 
-            amount_wei_wrseth = int(amount_wei_eth * price)
+        amount_eth = amount_wei_eth / 10 ** 18
+        amount_wrseth = amount_wei_wrseth / 10 ** 18
 
-            liq_eth = liquidity0(amount_wei_eth, eth_wrs_curve_price, limitHigher)
-            liq_wrseth = liquidity1(amount_wei_wrseth, eth_wrs_curve_price, limitLower)
-            liq = int(min(liq_eth, liq_wrseth))
+        if amount_wei_eth < 500000000000000:  # 0,0005 ETH:
+            logger.info(
+                f"[{self.account_id}][{self.address}] Cannot Deposit {amount_eth} ETH, amount too small, min deposit: {500000000000000 / 10 ** 18}")
+            return
 
-            amount_wei_eth = calc_amount0(liq, limitHigher, eth_wrs_curve_price)
-            amount_wei_wrseth = calc_amount1(liq, limitLower, eth_wrs_curve_price)
+        logger.info(
+            f"[{self.account_id}][{self.address}] Deposit {amount_wrseth} wrsETH and {amount_eth} ETH (price range: {low_price}-{upper_price}, {range_width}), {liq} liq")
+
+        try:
+            cmd = encode(
+                ["uint8",
+                 "address",
+                 "address",
+                 "uint256",
+                 "int24",
+                 "int24",
+                 "uint128",
+                 "uint128",
+                 "uint128",
+                 "uint8",
+                 "address"],
+                [code,
+                 base,
+                 quote,
+                 self.pool_id,
+                 low_tick,
+                 upper_tick,
+                 amount_wei_eth,
+                 limitLower,
+                 limitHigher,
+                 settleFlags,
+                 lpConduit]
+            )
+            callpath_code = 128
 
-            amount_eth = amount_wei_eth / 10 ** 18
-            amount_wrseth = amount_wei_wrseth / 10 ** 18
+            tx_data = await self.get_tx_data(amount_wei_eth, gas_price=False)
 
-        count = 0
-        while True:
-            try:
-                if amount_wei_eth < 500000000000000:  # 0,0005 ETH:
-                    logger.info(
-                        f"[{self.account_id}][{self.address}] Cannot Deposit {amount_eth} ETH, amount too small, min deposit: {500000000000000 / 10 ** 18}")
-                    return
+            # оценка газа при сборке - единственная проверка депозита через eth_call, nonce на этом шаге ещё не выделен
+            transaction = await self.swap_contract.functions.userCmd(
+                callpath_code,
+                cmd
+            ).build_transaction(tx_data)
 
-                logger.info(
-                    f"[{self.account_id}][{self.address}] Deposit {amount_wrseth} wrsETH and {amount_eth} ETH (price range: {low_price}-{upper_price}, {range_width}), {count + 1}/{max_deposit_attempts} attempt")
+            # газ уже оценён при сборке, sign не оценивает его второй раз
+            signed_txn = await self.sign(transaction, gas=int(transaction["gas"] * GAS_LIMIT_MULTIPLIER))
+            txn_hash = await self.send_raw_transaction(signed_txn)
 
-                cmd = encode(
-                    ["uint8",
-                     "address",
-                     "address",
-                     "uint256",
-                     "int24",
-                     "int24",
-                     "uint128",
-                     "uint128",
-                     "uint128",
-                     "uint8",
-                     "address"],
-                    [code,
-                     base,
-                     quote,
-                     self.pool_id,
-                     low_tick,
-                     upper_tick,
-                     amount_wei_eth,
-                     limitLower,
-                     limitHigher,
-                     settleFlags,
-                     lpConduit]
-                )
-                callpath_code = 128
-
-                tx_data = await self.get_tx_data(amount_wei_eth, gas_price=False)
+            await self.wait_until_tx_finished(txn_hash.hex())
+        except ContractLogicError as ex:
+            logger.error(
+                f"[{self.account_id}][{self.address}] Failed to deposit {amount_wrseth} wrsETH and {amount_eth} ETH, " +
+                f"pool price moved more than {AMBIENT_DEPOSIT_PRICE_TOLERANCE * 100}% since sizing; error: {ex}")
 
-                transaction = await self.swap_contract.functions.userCmd(
-                    callpath_code,
-                    cmd
-                ).build_transaction(tx_data)
+            raise
+        except Exception as ex:
+            logger.error(f"[{self.account_id}][{self.address}] Failed to deposit {amount_wrseth} wrsETH and {amount_eth} ETH, error: {ex}")
 
-                signed_txn = await self.sign(transaction)
-                txn_hash = await self.send_raw_transaction(signed_txn)
+            raise
 
-                await self.wait_until_tx_finished(txn_hash.hex())
-            except ContractLogicError as ex:
-                count += 1
-                if count >= max_deposit_attempts:
-                    logger.error(
-                        f"[{self.account_id}][{self.address}] Failed to deposit {amount_wrseth} wrsETH and {amount_eth} ETH, error: {ex}")
-                    raise
-
-                logger.error(f"[{self.account_id}][{self.address}] Failed to deposit {amount_wrseth} wrsETH and {amount_eth} ETH, something wrong with tokens proportional, try to reduce ETH deposit amount by 1%; error: {ex}")
-                amount_wei_eth = int(amount_wei_eth * 0.99)
-                amount_eth = amount_wei_eth / 10 ** 18
-
-                continue
-            except Exception as ex:
-                logger.error(f"[{self.account_id}][{self.address}] Failed to deposit {amount_wrseth} wrsETH and {amount_eth} ETH, error: {ex}")
+    async def get_liquidity_positions(self, base: str, quote: str) -> List[dict]:
+        try:
+            return await ambient_indexer.get_user_pool_positions(self.address, base, quote, self.pool_id)
+        except Exception as e:
+            logger.error(f"[{self.account_id}][{self.address}][{self.chain}] Bad Ambient finance request to get positions: {e}")
 
-                raise
-            break
-
-    async def get_liquidity_positions(self, base: str, quote: str):
-        url = "https://ambindexer.net/scroll-gcgo/user_pool_positions"
-        params = {
-            "user": self.address,
-            "base": base,
-            "quote": quote,
-            "poolIdx": self.pool_id,
-            "chainId": "0x82750",
-        }
-
-        async with aiohttp.ClientSession() as session:
-            response = await session.get(url=url, params=params)
-            if response.status == 200:
-                positions_data = await response.json()
-
-                if "data" in positions_data and (type(positions_data["data"]) is list or positions_data["data"] is None):
-                    return positions_data["data"] or []
-                else:
-                    logger.error(
-                        f"[{self.account_id}][{self.address}][{self.chain}] Ambient finance positions wrong response: {positions_data}")
-
-                    raise Exception(f"Ambient finance positions wrong response: {positions_data}")
-            else:
-                logger.error(
-                    f"[{self.account_id}][{self.address}][{self.chain}] Bad Ambient finance request to get positions")
-                raise Exception(f"Bad Ambient finance request to get positions")
+            raise
 
     async def get_user_txs(self, base: str, quote: str) -> List[dict]:
-        url = "https://ambindexer.net/scroll-gcgo/user_pool_txs"
-        params = {
-            "user": self.address,
-            "base": base,
-            "quote": quote,
-            "poolIdx": self.pool_id,
-            "chainId": "0x82750",
-        }
-
-        async with aiohttp.ClientSession() as session:
-            response = await session.get(url=url, params=params)
-            if response.status == 200:
-                txs_data = await response.json()
-
-                if "data" in txs_data and (type(txs_data["data"]) is list or txs_data["data"] is None):
-                    # [{"blockNum": 7562420,
-                    #   "txHash": "0x2048c78f0a3a16ba32f9efb78ddcdfd7f3616aa45db0d59863464a848c6bf555",
-                    #   "txTime": 1721328090, "user": "0x623b3e76f7d0fff4eaeecc6a9bda55887377fbde", "chainId": "0x82750",
-                    #   "base": "0x0000000000000000000000000000000000000000",
-                    #   "quote": "0xa25b25548b4c98b0c7d3d27dca5d5ca743d68b7f", "poolIdx": 420,
-                    #   "baseFlow": 3178487101439531, "quoteFlow": 3000000000000000, "entityType": "liqchange",
-                    #   "changeType": "mint", "positionType": "concentrated", "bidTick": 124, "askTick": 228,
-                    #   "isBuy": false, "inBaseQty": false,
-                    #   "txId": "tx_a4b4f8dedf625f8185d595edec867214ade173118c1f804aea95cb82d94d953e"},...]
-                    return txs_data["data"] or []
-                else:
-                    logger.error(
-                        f"[{self.account_id}][{self.address}][{self.chain}] get Ambient finance user TXs list wrong response: {txs_data}")
-
-                    raise Exception(f"get Ambient finance user TXs list wrong response: {txs_data}")
-            else:
-                logger.error(
-                    f"[{self.account_id}][{self.address}][{self.chain}] Bad Ambient finance request to get user's TXs")
-                raise Exception(f"Bad Ambient finance request to get user's TXs")
+        # [{"blockNum": 7562420,
+        #   "txHash": "0x2048c78f0a3a16ba32f9efb78ddcdfd7f3616aa45db0d59863464a848c6bf555",
+        #   "txTime": 1721328090, "user": "0x623b3e76f7d0fff4eaeecc6a9bda55887377fbde", "chainId": "0x82750",
+        #   "base": "0x0000000000000000000000000000000000000000",
+        #   "quote": "0xa25b25548b4c98b0c7d3d27dca5d5ca743d68b7f", "poolIdx": 420,
+        #   "baseFlow": 3178487101439531, "quoteFlow": 3000000000000000, "entityType": "liqchange",
+        #   "changeType": "mint", "positionType": "concentrated", "bidTick": 124, "askTick": 228,
+        #   "isBuy": false, "inBaseQty": false,
+        #   "txId": "tx_a4b4f8dedf625f8185d595edec867214ade173118c1f804aea95cb82d94d953e"},...]
+        try:
+            return await ambient_indexer.get_user_pool_txs(self.address, base, quote, self.pool_id)
+        except Exception as e:
+            logger.error(f"[{self.account_id}][{self.address}][{self.chain}] Bad Ambient finance request to get user's TXs: {e}")
+
+            raise
 
     async def get_total_deposit_amount(self) -> float:
         base = self.eth_address
@@ -455,21 +373,63 @@ class AmbientFinance(Account):
 
         return total / 10 ** 18
 
-    async def get_active_positions(self, base: str, quote: str) -> List[dict]:
-        positions = await self.get_liquidity_positions(base, quote)
+    async def query_ranges(self, base: str, quote: str, ranges: List[Tuple[int, int]]) -> Tuple[int, List[Tuple[int, int, int]]]:
+        """
+        Curve price and (liquidity, baseQty, quoteQty) of the wallet's (bidTick, askTick) ranges,
+        read through Multicall3 from one block
+        """
+        base = Web3.to_checksum_address(base)
+        quote = Web3.to_checksum_address(quote)
+        croc_address = self.croc_contract.address
+
+        calls = [(croc_address, self.croc_contract.encodeABI(fn_name="queryPrice", args=[base, quote, self.pool_id]))]
+        for bid_tick, ask_tick in ranges:
+            calls.append((croc_address, self.croc_contract.encodeABI(
+                fn_name="queryRangeTokens",
+                args=[self.address, base, quote, self.pool_id, int(bid_tick), int(ask_tick)]
+            )))
+
+        # один eth_call выполняется в одном блоке, если пачек несколько - фиксируем блок
+        block_identifier = "latest" if len(calls) <= MULTICALL_BATCH_SIZE else await self.w3.eth.block_number
+
+        results = await aggregate(self.w3, self.chain, calls, block_identifier)
+        if not all(success for success, _ in results):
+            raise Exception("Failed to query Ambient finance positions from contract")
+
+        curve_price = decode(["uint128"], results[0][1])[0]
+        ranges_tokens = [tuple(decode(["uint128", "uint128", "uint128"], data)) for _, data in results[1:]]
+
+        return curve_price, ranges_tokens
+
+    async def get_positions_state(self, base: str, quote: str) -> Tuple[int, List[dict]]:
+        """
+        Curve price and active positions of the wallet, verified through the contract in one read
+        """
+        positions, user_tx_list = await asyncio.gather(
+            self.get_liquidity_positions(base, quote),
+            self.get_user_txs(base, quote),
+        )
         active_positions_from_api = [p for p in positions if int(p["concLiq"]) > 0]
-        active_positions = []
+        api_mint_txs = {p["lastMintTx"] for p in active_positions_from_api}
 
-        for position in active_positions_from_api:
-            # проверяем что позиция на самом деле активна через контракт
-            liq, baseQty, quoteQty = await self.croc_contract.functions.queryRangeTokens(
-                self.address,
-                Web3.to_checksum_address(base),
-                Web3.to_checksum_address(quote),
-                self.pool_id,
-                position["bidTick"],
-                position["askTick"]
-            ).call()
+        # TODO: наверное репозицию тоже надо проверять
+        # по списку последних транзацкий можно понять, что есть активная позиция, которая возможно не обновилась в апи
+        mint_txs = []
+        for tx in user_tx_list:
+            if tx["changeType"] != "mint":
+                break
+            if tx["txHash"] not in api_mint_txs:
+                mint_txs.append(tx)
+
+        # проверяем что позиции на самом деле активны через контракт, все одним запросом
+        curve_price, ranges_tokens = await self.query_ranges(
+            base,
+            quote,
+            [(p["bidTick"], p["askTick"]) for p in active_positions_from_api + mint_txs]
+        )
+
+        active_positions = []
+        for position, (liq, baseQty, quoteQty) in zip(active_positions_from_api, ranges_tokens):
             if liq == 0:
                 logger.info(
                     f"[{self.account_id}][{self.address}][{self.chain}] Ambient Finance API return inactive position as active, skip it: {position}")
@@ -482,49 +442,33 @@ class AmbientFinance(Account):
                 position["quoteQty"] = quoteQty
                 active_positions.append(position)
 
-        user_tx_list = await self.get_user_txs(base, quote)
+        # позиции, которых нет в АПИ, но есть в последних транзакциях
+        for tx, (liq, baseQty, quoteQty) in zip(mint_txs, ranges_tokens[len(active_positions_from_api):]):
+            if liq == 0:
+                continue
+            tx["concLiq"] = liq
+            tx["positionId"] = "no id, tx hash: " + tx["txHash"]
+            tx["baseQty"] = baseQty
+            tx["quoteQty"] = quoteQty
+            active_positions.append(tx)
+
+        return curve_price, active_positions
 
-        # TODO: наверное репозицию тоже надо проверять
-        # по списку последних транзацкий можно понять, что есть активная позиция, которая возможно не обновилась в апи
-        for tx in user_tx_list:
-            if tx["changeType"] == "mint":
-                already_in_list = next((p for p in active_positions if p["lastMintTx"] == tx["txHash"]), None)
-
-                if not already_in_list:
-                    # получаем через контракт данные позиции, которой нет в АПИ
-                    liq, baseQty, quoteQty = await self.croc_contract.functions.queryRangeTokens(
-                        self.address,
-                        Web3.to_checksum_address(base),
-                        Web3.to_checksum_address(quote),
-                        self.pool_id,
-                        tx["bidTick"],
-                        tx["askTick"]
-                    ).call()
-                    if liq == 0:
-                        continue
-                    tx["concLiq"] = liq
-                    tx["positionId"] = "no id, tx hash: " + tx["txHash"]
-                    tx["baseQty"] = baseQty
-                    tx["quoteQty"] = quoteQty
-                    active_positions.append(tx)
-            else:
-                break
+    async def get_active_positions(self, base: str, quote: str) -> List[dict]:
+        _, active_positions = await self.get_positions_state(base, quote)
 
         return active_positions
 
-    async def is_position_out_of_range(self, base, quote, position) -> float:
-        eth_wrs_curve_price = await self.get_curve_price(base, quote)
-        current_price = sqrtp_to_price(eth_wrs_curve_price)
-        current_tick = price_to_tick(current_price)
-
-        return current_tick >= int(position["askTick"])
+    @staticmethod
+    def is_position_out_of_range(curve_price: int, position: dict) -> bool:
+        return tick_at_sqrt_price(curve_price) >= int(position["askTick"])
 
     async def get_outrange_positions(self, base: str, quote: str) -> List[dict]:
-        active_positions = await self.get_active_positions(base, quote)
+        curve_price, active_positions = await self.get_positions_state(base, quote)
         out_range_positions = []
 
         for position in active_positions:
-            is_out_range = await self.is_position_out_of_range(base, quote, position)
+            is_out_range = self.is_position_out_of_range(curve_price, position)
 
             if is_out_range:
                 out_range_positions.append(position)
@@ -553,7 +497,7 @@ class AmbientFinance(Account):
                     f"[{self.account_id}][{self.address}][{self.chain}] start remove {count} position: {position['positionId']}, {position['concLiq']} liq")
 
                 eth_wrs_curve_price = await self.get_curve_price(base, quote)
-                price = sqrtp_to_price(eth_wrs_curve_price)
+                price = sqrt_price_to_price(eth_wrs_curve_price)
                 new_range_width = 1
                 low_tick = price_to_tick(price * (1 - new_range_width / 100))
                 low_tick = int(low_tick / 4) * 4
@@ -561,11 +505,8 @@ class AmbientFinance(Account):
                 upper_tick = price_to_tick(price * (1 + new_range_width / 100))
                 upper_tick = int(upper_tick / 4) * 4 + 4
 
-                low_price = tick_to_price(low_tick)
-                upper_price = tick_to_price(upper_tick)
-
-                limitLower = price_to_sqrtp(low_price)
-                limitHigher = price_to_sqrtp(upper_price)
+                limitLower = sqrt_price_at_tick(low_tick)
+                limitHigher = sqrt_price_at_tick(upper_tick)
 
                 cmd = encode(
                     ["uint8",
@@ -621,13 +562,13 @@ class AmbientFinance(Account):
         base = self.eth_address
         quote = self.wrseth_address
 
-        active_positions = await self.get_active_positions(base, quote)
+        curve_price, active_positions = await self.get_positions_state(base, quote)
         logger.info(f"[{self.account_id}][{self.address}][{self.chain}] have {len(active_positions)} active position at ETH/wrsETH pool")
 
         count = 0
         for position in active_positions:
             try:
-                is_out_range = await self.is_position_out_of_range(base, quote, position)
+                is_out_range = self.is_position_out_of_range(curve_price, position)
 
                 if not is_out_range:
                     continue
@@ -637,7 +578,7 @@ class AmbientFinance(Account):
                     f"[{self.account_id}][{self.address}][{self.chain}] start reposit {count + 1}/{len(active_positions)} position: {pos_id}, {position['concLiq']} liq")
 
                 eth_wrs_curve_price = await self.get_curve_price(base, quote)
-                price = sqrtp_to_price(eth_wrs_curve_price)
+                price = sqrt_price_to_price(eth_wrs_curve_price)
 
                 low_tick = price_to_tick(price * (1 - new_range_width / 100))
                 low_tick = int(low_tick / 4) * 4
@@ -645,11 +586,8 @@ class AmbientFinance(Account):
                 upper_tick = price_to_tick(price * (1 + new_range_width / 100))
                 upper_tick = int(upper_tick / 4) * 4 + 4
 
-                low_price = tick_to_price(low_tick)
-                upper_price = tick_to_price(upper_tick)
-
-                limitLower = price_to_sqrtp(low_price)
-                limitHigher = price_to_sqrtp(upper_price)
+                limitLower = sqrt_price_at_tick(low_tick)
+                limitHigher = sqrt_price_at_tick(upper_tick)
 
                 cmd = encode(
                     ["uint8",
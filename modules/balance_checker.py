@@ -0,0 +1,43 @@
+from loguru import logger
+from tabulate import tabulate
+from web3 import Web3
+
+from settings import BALANCE_SCAN_CHAINS, BALANCE_SCAN_OUTPUT
+from utils.balances import scan_native_balances
+from utils.output import ResultWriter
+from utils.rpc import close_sessions
+from utils.wallets import wallet_registry
+
+
+async def check_balances():
+    logger.info("Start native balance checker")
+
+    addresses = [wallet["address"] for wallet in wallet_registry.get_wallets()]
+
+    try:
+        balances = await scan_native_balances(addresses, BALANCE_SCAN_CHAINS)
+    finally:
+        await close_sessions()
+
+    chains = list(balances)
+    table = [
+        [
+            index + 1,
+            address,
+            *[
+                "-" if balances[chain][index] is None else round(float(Web3.from_wei(balances[chain][index], "ether")), 6)
+                for chain in chains
+            ]
+        ]
+        for index, address in enumerate(addresses)
+    ]
+
+    if BALANCE_SCAN_OUTPUT:
+        writer = ResultWriter(BALANCE_SCAN_OUTPUT, chains)
+        try:
+            for row in table:
+                writer.write(row, chains)
+        finally:
+            writer.close()
+
+    print(tabulate(table, ["#", "Address", *chains], tablefmt="github"))
@@ -1,7 +1,5 @@
 import time
-import aiohttp
 
-from aiohttp_socks import ProxyType, ProxyConnector, ChainProxyConnector
 from loguru import logger
 from web3 import Web3
 
@@ -10,6 +8,7 @@ from settings import PROXY
 
 from utils.gas_checker import check_gas
 from utils.helpers import retry, checkLastIteration, get_action_tx_count
+from utils.http import http_client
 from .account import Account
 
 class KyberSwap(Account):
@@ -18,7 +17,6 @@ class KyberSwap(Account):
 
         self.swap_contract = self.get_contract(KYBERSWAP_CONTRACTS["router"], KYBERSWAP_ROUTER_ABI)
         self.native_token_address = "0xEeeeeEeeeEeEeeEeEeEeeEEEeeeeEeeeeeeeEEeE"
-        self.connector = None if PROXY is None or PROXY.strip() == "" else ProxyConnector.from_url(PROXY)
 
     async def build_swap(self, from_token: str, to_token: str, amount: int, sender: str, recipient: str, slippage: int) -> dict:
         route_url = "https://aggregator-api.kyberswap.com/scroll/api/v1/routes"
@@ -30,9 +28,7 @@ class KyberSwap(Account):
             "gasInclude": "True"
         }
 
-        async with aiohttp.ClientSession(connector=self.connector) as session:
-            route_response = await session.get(url=route_url, params=route_params)
-
+        async with http_client.get(url=route_url, params=route_params, proxy=PROXY) as route_response:
             if route_response.status == 200:
                 route_res_json = await route_response.json()
 
@@ -46,19 +42,18 @@ class KyberSwap(Account):
                         "recipient": recipient,
                     }
 
-                    build_response = await session.post(url=build_url, json=build_body)
-
-                    if build_response.status == 200:
-                        build_res_json = await build_response.json()
+                    async with http_client.post(url=build_url, json=build_body, proxy=PROXY) as build_response:
+                        if build_response.status == 200:
+                            build_res_json = await build_response.json()
 
-                        if build_res_json["data"]:
-                            return build_res_json["data"]
+                            if build_res_json["data"]:
+                                return build_res_json["data"]
+                            else:
+                                logger.error(f"Kyberswap did not return swap data: {build_res_json}")
+                                return None
                         else:
-                            logger.error(f"Kyberswap did not return swap data: {build_res_json}")
+                            logger.error(f"Bad Kyberswap build swap request: {build_response}")
                             return None
-                    else:
-                        logger.error(f"Bad Kyberswap build swap request: {build_response}")
-                        return None
                 else:
                     logger.error(f"Kyberswap did not return the best route: {route_res_json}")
                     return None
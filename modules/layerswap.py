@@ -1,11 +1,11 @@
 from typing import Union, Dict
 
-import aiohttp
 from loguru import logger
 
 from settings import LAYERSWAP_API_KEY
 from utils.gas_checker import check_gas
 from utils.helpers import retry, checkLastIteration
+from utils.http import http_client
 from .account import Account
 
 
@@ -36,9 +36,7 @@ class LayerSwap(Account):
             "destinationAsset": "ETH",
         }
 
-        async with aiohttp.ClientSession() as session:
-            response = await session.get(url=url, params=params)
-
+        async with http_client.get(url=url, params=params) as response:
             if response.status == 200:
                 transaction_data = await response.json()
 
@@ -64,9 +62,7 @@ class LayerSwap(Account):
             "refuel": False
         }
 
-        async with aiohttp.ClientSession() as session:
-            response = await session.post(url=url, json=params)
-
+        async with http_client.post(url=url, json=params) as response:
             if response.status == 200:
                 transaction_data = await response.json()
 
@@ -94,9 +90,7 @@ class LayerSwap(Account):
             "destination_address": self.address
         }
 
-        async with aiohttp.ClientSession() as session:
-            response = await session.post(url=url, headers=self.headers, json=params)
-
+        async with http_client.post(url=url, headers=self.headers, json=params) as response:
             if response.status == 200:
                 transaction_data = await response.json()
 
@@ -120,9 +114,7 @@ class LayerSwap(Account):
             "from_address": self.address
         }
 
-        async with aiohttp.ClientSession() as session:
-            response = await session.get(url=url, headers=self.headers, params=params)
-
+        async with http_client.get(url=url, headers=self.headers, params=params) as response:
             if response.status == 200:
                 transaction_data = await response.json()
 
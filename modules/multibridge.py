@@ -3,8 +3,10 @@ from typing import Union
 
 from loguru import logger
 from config import SCROLL_TOKENS
-from modules import *
+from utils.balances import scan_native_balances
 from utils.sleeping import sleep
+from .account import Account
+from .nitro import Nitro
 
 
 class Multibridge(Account):
@@ -21,10 +23,14 @@ class Multibridge(Account):
     async def get_native_balances(self, chains: list, min_chain_balance: float):
         chain_list = []
 
+        balances = await scan_native_balances([self.address], chains)
+
         for chain in chains:
-            chain_acc = Account(self.account_id, self.private_key, chain, self.recipient)
+            balance = balances[chain][0]
 
-            balance = await chain_acc.w3.eth.get_balance(self.address)
+            if balance is None:
+                logger.warning(f"[{self.account_id}][{self.address}] Failed to get {chain} balance, skip chain")
+                continue
 
             print({"chain": chain, "balance_wei": balance, "balance": self.w3.from_wei(balance, "ether")})
 
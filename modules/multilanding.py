@@ -1,28 +1,38 @@
+import asyncio
 import random
 from typing import Union
 
 from loguru import logger
 from config import SCROLL_TOKENS
-from modules import *
 from utils.sleeping import sleep
+from .account import Account
+from .aave import Aave
+from .compound import CompoundFinance
+from .layerbank import LayerBank
+from .rhomarkets import Rhomarkets
 
 
 class Multilanding(Account):
     def __init__(self, account_id: int, private_key: str, recipient: str) -> None:
         super().__init__(account_id=account_id, private_key=private_key, chain="scroll", recipient=recipient)
 
-        self.landing_modules = {
-            "layerbank": LayerBank(self.account_id, self.private_key, self.recipient),
-            "aave": Aave(self.account_id, self.private_key, self.recipient),
-            "compoundfinance": CompoundFinance(self.account_id, self.private_key, self.recipient),
-            "rhomarkets": Rhomarkets(self.account_id, self.private_key, self.recipient)
-        }
+        with self.shared_context():
+            self.landing_modules = {
+                "layerbank": LayerBank(self.account_id, self.private_key, self.recipient),
+                "aave": Aave(self.account_id, self.private_key, self.recipient),
+                "compoundfinance": CompoundFinance(self.account_id, self.private_key, self.recipient),
+                "rhomarkets": Rhomarkets(self.account_id, self.private_key, self.recipient)
+            }
 
     async def get_last_iter(self, module_cooldown):
-        return {module_name: await self.landing_modules[module_name].check_last_iteration(module_cooldown) for module_name in self.landing_modules}
+        statuses = await asyncio.gather(*[
+            module.check_last_iteration(module_cooldown) for module in self.landing_modules.values()
+        ])
+
+        return dict(zip(self.landing_modules, statuses))
 
     async def get_can_withdraw_status(self, module_cooldown):
-        return {module_name: await self.landing_modules[module_name].check_last_iteration(module_cooldown) for module_name in self.landing_modules}
+        return await self.get_last_iter(module_cooldown)
 
     async def get_landing_module(self, use_dex: list, module_cooldown: int, max_dex: int = 0):
         modules_last_iter = await self.get_last_iter(module_cooldown)
@@ -46,10 +56,13 @@ class Multilanding(Account):
         return self.landing_modules[landing_module]
 
     async def get_module_to_withdrawal(self, use_dex: list, module_cooldown):
-        modules_last_iter = await self.get_last_iter(module_cooldown)
+        modules_last_iter, can_withdraw_statuses = await asyncio.gather(
+            self.get_last_iter(module_cooldown),
+            asyncio.gather(*[self.landing_modules[dex].can_withdraw() for dex in use_dex])
+        )
+        modules_can_withdraw_statuses = dict(zip(use_dex, can_withdraw_statuses))
 
         logger.info(f"[{self.account_id}][{self.address}] MultiLanding DEXs last tx less than {module_cooldown} sec ago: {modules_last_iter}")
-        modules_can_withdraw_statuses = {dex: await self.landing_modules[dex].can_withdraw() for dex in use_dex}
 
         logger.info(f"[{self.account_id}][{self.address}] MultiLanding DEXs can withdraw statuses: {modules_can_withdraw_statuses}")
         use_dex = [dex for dex in use_dex if modules_last_iter[dex] is not False and modules_can_withdraw_statuses[dex] is True]
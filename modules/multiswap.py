@@ -1,30 +1,43 @@
+import asyncio
 import random
 from typing import Union
 
 from loguru import logger
 from config import SCROLL_TOKENS
-from modules import *
 from utils.sleeping import sleep
+from .account import Account
+from .ambient_finance import AmbientFinance
+from .kyberswap import KyberSwap
+from .odosprotocol import Odos
+from .open_ocean import OpenOcean
+from .skydrome import Skydrome
+from .sushi_swap import SushiSwap
+from .syncswap import SyncSwap
+from .xyswap import XYSwap
+from .zebra import Zebra
 
 
 class Multiswap(Account):
     def __init__(self, account_id: int, private_key: str, recipient: str) -> None:
         super().__init__(account_id=account_id, private_key=private_key, chain="scroll", recipient=recipient)
 
-        self.swap_modules = {
-            "syncswap": SyncSwap(self.account_id, self.private_key, self.recipient),
-            "skydrome": Skydrome(self.account_id, self.private_key, self.recipient),
-            "zebra": Zebra(self.account_id, self.private_key, self.recipient),
-            "xyswap": XYSwap(self.account_id, self.private_key, self.recipient),
-            "ambient_finance": AmbientFinance(self.account_id, self.private_key, self.recipient),
-            "kyberswap": KyberSwap(self.account_id, self.private_key, self.recipient),
-            "sushiswap": SushiSwap(self.account_id, self.private_key, self.recipient),
-            "openocean": OpenOcean(self.account_id, self.private_key, self.recipient),
-            "odos": Odos(self.account_id, self.private_key, self.recipient),
-        }
+        with self.shared_context():
+            self.swap_modules = {
+                "syncswap": SyncSwap(self.account_id, self.private_key, self.recipient),
+                "skydrome": Skydrome(self.account_id, self.private_key, self.recipient),
+                "zebra": Zebra(self.account_id, self.private_key, self.recipient),
+                "xyswap": XYSwap(self.account_id, self.private_key, self.recipient),
+                "ambient_finance": AmbientFinance(self.account_id, self.private_key, self.recipient),
+                "kyberswap": KyberSwap(self.account_id, self.private_key, self.recipient),
+                "sushiswap": SushiSwap(self.account_id, self.private_key, self.recipient),
+                "openocean": OpenOcean(self.account_id, self.private_key, self.recipient),
+                "odos": Odos(self.account_id, self.private_key, self.recipient),
+            }
 
     async def get_swap_modules_tx_count(self):
-        return {module_name: await self.swap_modules[module_name].get_action_tx_count() for module_name in self.swap_modules}
+        tx_counts = await asyncio.gather(*[module.get_action_tx_count() for module in self.swap_modules.values()])
+
+        return dict(zip(self.swap_modules, tx_counts))
 
     async def get_swap_module(self, use_dex: list, max_tx: int = 1):
         modules_tx_count = await self.get_swap_modules_tx_count()
@@ -1,9 +1,9 @@
-import aiohttp
 from loguru import logger
 
 from config import NFT_ORIGINS_CONTRACT, NFT_ORIGINS_ABI
 from utils.gas_checker import check_gas
 from utils.helpers import retry
+from utils.http import http_client
 from .account import Account
 
 
@@ -16,9 +16,7 @@ class NftOrigins(Account):
     async def get_nft_data(self):
         url = f"https://nft.scroll.io/p/{self.address}.json"
 
-        async with aiohttp.ClientSession() as session:
-            response = await session.get(url=url)
-
+        async with http_client.get(url=url) as response:
             if response.status == 200:
                 transaction_data = await response.json()
 
@@ -1,7 +1,7 @@
-import aiohttp
 from loguru import logger
 from utils.gas_checker import check_gas
 from utils.helpers import retry, checkLastIteration
+from utils.http import http_client
 from .account import Account
 
 
@@ -31,9 +31,7 @@ class Nitro(Account):
             "partnerId": 1
         }
 
-        async with aiohttp.ClientSession() as session:
-            response = await session.get(url=url, params=params)
-
+        async with http_client.get(url=url, params=params) as response:
             transaction_data = await response.json()
 
             return transaction_data
@@ -41,9 +39,7 @@ class Nitro(Account):
     async def build_transaction(self, params: dict):
         url = "https://api-beta.pathfinder.routerprotocol.com/api/v2/transaction"
 
-        async with aiohttp.ClientSession() as session:
-            response = await session.post(url=url, json=params)
-
+        async with http_client.post(url=url, json=params) as response:
             transaction_data = await response.json()
 
             return transaction_data
@@ -1,19 +1,14 @@
 from typing import Dict
 
-import aiohttp
-from aiohttp_socks import ProxyType, ProxyConnector, ChainProxyConnector
 from loguru import logger
 from config import SCROLL_TOKENS, ZERO_ADDRESS, ODOS_SWAP_CONTRACTS, ODOS_ROUTER_ABI
 from settings import PROXY
 from utils.gas_checker import check_gas
 from utils.helpers import retry, get_action_tx_count
+from utils.http import http_client
 from .account import Account
 
 
-def get_connector():
-    return None if PROXY is None or PROXY.strip() == "" else ProxyConnector.from_url(PROXY)
-
-
 class Odos(Account):
     def __init__(self, account_id: int, private_key: str, recipient: str) -> None:
         super().__init__(account_id=account_id, private_key=private_key, chain="scroll", recipient=recipient)
@@ -60,9 +55,7 @@ class Odos(Account):
             "compact": True,
         }
 
-        async with aiohttp.ClientSession(connector=get_connector()) as session:
-            response = await session.post(url=url, json=body, headers=self.headers)
-
+        async with http_client.post(url=url, json=body, headers=self.headers, proxy=PROXY) as response:
             quote = await response.json()
 
             print(quote)
@@ -78,9 +71,7 @@ class Odos(Account):
             "simulate": False, # this can be set to true if the user isn't doing their own estimate gas call for the transaction
         }
 
-        async with aiohttp.ClientSession(connector=get_connector()) as session:
-            response = await session.post(url=url, json=body, headers=self.headers)
-
+        async with http_client.post(url=url, json=body, headers=self.headers, proxy=PROXY) as response:
             transaction_data = await response.json()
 
             return transaction_data
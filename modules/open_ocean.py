@@ -1,11 +1,11 @@
 import time
-import aiohttp
 
 from loguru import logger
 from web3 import Web3
 from config import OPENOCEAN_ROUTER_ABI, OPENOCEAN_CONTRACTS, SCROLL_TOKENS
 from utils.gas_checker import check_gas
 from utils.helpers import retry, checkLastIteration, get_action_tx_count
+from utils.http import http_client
 from .account import Account
 
 
@@ -53,9 +53,7 @@ class OpenOcean(Account):
             "flags": 0,
         }
 
-        async with aiohttp.ClientSession() as session:
-            response = await session.get(url=url, params=params)
-
+        async with http_client.get(url=url, params=params) as response:
             if response.status == 200:
                 res_json = await response.json()
 
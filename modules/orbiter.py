@@ -1,8 +1,8 @@
-import aiohttp
 from loguru import logger
 
 from utils.gas_checker import check_gas
 from utils.helpers import retry, checkLastIteration
+from utils.http import http_client
 from .account import Account
 from config import ORBITER_CONTRACT
 
@@ -35,13 +35,11 @@ class Orbiter(Account):
             "params": [f"{self.chain_ids[from_chain]}-{self.chain_ids[to_chain]}:ETH-ETH", float(amount)]
         }
 
-        async with aiohttp.ClientSession() as session:
-            response = await session.post(
+        async with http_client.post(
                 url=url,
                 headers={"Content-Type": "application/json"},
                 json=data,
-            )
-
+        ) as response:
             response_data = await response.json()
 
             if response_data.get("result").get("error", None) is None:
@@ -1,9 +1,7 @@
-import os
 import random
 import traceback
 
 from loguru import logger
-from eth_account import Account as EthereumAccount
 from onecache import CacheDecorator
 
 from config import (SCROLL_TOKENS,
@@ -11,11 +9,12 @@ from config import (SCROLL_TOKENS,
                     OKEX_SECRET_KEY,
                     OKEX_PASSPHRASE,
                     OKEX_PROXY,
-                    DEPOSITS_ADDRESSES,
-                    ACCOUNTS)
+                    DEPOSITS_ADDRESSES)
 from settings import RANDOM_WALLET, RETRY_COUNT
 from utils.helpers import get_eth_usd_price, timeout
 from utils.sleeping import sleep
+from utils.state import state_store
+from utils.wallets import wallet_registry
 from . import AmbientFinance, Kelp, Scroll
 from .account import Account
 from .okex import Okex
@@ -23,6 +22,9 @@ from .okex import Okex
 wrsETH = "WRSETH"
 AMBIENT_BADGE_CURRENT_ACCOUNTS_FILE = "temp/ambient_badge_current_accounts.txt"
 AMBIENT_BADGE_SCENARIO_FINISHED_ACCOUNTS_FILE = "temp/ambient_badge_scenario_finished_accounts.txt"
+# множества адресов в state_store, файлы выше - их формат импорта/экспорта
+AMBIENT_BADGE_CURRENT_ACCOUNTS = "ambient_badge_current_accounts"
+AMBIENT_BADGE_SCENARIO_FINISHED_ACCOUNTS = "ambient_badge_scenario_finished_accounts"
 USD_1000 = 1000
 
 
@@ -45,38 +47,37 @@ def retry(func, sleep_from: int = 10, sleep_to: int = 20, return_false=True):
     return wrapper
 
 
+def get_ambient_badge_state():
+    state_store.attach_file(AMBIENT_BADGE_CURRENT_ACCOUNTS, AMBIENT_BADGE_CURRENT_ACCOUNTS_FILE)
+    state_store.attach_file(AMBIENT_BADGE_SCENARIO_FINISHED_ACCOUNTS, AMBIENT_BADGE_SCENARIO_FINISHED_ACCOUNTS_FILE)
+
+    return state_store
+
+
 def get_random_account():
     wallets = [
         {
-            "id": _id,
-            "key": key,
-        } for _id, key in enumerate(ACCOUNTS, start=1)
+            "id": wallet["id"],
+            "key": wallet["key"],
+        } for wallet in wallet_registry.get_wallets()
     ]
 
-    if os.path.exists('wl.txt'):
-        wallet_addresses = {EthereumAccount.from_key(wallet['key']).address.lower(): wallet for wallet in wallets}
-
-        with open('wl.txt', 'r') as file:
-            logger.info(f"wl.txt is specified, filter current accounts")
-            existing_addresses = {line.strip().lower() for line in file.readlines()}
+    whitelist = wallet_registry.load_whitelist()
+    if whitelist is not None:
+        logger.info(f"wl.txt is specified, filter current accounts")
+        wallets = wallet_registry.filter_addresses(wallets, whitelist)
 
-        filtered_wallets = [wallet for address, wallet in wallet_addresses.items() if address in existing_addresses]
-        wallets = filtered_wallets
+    state = get_ambient_badge_state()
 
-    with open(AMBIENT_BADGE_SCENARIO_FINISHED_ACCOUNTS_FILE, 'r') as file:
-        wallets_already_finished_scenario = [row.strip().lower() for row in file if row.strip() != ""]
-        logger.debug(
-            f"There are {len(wallets_already_finished_scenario)} accounts what already finished ambient badge scenario (file: {AMBIENT_BADGE_SCENARIO_FINISHED_ACCOUNTS_FILE})")
+    wallets_already_finished_scenario = state.members(AMBIENT_BADGE_SCENARIO_FINISHED_ACCOUNTS)
+    logger.debug(
+        f"There are {len(wallets_already_finished_scenario)} accounts what already finished ambient badge scenario")
 
-    with open(AMBIENT_BADGE_CURRENT_ACCOUNTS_FILE, 'r') as file:
-        wallets_to_continue = [row.strip().lower() for row in file if row.strip() != ""]
-        logger.debug(
-            f"There are {len(wallets_to_continue)} accounts to continue (file: {AMBIENT_BADGE_CURRENT_ACCOUNTS_FILE})")
+    wallets_to_continue = state.members(AMBIENT_BADGE_CURRENT_ACCOUNTS)
+    logger.debug(f"There are {len(wallets_to_continue)} accounts to continue")
 
-    wallet_addresses = {EthereumAccount.from_key(wallet['key']).address.lower(): wallet for wallet in wallets}
-    filtered_wallets = [wallet for address, wallet in wallet_addresses.items() if
-                        address not in wallets_already_finished_scenario and address not in wallets_to_continue]
-    wallets = filtered_wallets
+    excluded_addresses = set(wallets_already_finished_scenario) | set(wallets_to_continue)
+    wallets = [wallet for wallet in wallets if wallet_registry.get_address(wallet["key"]).lower() not in excluded_addresses]
 
     if len(wallets) == 0:
         logger.info(f"There are no new eligible wallets to run script")
@@ -91,40 +92,38 @@ def get_random_account():
 def get_current_accounts():
     wallets = [
         {
-            "id": _id,
-            "key": key,
-        } for _id, key in enumerate(ACCOUNTS, start=1)
+            "id": wallet["id"],
+            "key": wallet["key"],
+        } for wallet in wallet_registry.get_wallets()
     ]
 
-    wallet_addresses = {EthereumAccount.from_key(wallet['key']).address.lower(): wallet for wallet in wallets}
-    with open(AMBIENT_BADGE_CURRENT_ACCOUNTS_FILE, 'r') as file:
-        current_addresses = [row.strip().lower() for row in file if row.strip() != ""]
-        logger.debug(
-            f"There are {len(current_addresses)} accounts to continue ambient badge scenario (file: {AMBIENT_BADGE_CURRENT_ACCOUNTS_FILE})")
+    current_addresses = get_ambient_badge_state().members(AMBIENT_BADGE_CURRENT_ACCOUNTS)
+    logger.debug(f"There are {len(current_addresses)} accounts to continue ambient badge scenario")
 
-    filtered_wallets = [wallet for address, wallet in wallet_addresses.items() if address in current_addresses]
-    wallets = filtered_wallets
+    wallets = wallet_registry.filter_addresses(wallets, set(current_addresses))
 
-    filtered_addresses = [address for address, wallet in wallet_addresses.items() if address in current_addresses]
-    current_addresses_no_private_key = [address for address in current_addresses if address not in filtered_addresses]
+    current_addresses_no_private_key = [
+        address for address in current_addresses if wallet_registry.get_by_address(address) is None
+    ]
 
     if len(current_addresses_no_private_key) > 0:
         logger.error(
-            f"Some addresses in {AMBIENT_BADGE_CURRENT_ACCOUNTS_FILE} have no a private key: {current_addresses_no_private_key}")
+            f"Some current ambient badge accounts have no a private key: {current_addresses_no_private_key}")
 
     return wallets
 
 
 def get_acc_address(acc):
-    return EthereumAccount.from_key(acc['key']).address.lower()
+    return wallet_registry.get_address(acc['key']).lower()
 
 
 class Scenarios(Account):
     def __init__(self, account_id: int, private_key: str, recipient: str) -> None:
         super().__init__(account_id=account_id, private_key=private_key, chain="scroll", recipient=recipient)
-        self.ambient_finance = AmbientFinance(account_id, private_key, recipient)
-        self.scroll = Scroll(account_id, private_key, "scroll", recipient)
-        self.scroll_ethereum = Scroll(account_id, private_key, "ethereum", recipient)
+        with self.shared_context():
+            self.ambient_finance = AmbientFinance(account_id, private_key, recipient)
+            self.scroll = Scroll(account_id, private_key, "scroll", recipient)
+            self.scroll_ethereum = Scroll(account_id, private_key, "ethereum", recipient)
         self.okex = None
 
         # используется для текущих аккаунтов для минта значка амбиент за 1000 депозит
@@ -138,13 +137,13 @@ class Scenarios(Account):
         self.account_id = account_id
         self.private_key = private_key
 
-        self.account = EthereumAccount.from_key(private_key)
-        self.address = self.account.address
+        self.address = wallet_registry.get_address(private_key)
         self.log_prefix = f"[{self.account_id}][{self.address}]"
 
-        self.ambient_finance = AmbientFinance(account_id, private_key, self.recipient)
-        self.scroll = Scroll(account_id, private_key, "scroll", self.recipient)
-        self.scroll_ethereum = Scroll(account_id, private_key, "ethereum", self.recipient)
+        with self.shared_context():
+            self.ambient_finance = AmbientFinance(account_id, private_key, self.recipient)
+            self.scroll = Scroll(account_id, private_key, "scroll", self.recipient)
+            self.scroll_ethereum = Scroll(account_id, private_key, "ethereum", self.recipient)
 
     async def get_wrseth_balance(self) -> int:
         return (await self.get_balance(SCROLL_TOKENS[wrsETH]))["balance_wei"]
@@ -356,7 +355,6 @@ class Scenarios(Account):
                                                  max_left_eth_balance: float,
                                                  min_deposit_percent: int,
                                                  max_deposit_percent: int,
-                                                 ambient_max_deposit_attempts: int = 1,
                                                  min_trade_amount_wrseth_wei: int = 5000000000000000):
         logger.info(f"[{self.account_id}][{self.address}] Start adjust Ambient wrsETH/ETH position")
         ambient_finance = AmbientFinance(self.account_id, self.private_key, self.recipient)
@@ -535,7 +533,6 @@ class Scenarios(Account):
             ambient_range_width,
             min_left_eth_balance,
             max_left_eth_balance,
-            ambient_max_deposit_attempts
         )
 
         if deposit_result is False:
@@ -731,12 +728,9 @@ class Scenarios(Account):
 
                 logger.debug(f"Deposit {balance_eth_wei_ethereum / 10 ** 18} ETH")
 
-                tx = await self.get_tx_data(balance_eth_wei_ethereum, False)
+                tx = await self.scroll_ethereum.get_tx_data(balance_eth_wei_ethereum, False)
                 tx.update({
                     "to": self.w3.to_checksum_address(deposit_addresses),
-                    "chainId": await self.scroll_ethereum.w3.eth.chain_id,
-                    "from": self.address,
-                    "nonce": await self.scroll_ethereum.w3.eth.get_transaction_count(self.address)
                 })
 
                 signed_txn = await self.scroll_ethereum.sign(tx, gas=21000, sub_fee_from_value=True)
@@ -772,8 +766,6 @@ class Scenarios(Account):
         # минимальный размер ордера продажи покупки wrseth
         min_trade_amount_wrseth_wei = 500000000000000000  # убрать после бейджей - тк это вызывает две лишних итерации
 
-        # сколько раз повторяем депозит с уменьшением кол-ва баланса
-        ambient_max_deposit_attempts = 100
         await self.adjust_ambient_wrseth_eth_position(
             decimal,
             ambient_min_amount,
@@ -786,7 +778,6 @@ class Scenarios(Account):
             max_left_eth_balance,
             min_deposit_percent,
             max_deposit_percent,
-            ambient_max_deposit_attempts,
             min_trade_amount_wrseth_wei
         )
 
@@ -1046,32 +1037,13 @@ class Scenarios(Account):
         # после вывода переходим к следующему аккаунту
         return False
 
-    def append_address_to_file(self, file_name: str, address=None):
+    def add_address_to_state(self, name: str, address=None):
         if not address:
             address = self.address
-        logger.debug(f"Try to add {address} to {file_name}")
+        logger.debug(f"Try to add {address} to {name}")
 
-        with open(file_name, 'r+') as file:
-            wallets = [row.strip().lower() for row in file if row.strip() != ""]
-            if address.lower() not in wallets:
-                file.write(f"{address.lower()}\n")
-            else:
-                logger.debug(f"Account {address} already in file {file_name}")
-
-    def remove_address_from_file(self, file_name: str, address=None):
-        if not address:
-            address = self.address
-        logger.info(f"Try to remove {address} from {file_name}")
-
-        with open(file_name, "r+") as file_input:
-            wallets = [row.strip().lower() for row in file_input if row.strip() != ""]
-
-            with open(file_name, "w") as output:
-                for wallet in wallets:
-                    if wallet.lower() != address.lower():
-                        output.write(f"{wallet.lower()}\n")
-                    else:
-                        logger.info(f" Account {address} removed from {file_name}")
+        if not get_ambient_badge_state().add(name, address):
+            logger.debug(f"Account {address} already in {name}")
 
     def handle_next_account(self, max_current_accounts):
         self.current_accounts = get_current_accounts()
@@ -1081,7 +1053,7 @@ class Scenarios(Account):
             acc = get_random_account()
             if acc:
                 # добавляем случайный аккаунт
-                self.append_address_to_file(AMBIENT_BADGE_CURRENT_ACCOUNTS_FILE, get_acc_address(acc))
+                self.add_address_to_state(AMBIENT_BADGE_CURRENT_ACCOUNTS, get_acc_address(acc))
                 self.current_accounts.append(acc)
                 self.current_account_index = 0
                 logger.info(
@@ -1121,7 +1093,7 @@ class Scenarios(Account):
             # если лимит аккаунтов ещё не превышен, то добавляем новый аккаунт
             acc = get_random_account()
             if acc:
-                self.append_address_to_file(AMBIENT_BADGE_CURRENT_ACCOUNTS_FILE, get_acc_address(acc))
+                self.add_address_to_state(AMBIENT_BADGE_CURRENT_ACCOUNTS, get_acc_address(acc))
                 self.current_accounts.append(acc)
                 self.current_account_index += 1
                 logger.info(
@@ -1144,8 +1116,9 @@ class Scenarios(Account):
         return True
 
     def _finish_current_account(self):
-        self.remove_address_from_file(AMBIENT_BADGE_CURRENT_ACCOUNTS_FILE)
-        self.append_address_to_file(AMBIENT_BADGE_SCENARIO_FINISHED_ACCOUNTS_FILE)
+        logger.info(f"{self.log_prefix} Move account to finished ambient badge accounts")
+
+        get_ambient_badge_state().move(self.address, AMBIENT_BADGE_CURRENT_ACCOUNTS, AMBIENT_BADGE_SCENARIO_FINISHED_ACCOUNTS)
 
     async def mint_ambient_providoor_badge(
             self,
@@ -1166,16 +1139,12 @@ class Scenarios(Account):
 
         # текущие аккаунты закончили выполнение скрипта, нужно получить новые
         if len(self.current_accounts) == 0:
-            with open(AMBIENT_BADGE_SCENARIO_FINISHED_ACCOUNTS_FILE, 'r') as file:
-                wallets_already_finished_scenario = [row.strip().lower() for row in file if row.strip() != ""]
-                logger.info(
-                    f"There are {len(wallets_already_finished_scenario)} accounts what already finished ambient badge scenario (file: {AMBIENT_BADGE_SCENARIO_FINISHED_ACCOUNTS_FILE})")
-            if self.address.lower() in wallets_already_finished_scenario:
+            if get_ambient_badge_state().contains(AMBIENT_BADGE_SCENARIO_FINISHED_ACCOUNTS, self.address):
                 logger.info(f"{self.log_prefix} Account already finished the scenario, move to next")
                 return False
 
             # добавляем случайный аккаунт
-            self.append_address_to_file(AMBIENT_BADGE_CURRENT_ACCOUNTS_FILE)
+            self.add_address_to_state(AMBIENT_BADGE_CURRENT_ACCOUNTS)
             self.current_accounts.append(
                 {
                     "id": self.account_id,
@@ -1,18 +1,17 @@
 import random
-import aiohttp
 
 from datetime import datetime
 from onecache import AsyncCacheDecorator
 
 from loguru import logger
 from eth_account.messages import encode_defunct
-from aiohttp_socks import ProxyType, ProxyConnector, ChainProxyConnector
 from web3 import Web3
 from web3.exceptions import ContractLogicError
 
 from settings import USE_PROXIES
 from utils.gas_checker import check_gas
 from utils.helpers import retry, checkLastIteration, float_floor
+from utils.http import http_client
 from utils.sleeping import sleep
 from .account import Account
 
@@ -349,9 +348,7 @@ class Scroll(Account):
             "address": self.address,
         }
 
-        async with aiohttp.ClientSession(connector=ProxyConnector.from_url(proxy) if proxy else None) as session:
-            response = await session.get(url=url, params=params)
-
+        async with http_client.get(url=url, params=params, proxy=proxy) as response:
             if response.status == 200:
                 status = await response.json()
 
@@ -378,9 +375,7 @@ class Scroll(Account):
             "timestamp": int(datetime.now().timestamp() * 1000)
         }
 
-        async with aiohttp.ClientSession(connector=ProxyConnector.from_url(proxy) if proxy else None) as session:
-            response = await session.post(url=url, json=body)
-
+        async with http_client.post(url=url, json=body, proxy=proxy) as response:
             if response.status == 200:
                 status = await response.json()
 
@@ -405,9 +400,7 @@ class Scroll(Account):
             "page_size": tx_count
         }
 
-        async with aiohttp.ClientSession(connector=ProxyConnector.from_url(proxy) if proxy else None) as session:
-            response = await session.get(url=url, params=params)
-
+        async with http_client.get(url=url, params=params, proxy=proxy) as response:
             if response.status == 200:
                 tx_list = await response.json()
 
@@ -429,9 +422,7 @@ class Scroll(Account):
             "page_size": tx_count
         }
 
-        async with aiohttp.ClientSession(connector=ProxyConnector.from_url(proxy) if proxy else None) as session:
-            response = await session.get(url=url, params=params)
-
+        async with http_client.get(url=url, params=params, proxy=proxy) as response:
             if response.status == 200:
                 tx_list = await response.json()
 
@@ -506,9 +497,7 @@ class Scroll(Account):
             "gender": 2,
         }
 
-        async with aiohttp.ClientSession(connector=ProxyConnector.from_url(proxy) if proxy else None) as session:
-            response = await session.post(url=url, params=body)
-
+        async with http_client.post(url=url, params=body, proxy=proxy) as response:
             if response.status == 200:
                 nicknames = await response.json()
 
@@ -526,9 +515,7 @@ class Scroll(Account):
             "Content-Type": "application/json; charset=UTF-8"
         }
 
-        async with aiohttp.ClientSession(connector=ProxyConnector.from_url(proxy) if proxy else None) as session:
-            response = await session.post(url=url, data=payload, headers=headers)
-
+        async with http_client.post(url=url, data=payload, headers=headers, proxy=proxy) as response:
             if response.status == 200:
                 response_data = await response.json()
                 if "d" in response_data and "Names" in response_data["d"]:
@@ -562,9 +549,7 @@ class Scroll(Account):
 
         url = f"https://canvas.scroll.cat/acc/{address}/code"
 
-        async with aiohttp.ClientSession(connector=ProxyConnector.from_url(proxy) if proxy else None) as session:
-            response = await session.get(url=url)
-
+        async with http_client.get(url=url, proxy=proxy) as response:
             if response.status == 200:
                 data = await response.json()
 
@@ -603,9 +588,7 @@ class Scroll(Account):
 
         url = f"https://canvas.scroll.cat/code/{referral_code}/sig/{self.address}"
 
-        async with aiohttp.ClientSession(connector=ProxyConnector.from_url(proxy) if proxy else None) as session:
-            response = await session.get(url=url)
-
+        async with http_client.get(url=url, proxy=proxy) as response:
             if response.status == 200:
                 data = await response.json()
 
@@ -629,9 +612,7 @@ class Scroll(Account):
             "recipient": self.address
         }
 
-        async with aiohttp.ClientSession(connector=ProxyConnector.from_url(proxy) if proxy else None) as session:
-            response = await session.get(url=url, params=params)
-
+        async with http_client.get(url=url, params=params, proxy=proxy) as response:
             if response.status == 200:
                 data = await response.json()
 
@@ -724,9 +705,7 @@ class Scroll(Account):
             "recipient": self.address
         }
 
-        async with aiohttp.ClientSession(connector=ProxyConnector.from_url(proxy) if proxy else None) as session:
-            response = await session.get(url=url, params=params)
-
+        async with http_client.get(url=url, params=params, proxy=proxy) as response:
             if response.status == 200:
                 data = await response.json()
 
@@ -1,11 +1,11 @@
 import time
-import aiohttp
 
 from loguru import logger
 from web3 import Web3
 from config import SUSHISWAP_ROUTER_ABI, SUSHISWAP_CONTRACTS, SCROLL_TOKENS
 from utils.gas_checker import check_gas
 from utils.helpers import retry, checkLastIteration, get_action_tx_count
+from utils.http import http_client
 from .account import Account
 
 
@@ -44,9 +44,7 @@ class SushiSwap(Account):
             "maxPriceImpact": 0.05
         }
 
-        async with aiohttp.ClientSession() as session:
-            response = await session.get(url=url, params=params)
-
+        async with http_client.get(url=url, params=params) as response:
             if response.status == 200:
                 res_json = await response.json()
 
@@ -3,8 +3,12 @@ from typing import List, Union
 
 from loguru import logger
 from config import SCROLL_TOKENS
-from modules import *
 from utils.sleeping import sleep
+from .account import Account
+from .skydrome import Skydrome
+from .syncswap import SyncSwap
+from .xyswap import XYSwap
+from .zebra import Zebra
 
 
 class SwapTokens(Account):
@@ -36,18 +40,23 @@ class SwapTokens(Account):
 
         logger.info(f"[{self.account_id}][{self.address}] Start swap tokens")
 
+        # свапаем только token -> ETH, балансы остальных токенов не меняются, берём все одним запросом
+        swap_tokens = [token for token in tokens if token != "ETH"]
+        balances = dict(zip(swap_tokens, await self.get_balances([SCROLL_TOKENS[token] for token in swap_tokens])))
+
         for _, token in enumerate(tokens, start=1):
             if token == "ETH":
                 continue
                 
-            balance = await self.get_balance(SCROLL_TOKENS[token])
+            balance = balances[token]
 
             if balance["balance"] <= 1:
                 logger.info(f"[{self.account_id}][{self.address}] Balance <= 1, skipping...")
                 return False
             
             if balance["balance_wei"] > 0:
-                swap_module = self.get_swap_module(use_dex)(self.account_id, self.private_key, self.recipient)
+                with self.shared_context():
+                    swap_module = self.get_swap_module(use_dex)(self.account_id, self.private_key, self.recipient)
                 await swap_module.swap(
                     token,
                     "ETH",
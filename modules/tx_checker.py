@@ -1,41 +1,64 @@
 import asyncio
-import random
 
-from eth_typing import ChecksumAddress
 from loguru import logger
-from web3 import AsyncWeb3, AsyncHTTPProvider
-from web3.middleware import async_geth_poa_middleware
-from eth_account import Account as EthereumAccount
 from tabulate import tabulate
 
-from config import ACCOUNTS, RPC
+from settings import TX_CHECKER_CHAINS, TX_CHECKER_BATCH_SIZE, TX_CHECKER_CONCURRENCY, TX_CHECKER_OUTPUT
+from utils.output import ResultWriter
+from utils.rpc import get_w3, batch_request, close_sessions
+from utils.wallets import wallet_registry
 
 
-async def get_nonce(address: ChecksumAddress):
-    web3 = AsyncWeb3(
-        AsyncHTTPProvider(random.choice(RPC["scroll"]["rpc"])),
-        middlewares=[async_geth_poa_middleware],
+async def get_nonces(chain: str, addresses: list) -> list:
+    results = await batch_request(
+        get_w3(chain),
+        [("eth_getTransactionCount", [address, "latest"]) for address in addresses]
     )
 
-    nonce = await web3.eth.get_transaction_count(address)
-
-    return nonce
+    return [int(result, 16) for result in results]
 
 
 async def check_tx():
-    tasks = []
-
     logger.info("Start transaction checker")
 
-    for _id, pk in enumerate(ACCOUNTS, start=1):
-        account = EthereumAccount.from_key(pk)
+    addresses = [wallet["address"] for wallet in wallet_registry.get_wallets()]
+    chains = TX_CHECKER_CHAINS
+    writer = ResultWriter(TX_CHECKER_OUTPUT, chains) if TX_CHECKER_OUTPUT else None
+    sem = asyncio.Semaphore(TX_CHECKER_CONCURRENCY)
+
+    async def _check_batch(start: int):
+        batch = addresses[start:start + TX_CHECKER_BATCH_SIZE]
+
+        async with sem:
+            nonces = await asyncio.gather(*[get_nonces(chain, batch) for chain in chains])
+
+        return [
+            [start + index + 1, address, *[chain_nonces[index] for chain_nonces in nonces]]
+            for index, address in enumerate(batch)
+        ]
+
+    tasks = [
+        asyncio.create_task(_check_batch(start))
+        for start in range(0, len(addresses), TX_CHECKER_BATCH_SIZE)
+    ]
+
+    table = []
+    try:
+        for task in asyncio.as_completed(tasks):
+            rows = await task
+            table.extend(rows)
 
-        tasks.append(asyncio.create_task(get_nonce(account.address), name=account.address))
+            if writer:
+                for row in rows:
+                    writer.write(row, chains)
+    finally:
+        if writer:
+            writer.close()
 
-    await asyncio.gather(*tasks)
+        await close_sessions()
 
-    table = [[k, i.get_name(), i.result()] for k, i in enumerate(tasks, start=1)]
+    table.sort(key=lambda row: row[0])
 
-    headers = ["#", "Address", "Nonce"]
+    headers = ["#", "Address", *[f"Nonce {chain}" for chain in chains]] if len(chains) > 1 else ["#", "Address", "Nonce"]
 
     print(tabulate(table, headers, tablefmt="github"))
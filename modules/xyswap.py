@@ -1,10 +1,10 @@
 from typing import Dict
 
-import aiohttp
 from loguru import logger
 from config import XYSWAP_CONTRACT, SCROLL_TOKENS
 from utils.gas_checker import check_gas
 from utils.helpers import retry, get_action_tx_count
+from utils.http import http_client
 from .account import Account
 
 
@@ -30,9 +30,7 @@ class XYSwap(Account):
             "slippage": slippage
         }
 
-        async with aiohttp.ClientSession() as session:
-            response = await session.get(url=url, params=params)
-
+        async with http_client.get(url=url, params=params) as response:
             transaction_data = await response.json()
 
             return transaction_data
@@ -57,9 +55,7 @@ class XYSwap(Account):
                 "commissionRate": 10000
             })
 
-        async with aiohttp.ClientSession() as session:
-            response = await session.get(url=url, params=params)
-
+        async with http_client.get(url=url, params=params) as response:
             transaction_data = await response.json()
 
             return transaction_data
@@ -116,7 +112,6 @@ class XYSwap(Account):
                 "to": self.w3.to_checksum_address(transaction_data["tx"]["to"]),
                 "data": transaction_data["tx"]["data"],
                 "value": transaction_data["tx"]["value"],
-                "nonce": await self.w3.eth.get_transaction_count(self.address)
             }
         )
 
@@ -1,5 +1,7 @@
 import asyncio
-from modules import *
+
+# модули протоколов импортируются при первом вызове функции (modules.Scroll), а не при старте
+import modules
 
 module_cooldown = 8888888
 
@@ -20,7 +22,7 @@ async def deposit_scroll(account_id, key, recipient):
     min_percent = 1
     max_percent = 1
 
-    scroll = Scroll(account_id, key, "ethereum", recipient)
+    scroll = modules.Scroll(account_id, key, "ethereum", recipient)
     await scroll.deposit(min_amount, max_amount, decimal, all_amount, min_percent, max_percent)
 
 
@@ -40,26 +42,26 @@ async def deposit_economy_scroll(account_id, key, recipient):
     min_percent = 1
     max_percent = 1
 
-    scroll = Scroll(account_id, key, "ethereum", recipient)
+    scroll = modules.Scroll(account_id, key, "ethereum", recipient)
     await scroll.deposit_economy(min_amount, max_amount, decimal, all_amount, min_percent, max_percent)
 
 
 async def scroll_sing_terms_of_use(account_id, key, recipient):
-    scroll = Scroll(account_id, key, "scroll", recipient)
+    scroll = modules.Scroll(account_id, key, "scroll", recipient)
     return await scroll.sign_terms_of_use()
 
 
 async def scroll_mint_canvas(account_id, key, recipient):
     min_left_eth_balance = 0.001
 
-    scroll = Scroll(account_id, key, "scroll", recipient)
+    scroll = modules.Scroll(account_id, key, "scroll", recipient)
     return await scroll.mint_canvas(min_left_eth_balance)
 
 
 async def scroll_mint_ethereum_year_badge(account_id, key, recipient):
     min_left_eth_balance = 0.0005
 
-    scroll = Scroll(account_id, key, "scroll", recipient)
+    scroll = modules.Scroll(account_id, key, "scroll", recipient)
     return await scroll.mint_ethereum_year_badge(min_left_eth_balance)
 
 
@@ -79,7 +81,7 @@ async def withdraw_scroll(account_id, key, recipient):
     min_percent = 10
     max_percent = 10
 
-    scroll = Scroll(account_id, key, "scroll", recipient)
+    scroll = modules.Scroll(account_id, key, "scroll", recipient)
     await scroll.withdraw(min_amount, max_amount, decimal, all_amount, min_percent, max_percent)
 
 
@@ -103,7 +105,7 @@ async def bridge_orbiter(account_id, key, recipient):
     min_percent = 5
     max_percent = 10
 
-    orbiter = Orbiter(account_id=account_id, private_key=key, chain=from_chain, recipient=recipient)
+    orbiter = modules.Orbiter(account_id=account_id, private_key=key, chain=from_chain, recipient=recipient)
     return await orbiter.bridge(to_chain, min_amount, max_amount, decimal, all_amount, min_percent, max_percent,
                                 module_cooldown)
 
@@ -133,7 +135,7 @@ async def bridge_layerswap(account_id, key, recipient):
     min_percent = 5
     max_percent = 5
 
-    layerswap = LayerSwap(account_id=account_id, private_key=key, chain=from_chain, recipient=recipient)
+    layerswap = modules.LayerSwap(account_id=account_id, private_key=key, chain=from_chain, recipient=recipient)
     return await layerswap.bridge(
         from_chain, to_chain, min_amount, max_amount, decimal, all_amount, min_percent, max_percent, module_cooldown
     )
@@ -164,7 +166,7 @@ async def bridge_layerswap2(account_id, key, recipient):
     min_percent = 5
     max_percent = 5
 
-    layerswap = LayerSwap(account_id=account_id, private_key=key, chain=from_chain, recipient=recipient)
+    layerswap = modules.LayerSwap(account_id=account_id, private_key=key, chain=from_chain, recipient=recipient)
     return await layerswap.bridge(
         from_chain, to_chain, min_amount, max_amount, decimal, all_amount, min_percent, max_percent, module_cooldown
     )
@@ -190,7 +192,7 @@ async def bridge_nitro(account_id, key, recipient):
     min_percent = 5
     max_percent = 10
 
-    nitro = Nitro(account_id=account_id, private_key=key, chain=from_chain, recipient=recipient)
+    nitro = modules.Nitro(account_id=account_id, private_key=key, chain=from_chain, recipient=recipient)
     return await nitro.bridge(to_chain, min_amount, max_amount, decimal, all_amount, min_percent, max_percent,
                               module_cooldown)
 
@@ -215,7 +217,7 @@ async def bridge_nitro1(account_id, key, recipient):
     min_percent = 5
     max_percent = 10
 
-    nitro = Nitro(account_id=account_id, private_key=key, chain=from_chain, recipient=recipient)
+    nitro = modules.Nitro(account_id=account_id, private_key=key, chain=from_chain, recipient=recipient)
     return await nitro.bridge(to_chain, min_amount, max_amount, decimal, all_amount, min_percent, max_percent,
                               module_cooldown)
 
@@ -236,7 +238,7 @@ async def wrap_eth(account_id, key, recipient):
     min_percent = 5
     max_percent = 10
 
-    scroll = Scroll(account_id, key, "scroll", recipient)
+    scroll = modules.Scroll(account_id, key, "scroll", recipient)
     await scroll.wrap_eth(min_amount, max_amount, decimal, all_amount, min_percent, max_percent)
 
 
@@ -256,7 +258,7 @@ async def unwrap_eth(account_id, key, recipient):
     min_percent = 100
     max_percent = 100
 
-    scroll = Scroll(account_id, key, "scroll", recipient)
+    scroll = modules.Scroll(account_id, key, "scroll", recipient)
     await scroll.unwrap_eth(min_amount, max_amount, decimal, all_amount, min_percent, max_percent)
 
 
@@ -285,7 +287,7 @@ async def swap_skydrome(account_id, key, recipient):
     min_percent = 100
     max_percent = 100
 
-    skydrome = Skydrome(account_id, key, recipient)
+    skydrome = modules.Skydrome(account_id, key, recipient)
     return await skydrome.swap(
         from_token, to_token, min_amount, max_amount, decimal, slippage, all_amount, min_percent, max_percent
     )
@@ -316,7 +318,7 @@ async def swap_kyberswap(account_id, key, recipient):
     min_percent = 30
     max_percent = 60
 
-    kyberswap = KyberSwap(account_id, key, recipient)
+    kyberswap = modules.KyberSwap(account_id, key, recipient)
     return await kyberswap.swap(
         from_token, to_token, min_amount, max_amount, decimal, slippage, all_amount, min_percent, max_percent
     )
@@ -347,7 +349,7 @@ async def swap_openocean(account_id, key, recipient):
     min_percent = 30
     max_percent = 60
 
-    openocean = OpenOcean(account_id, key, recipient)
+    openocean = modules.OpenOcean(account_id, key, recipient)
     return await openocean.swap(
         from_token, to_token, min_amount, max_amount, decimal, slippage, all_amount, min_percent, max_percent
     )
@@ -378,7 +380,7 @@ async def swap_sushiswap(account_id, key, recipient):
     min_percent = 30
     max_percent = 60
 
-    sushiswap = SushiSwap(account_id, key, recipient)
+    sushiswap = modules.SushiSwap(account_id, key, recipient)
     return await sushiswap.swap(
         from_token, to_token, min_amount, max_amount, decimal, slippage, all_amount, min_percent, max_percent
     )
@@ -409,7 +411,7 @@ async def swap_ambient_finance(account_id, key, recipient):
     min_percent = 100
     max_percent = 100
 
-    ambient_finance = AmbientFinance(account_id, key, recipient)
+    ambient_finance = modules.AmbientFinance(account_id, key, recipient)
     return await ambient_finance.swap(
         from_token, to_token, min_amount, max_amount, decimal, slippage, all_amount, min_percent, max_percent
     )
@@ -440,7 +442,7 @@ async def swap_zebra(account_id, key, recipient):
     min_percent = 100
     max_percent = 100
 
-    zebra = Zebra(account_id, key, recipient)
+    zebra = modules.Zebra(account_id, key, recipient)
     return await zebra.swap(
         from_token, to_token, min_amount, max_amount, decimal, slippage, all_amount, min_percent, max_percent
     )
@@ -471,7 +473,7 @@ async def swap_syncswap(account_id, key, recipient):
     min_percent = 100
     max_percent = 100
 
-    syncswap = SyncSwap(account_id, key, recipient)
+    syncswap = modules.SyncSwap(account_id, key, recipient)
     return await syncswap.swap(
         from_token, to_token, min_amount, max_amount, decimal, slippage, all_amount, min_percent, max_percent
     )
@@ -502,7 +504,7 @@ async def swap_xyswap(account_id, key, recipient):
     min_percent = 100
     max_percent = 100
 
-    xyswap = XYSwap(account_id, key, recipient)
+    xyswap = modules.XYSwap(account_id, key, recipient)
     return await xyswap.swap(
         from_token, to_token, min_amount, max_amount, decimal, slippage, all_amount, min_percent, max_percent
     )
@@ -531,7 +533,7 @@ async def swap_odos(account_id, key, recipient):
     min_percent = 30
     max_percent = 50
 
-    odos = Odos(account_id, key, recipient)
+    odos = modules.Odos(account_id, key, recipient)
     return await odos.swap(
         from_token, to_token, min_amount, max_amount, decimal, slippage, all_amount, min_percent, max_percent
     )
@@ -559,7 +561,7 @@ async def deposit_layerbank(account_id, key, recipient):
     min_percent = 30
     max_percent = 60
 
-    layerbank = LayerBank(account_id, key, recipient)
+    layerbank = modules.LayerBank(account_id, key, recipient)
     return await layerbank.deposit(
         min_amount, max_amount, decimal, sleep_from, sleep_to, make_withdraw, all_amount, min_percent, max_percent,
         module_cooldown
@@ -598,7 +600,7 @@ async def stake_kelp_and_deposit_ambient_finance(account_id, key, recipient):
     # Tighter ranges accumulate rewards at faster rates, but are more likely to suffer divergence losses.
     ambient_range_width = 0.5
 
-    scenario = Scenarios(account_id, key, recipient)
+    scenario = modules.Scenarios(account_id, key, recipient)
     return await scenario.stake_eth_and_deposit_wrseth(
         decimal,
         kelp_min_amount,
@@ -640,13 +642,10 @@ async def adjust_ambient_wrseth_eth_position_scenario(account_id, key, recipient
     min_deposit_percent = 91
     max_deposit_percent = 100
 
-    # сколько раз повторяем депозит с уменьшением кол-ва баланса
-    ambient_max_deposit_attempts = 100
-
     # минимальный размер ордера продажи покупки wrseth
     min_trade_amount_wrseth_wei = 5000000000000000
 
-    scenario = Scenarios(account_id, key, recipient)
+    scenario = modules.Scenarios(account_id, key, recipient)
     return await scenario.adjust_ambient_wrseth_eth_position(
         decimal,
         ambient_min_amount,
@@ -659,7 +658,6 @@ async def adjust_ambient_wrseth_eth_position_scenario(account_id, key, recipient
         max_left_eth_balance,
         min_deposit_percent,
         max_deposit_percent,
-        ambient_max_deposit_attempts,
         min_trade_amount_wrseth_wei)
 
 
@@ -685,7 +683,7 @@ async def mint_ambient_providoor_badge(account_id, key, recipient):
     min_wait_time_before_iterations = 5
     max_wait_time_before_iterations = 5
 
-    scenario = Scenarios(account_id, key, recipient)
+    scenario = modules.Scenarios(account_id, key, recipient)
     return await scenario.mint_ambient_providoor_badge(
         min_deposit_amount_usd,
         max_deposit_amount_usd,
@@ -703,7 +701,7 @@ async def mint_ambient_providoor_badge(account_id, key, recipient):
 
 async def withdraw_ambient_and_sell_wrseth(account_id, key, recipient):
     min_trade_amount_wrseth_wei = 500000000000000  # 0.0005 ETH
-    scenario = Scenarios(account_id, key, recipient)
+    scenario = modules.Scenarios(account_id, key, recipient)
     return await scenario.withdraw_ambient_and_sell_wrseth(min_trade_amount_wrseth_wei)
 
 
@@ -730,7 +728,7 @@ async def deposit_ambient_finance(account_id, key, recipient):
     min_left_eth_balance: float = 0.0045
     max_left_eth_balance: float = 0.0055
 
-    ambient_finance = AmbientFinance(account_id, key, recipient)
+    ambient_finance = modules.AmbientFinance(account_id, key, recipient)
     return await ambient_finance.deposit(
         min_amount,
         max_amount,
@@ -749,7 +747,7 @@ async def reposit_ambient_finance(account_id, key, recipient):
     # Tighter ranges accumulate rewards at faster rates, but are more likely to suffer divergence losses.
     range_width = 1  # 0.25, 0.5, 1, 5, 10
 
-    ambient_finance = AmbientFinance(account_id, key, recipient)
+    ambient_finance = modules.AmbientFinance(account_id, key, recipient)
     return await ambient_finance.reposit_outrage_deposits(
         range_width
     )
@@ -760,7 +758,7 @@ async def withdrawal_ambient_finance(account_id, key, recipient):
     Make withdraw from Ambient Finance wrsETH/ETH pool
     """
 
-    ambient_finance = AmbientFinance(account_id, key, recipient)
+    ambient_finance = modules.AmbientFinance(account_id, key, recipient)
     return await ambient_finance.withdrawal()
 
 
@@ -789,7 +787,7 @@ async def deposit_aave(account_id, key, recipient):
     min_percent = 85
     max_percent = 90
 
-    aave = Aave(account_id, key, recipient)
+    aave = modules.Aave(account_id, key, recipient)
     return await aave.deposit(
         min_amount, max_amount, decimal, sleep_from, sleep_to, make_withdraw, all_amount, min_percent, max_percent,
         module_cooldown
@@ -818,7 +816,7 @@ async def deposit_rhomarkets(account_id, key, recipient):
     min_percent = 80
     max_percent = 90
 
-    rhomarkets = Rhomarkets(account_id, key, recipient)
+    rhomarkets = modules.Rhomarkets(account_id, key, recipient)
     return await rhomarkets.deposit(
         min_amount, max_amount, decimal, sleep_from, sleep_to, make_withdraw, all_amount, min_percent, max_percent,
         module_cooldown
@@ -842,7 +840,7 @@ async def deposit_kelp(account_id, key, recipient):
     min_percent = 35
     max_percent = 40
 
-    kelp = Kelp(account_id, key, recipient)
+    kelp = modules.Kelp(account_id, key, recipient)
     return await kelp.deposit(
         min_amount, max_amount, decimal, all_amount, min_percent, max_percent,
         module_cooldown
@@ -871,7 +869,7 @@ async def deposit_compound_finance(account_id, key, recipient):
     min_percent = 30
     max_percent = 50
 
-    compound_finance = CompoundFinance(account_id, key, recipient)
+    compound_finance = modules.CompoundFinance(account_id, key, recipient)
     return await compound_finance.deposit(
         min_amount, max_amount, decimal, sleep_from, sleep_to, make_withdraw, all_amount, min_percent, max_percent,
         module_cooldown
@@ -891,7 +889,7 @@ async def mint_zerius(account_id, key, recipient):
     sleep_from = 10
     sleep_to = 20
 
-    zerius = Zerius(account_id, key, recipient)
+    zerius = modules.Zerius(account_id, key, recipient)
     await zerius.bridge(chains, sleep_from, sleep_to)
 
 
@@ -902,7 +900,7 @@ async def mint_l2pass(account_id, key, recipient):
 
     contract = "0x0000049f63ef0d60abe49fdd8bebfa5a68822222"
 
-    l2pass = L2Pass(account_id, key, recipient)
+    l2pass = modules.L2Pass(account_id, key, recipient)
     await l2pass.mint(contract)
 
 
@@ -915,7 +913,7 @@ async def mint_nft(account_id, key, recipient):
 
     contracts = [""]
 
-    minter = Minter(account_id, key, recipient)
+    minter = modules.Minter(account_id, key, recipient)
     await minter.mint_nft(contracts)
 
 
@@ -955,7 +953,7 @@ async def mint_zkstars(account_id, key, recipient):
     sleep_from = 5
     sleep_to = 10
 
-    zkkstars = ZkStars(account_id, key, recipient)
+    zkkstars = modules.ZkStars(account_id, key, recipient)
     await zkkstars.mint(contracts, mint_min, mint_max, mint_all, sleep_from, sleep_to)
 
 
@@ -995,7 +993,7 @@ async def mint_citizen(account_id, key, recipient):
     sleep_from = 5
     sleep_to = 10
 
-    citizen = ScrollCitizen(account_id, key, recipient)
+    citizen = modules.ScrollCitizen(account_id, key, recipient)
     await citizen.mint(contracts, mint_min, mint_max, mint_all, sleep_from, sleep_to)
 
 
@@ -1009,7 +1007,7 @@ async def send_message(account_id, key, recipient):
     """
     use_chain = ["gnosis", "moonriver"]
 
-    l2telegraph = L2Telegraph(account_id, key, recipient)
+    l2telegraph = modules.L2Telegraph(account_id, key, recipient)
     await l2telegraph.send_message(use_chain)
 
 
@@ -1026,7 +1024,7 @@ async def bridge_nft(account_id, key, recipient):
     sleep_from = 5
     sleep_to = 20
 
-    l2telegraph = L2Telegraph(account_id, key, recipient)
+    l2telegraph = modules.L2Telegraph(account_id, key, recipient)
     await l2telegraph.bridge(use_chain, sleep_from, sleep_to)
 
 
@@ -1044,7 +1042,7 @@ async def make_transfer(_id, key, recipient):
     min_percent = 10
     max_percent = 10
 
-    transfer = Transfer(_id, key, recipient)
+    transfer = modules.Transfer(_id, key, recipient)
     await transfer.transfer(min_amount, max_amount, decimal, all_amount, min_percent, max_percent)
 
 
@@ -1069,7 +1067,7 @@ async def swap_tokens(account_id, key, recipient):
     min_percent = 100
     max_percent = 100
 
-    swap_tokens = SwapTokens(account_id, key, recipient)
+    swap_tokens = modules.SwapTokens(account_id, key, recipient)
     return await swap_tokens.swap(use_dex, use_tokens, sleep_from, sleep_to, slippage, min_percent, max_percent)
 
 
@@ -1111,7 +1109,7 @@ async def swap_multiswap(account_id, key, recipient):
     # При False цепочка всегда начинается с ETH->USDC
     first_swap_from_udsc_if_can = True
 
-    multi = Multiswap(account_id, key, recipient)
+    multi = modules.Multiswap(account_id, key, recipient)
     return await multi.swap(
         use_dex, sleep_from, sleep_to, min_swap, max_swap, slippage, back_swap, min_percent, max_percent, dex_max_tx,
         first_swap_from_udsc_if_can
@@ -1146,7 +1144,7 @@ async def multibridge(account_id, key, recipient):
 
     min_chain_balance = 0.006
 
-    multibridge = Multibridge(account_id=account_id, private_key=key, recipient=recipient)
+    multibridge = modules.Multibridge(account_id=account_id, private_key=key, recipient=recipient)
     await multibridge.bridge(use_bridge, source_chain, destination_chain, min_amount, max_amount, decimal, all_amount,
                              min_percent, max_percent, min_chain_balance)
 
@@ -1176,7 +1174,7 @@ async def multilanding(account_id, key, recipient):
 
     max_dex = 1
 
-    multilanding = Multilanding(account_id=account_id, private_key=key, recipient=recipient)
+    multilanding = modules.Multilanding(account_id=account_id, private_key=key, recipient=recipient)
     await multilanding.deposit(use_dex,
                                min_amount,
                                max_amount,
@@ -1264,7 +1262,7 @@ async def custom_routes(account_id, key, recipient):
 
     random_module = False
 
-    routes = Routes(account_id, key, recipient)
+    routes = modules.Routes(account_id, key, recipient)
     return await routes.start(use_modules, sleep_from, sleep_to, random_module)
 
 
@@ -1273,54 +1271,58 @@ async def custom_routes(account_id, key, recipient):
 #########################################
 
 async def withdraw_layerbank(account_id, key, recipient):
-    layerbank = LayerBank(account_id, key, recipient)
+    layerbank = modules.LayerBank(account_id, key, recipient)
     return await layerbank.withdraw()
 
 
 async def withdraw_aave(account_id, key, recipient):
-    aave = Aave(account_id, key, recipient)
+    aave = modules.Aave(account_id, key, recipient)
     return await aave.withdraw()
 
 
 async def withdraw_rhomarkets(account_id, key, recipient):
-    rhomarkets = Rhomarkets(account_id, key, recipient)
+    rhomarkets = modules.Rhomarkets(account_id, key, recipient)
     return await rhomarkets.withdraw()
 
 
 async def withdraw_compound_finance(account_id, key, recipient):
-    compound_finance = CompoundFinance(account_id, key, recipient)
+    compound_finance = modules.CompoundFinance(account_id, key, recipient)
     return await compound_finance.withdraw()
 
 
 async def send_mail(account_id, key, recipient):
-    dmail = Dmail(account_id, key, recipient)
+    dmail = modules.Dmail(account_id, key, recipient)
     await dmail.send_mail()
 
 
 async def create_omnisea(account_id, key, recipient):
-    omnisea = Omnisea(account_id, key, recipient)
+    omnisea = modules.Omnisea(account_id, key, recipient)
     await omnisea.create()
 
 
 async def create_safe(account_id, key, recipient):
-    gnosis_safe = GnosisSafe(account_id, key, recipient)
+    gnosis_safe = modules.GnosisSafe(account_id, key, recipient)
     return await gnosis_safe.create_safe(module_cooldown)
 
 
 async def deploy_contract(account_id, key, recipient):
-    deployer = Deployer(account_id, key, recipient)
+    deployer = modules.Deployer(account_id, key, recipient)
     await deployer.deploy_token()
 
 
 async def rubyscore_vote(account_id, key, recipient):
-    rubyscore = RubyScore(account_id, key, recipient)
+    rubyscore = modules.RubyScore(account_id, key, recipient)
     await rubyscore.vote()
 
 
 async def nft_origins(account_id, key, recipient):
-    nft = NftOrigins(account_id, key, recipient)
+    nft = modules.NftOrigins(account_id, key, recipient)
     await nft.mint()
 
 
 def get_tx_count():
-    asyncio.run(check_tx())
+    asyncio.run(modules.check_tx())
+
+
+def get_native_balances():
+    asyncio.run(modules.check_balances())
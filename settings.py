@@ -4,6 +4,19 @@ RANDOM_WALLET = True  # True/False
 # EXPLORER CACHE
 EXPLORER_CACHE_MS = 1000 * 1
 
+# локальная история транзакций (догружаются только новые блоки)
+TX_HISTORY_DB = "temp/tx_history.sqlite3"
+TX_HISTORY_TTL_S = 60
+TX_HISTORY_DIRTY_S = 180  # после отправки своей транзакции обновляем историю при каждом запросе
+
+# прогресс кошельков (REMOVE_WALLET, сценарий ambient badge), txt файлы в temp/ - импорт/экспорт
+STATE_DB = "temp/state.sqlite3"
+
+# EXPLORER API (scrollscan/etherscan free: 5 запросов в секунду на ключ)
+EXPLORER_REQUESTS_PER_S = 4
+EXPLORER_MAX_ATTEMPTS = 5
+EXPLORER_BACKOFF_S = 2
+
 # removing a wallet from the list after the job is done
 REMOVE_WALLET = False
 
@@ -24,6 +37,8 @@ THREAD_SLEEP_TO = 5
 # GWEI CONTROL MODE
 CHECK_GWEI = False  # True/False
 MAX_GWEI = 20
+GAS_WATCHER_POLL_S = 12  # один блок Ethereum, один запрос на всех ожидающих
+GAS_WATCHER_MAX_AGE_S = 60  # старше - считаем цену газа неизвестной и ждём обновления
 
 MAX_PRIORITY_FEE = {
     "ethereum": 0.01,
@@ -36,6 +51,71 @@ MAX_PRIORITY_FEE = {
 GAS_MULTIPLIER = 1.1
 GAS_LIMIT_MULTIPLIER = 1.3
 
+# FEE ORACLE (одно обновление комиссий на блок для всех кошельков)
+FEE_ORACLE_POLL_S = 3
+FEE_ORACLE_MAX_AGE_S = 30  # старше - обновляем перед транзакцией
+
+# адреса кошельков из accounts.txt (без приватных ключей), пересчитываются при изменении файла
+WALLETS_INDEX_FILE = "temp/wallets.json"
+WALLETS_DERIVE_PROCESSES = 0  # 0 - по числу ядер
+WALLETS_PARALLEL_MIN = 2000  # меньше ключей - считаем в одном процессе
+
+# кэш разобранных ABI, по файлу на ABI (пересобирается при изменении файла), пусто - без кэша
+ABI_CACHE_DIR = "temp/abi_cache"
+
+# RPC CONNECTION POOL (общий для всех кошельков)
+RPC_POOL_LIMIT = 100  # максимум соединений на один RPC endpoint
+RPC_POOL_LIMIT_PER_HOST = 20
+RPC_KEEPALIVE_S = 30
+RPC_TIMEOUT_S = 60
+
+# HTTP CLIENT для API агрегаторов, мостов и проектов (общий пул соединений)
+HTTP_POOL_LIMIT = 100
+HTTP_POOL_LIMIT_PER_HOST = 20
+HTTP_KEEPALIVE_S = 30
+HTTP_TIMEOUT_S = 30
+HTTP_REQUESTS_PER_S = 10  # на один хост
+HTTP_HOST_REQUESTS_PER_S = {}  # лимиты для отдельных хостов, например {"api.odos.xyz": 5}
+HTTP_BACKOFF_S = 5  # пауза для хоста после 429 без Retry-After
+
+# AMBIENT INDEXER (ambindexer.net), после своей транзакции в Ambient кэш кошелька сбрасывается
+AMBIENT_INDEXER_TTL_S = 15
+AMBIENT_INDEXER_TIMEOUT_S = 30
+# депозит в Ambient считается с запасом на падение цены пула до отправки транзакции (0.001 = 0.1%)
+AMBIENT_DEPOSIT_PRICE_TOLERANCE = 0.001
+# газ, который резервируется из баланса ETH под транзакцию депозита в Ambient
+AMBIENT_DEPOSIT_GAS_LIMIT = 500000
+
+# NATIVE BALANCE CHECKER ("Check native balances") и Multibridge
+BALANCE_SCAN_CHAINS = []  # сети из data/rpc.json, пусто - все
+BALANCE_SCAN_TIMEOUT_S = 10  # на один batch запрос к RPC, потом batch отправляется в следующий RPC сети
+BALANCE_SCAN_BATCH_SIZE = 100  # адресов в одном JSON-RPC batch
+BALANCE_SCAN_OUTPUT = ""  # "balances.csv" или "balances.json", пусто - только таблица
+
+# RECEIPT WATCHER (для websocket подписки на новые блоки добавьте "ws" в data/rpc.json)
+RECEIPT_POLL_S = 1
+RECEIPT_BATCH_SIZE = 100
+
+# NONCE MANAGER
+NONCE_STATE_FILE = "temp/nonces.json"
+NONCE_RESERVE_TIMEOUT_S = 120  # через сколько неотправленный nonce считается дыркой
+NONCE_SENT_TIMEOUT_S = 1200  # через сколько отправленная, но не появившаяся в сети транзакция считается потерянной
+
+# кэш symbol/decimals токенов
+TOKENS_METADATA_FILE = "temp/tokens.json"
+
+# сколько вызовов отправлять в одном Multicall3 eth_call
+MULTICALL_BATCH_SIZE = 500
+
+# TRANSACTION CHECKER ("Check transaction count")
+TX_CHECKER_CHAINS = ["scroll"]  # сети из data/rpc.json
+TX_CHECKER_BATCH_SIZE = 100  # адресов в одном JSON-RPC batch
+TX_CHECKER_CONCURRENCY = 5  # одновременных batch запросов
+TX_CHECKER_OUTPUT = ""  # "tx_count.csv" или "tx_count.json", пусто - только таблица
+
+# CHECK LAST (check_last.py)
+CHECK_LAST_CONCURRENCY = 10  # сколько кошельков проверяем одновременно
+
 # RETRY MODE
 RETRY_COUNT = 3
 
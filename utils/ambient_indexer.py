@@ -0,0 +1,101 @@
+import asyncio
+import time
+from typing import Dict, List, Tuple
+
+import aiohttp
+
+from settings import AMBIENT_INDEXER_TTL_S, AMBIENT_INDEXER_TIMEOUT_S
+from utils.http import http_client
+
+AMBIENT_INDEXER_URL = "https://ambindexer.net/scroll-gcgo"
+SCROLL_CHAIN_ID = "0x82750"
+
+
+class AmbientIndexerError(Exception):
+    pass
+
+
+class AmbientIndexerClient:
+    """
+    Client for the Ambient indexer on top of the shared HTTP client. Responses are cached for AMBIENT_INDEXER_TTL_S,
+    concurrent identical requests share one HTTP request, and a wallet's cache is dropped
+    as soon as it sends an Ambient transaction
+    """
+
+    def __init__(self, url: str = AMBIENT_INDEXER_URL):
+        self.url = url
+        # (endpoint, params) -> (time, data)
+        self.cache: Dict[Tuple, Tuple[float, List[dict]]] = {}
+        self.pending: Dict[Tuple, asyncio.Task] = {}
+        self.invalidated_at: Dict[str, float] = {}
+
+    async def _fetch(self, key: Tuple, endpoint: str, params: dict) -> List[dict]:
+        started_at = time.time()
+
+        try:
+            async with http_client.get(
+                    f"{self.url}/{endpoint}",
+                    params=params,
+                    timeout=aiohttp.ClientTimeout(total=AMBIENT_INDEXER_TIMEOUT_S)
+            ) as response:
+                if response.status != 200:
+                    raise AmbientIndexerError(f"Bad Ambient indexer response status {response.status} for {endpoint}")
+
+                data = await response.json(content_type=None)
+
+            if "data" not in data or not (type(data["data"]) is list or data["data"] is None):
+                raise AmbientIndexerError(f"Ambient indexer {endpoint} wrong response: {data}")
+
+            # ответ на запрос, начатый до своей транзакции, не кэшируем
+            if started_at >= self.invalidated_at.get(params["user"], 0):
+                self.cache[key] = (time.time(), data["data"] or [])
+
+            return data["data"] or []
+        finally:
+            if self.pending.get(key) is asyncio.current_task():
+                self.pending.pop(key)
+
+    async def request(self, endpoint: str, params: dict) -> List[dict]:
+        key = (endpoint, tuple(sorted(params.items())))
+
+        cached = self.cache.get(key)
+        if cached is None or time.time() - cached[0] > AMBIENT_INDEXER_TTL_S:
+            task = self.pending.get(key)
+            if task is None or task.get_loop() is not asyncio.get_running_loop():
+                task = asyncio.create_task(self._fetch(key, endpoint, params))
+                self.pending[key] = task
+
+            # shield - отмена одного ожидающего не отменяет запрос для остальных
+            data = await asyncio.shield(task)
+        else:
+            data = cached[1]
+
+        # вызывающие дописывают поля в позиции, кэш не должен меняться
+        return [dict(item) for item in data]
+
+    def invalidate(self, user: str):
+        user = user.lower()
+        self.invalidated_at[user] = time.time()
+
+        for key in [key for key in self.cache if ("user", user) in key[1]]:
+            del self.cache[key]
+        for key in [key for key in self.pending if ("user", user) in key[1]]:
+            del self.pending[key]
+
+    def _pool_params(self, user: str, base: str, quote: str, pool_idx: int) -> dict:
+        return {
+            "user": user.lower(),
+            "base": base.lower(),
+            "quote": quote.lower(),
+            "poolIdx": pool_idx,
+            "chainId": SCROLL_CHAIN_ID,
+        }
+
+    async def get_user_pool_positions(self, user: str, base: str, quote: str, pool_idx: int) -> List[dict]:
+        return await self.request("user_pool_positions", self._pool_params(user, base, quote, pool_idx))
+
+    async def get_user_pool_txs(self, user: str, base: str, quote: str, pool_idx: int) -> List[dict]:
+        return await self.request("user_pool_txs", self._pool_params(user, base, quote, pool_idx))
+
+
+ambient_indexer = AmbientIndexerClient()
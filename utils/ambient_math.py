@@ -0,0 +1,218 @@
+"""
+Exact integer concentrated liquidity math of CrocSwap (Ambient Finance).
+
+Prices are square roots in Q64.64 fixed point, as returned by CrocQuery.queryPrice.
+The curve price is base tokens per quote token: a range below the price holds only base tokens,
+a range above it only quote tokens. Amounts owed to the pool are rounded up and liquidity
+is rounded down to whole lots, the same direction the pool rounds in
+"""
+import math
+from fractions import Fraction
+from functools import lru_cache
+from typing import Iterable, List, Tuple
+
+Q64 = 1 << 64
+MIN_TICK = -665454
+MAX_TICK = 831818
+LOT_SIZE_BITS = 10
+
+# (1/sqrt(1.0001)) ** (2 ** i) в Q128.128, как в TickMath
+_TICK_RATIOS = (
+    (0x2, 0xfff97272373d413259a46990580e213a),
+    (0x4, 0xfff2e50f5f656932ef12357cf3c7fdcc),
+    (0x8, 0xffe5caca7e10e4e61c3624eaa0941cd0),
+    (0x10, 0xffcb9843d60f6159c9db58835c926644),
+    (0x20, 0xff973b41fa98c081472e6896dfb254c0),
+    (0x40, 0xff2ea16466c96a3843ec78b326b52861),
+    (0x80, 0xfe5dee046a99a2a811c461f1969c3053),
+    (0x100, 0xfcbe86c7900a88aedcffc83b479aa3a4),
+    (0x200, 0xf987a7253ac413176f2b074cf7815e54),
+    (0x400, 0xf3392b0822b70005940c7a398e4b70f3),
+    (0x800, 0xe7159475a2c29b7443b29c7fa6e889d9),
+    (0x1000, 0xd097f3bdfd2022b8845ad8f792aa5825),
+    (0x2000, 0xa9f746462d870fdf8a65dc1f90e061e5),
+    (0x4000, 0x70d869a156d2a1b890bb3df62baf32f7),
+    (0x8000, 0x31be135f97d08fd981231505542fcfa6),
+    (0x10000, 0x9aa508b5b7a84e1c677de54f3e99bc9),
+    (0x20000, 0x5d6af8dedb81196699c329225ee604),
+    (0x40000, 0x2216e584f5fa1ea926041bedfe98),
+    (0x80000, 0x48a170391f7dc42444e8fa2),
+)
+
+
+def _ceil_div(a: int, b: int) -> int:
+    return -(-a // b)
+
+
+@lru_cache(maxsize=65536)
+def sqrt_price_at_tick(tick: int) -> int:
+    """
+    Q64.64 square root price of a tick, bit-exact with TickMath.getSqrtRatioAtTick
+    """
+    if not MIN_TICK <= tick <= MAX_TICK:
+        raise ValueError(f"Tick {tick} out of range")
+
+    abs_tick = abs(tick)
+    ratio = 0xfffcb933bd6fad37aa2d162d1a594001 if abs_tick & 0x1 else 1 << 128
+
+    for bit, multiplier in _TICK_RATIOS:
+        if abs_tick & bit:
+            ratio = (ratio * multiplier) >> 128
+
+    if tick > 0:
+        ratio = ((1 << 256) - 1) // ratio
+
+    return (ratio >> 64) + (0 if ratio % Q64 == 0 else 1)
+
+
+def tick_at_sqrt_price(sqrt_price: int) -> int:
+    """
+    Greatest tick whose square root price does not exceed sqrt_price (TickMath.getTickAtSqrtRatio)
+    """
+    # оценка через логарифм, затем точная подгонка целыми
+    tick = math.floor(2 * math.log(sqrt_price / Q64, 1.0001))
+    tick = min(max(tick, MIN_TICK), MAX_TICK)
+
+    while tick > MIN_TICK and sqrt_price_at_tick(tick) > sqrt_price:
+        tick -= 1
+    while tick < MAX_TICK and sqrt_price_at_tick(tick + 1) <= sqrt_price:
+        tick += 1
+
+    return tick
+
+
+def price_to_sqrt_price(price) -> int:
+    return math.isqrt(int(Fraction(price) * Q64 * Q64))
+
+
+def sqrt_price_to_price(sqrt_price: int) -> float:
+    return float(Fraction(sqrt_price, Q64) ** 2)
+
+
+def price_to_tick(price) -> int:
+    return tick_at_sqrt_price(price_to_sqrt_price(price))
+
+
+def tick_to_price(tick: int) -> float:
+    return sqrt_price_to_price(sqrt_price_at_tick(tick))
+
+
+def shave_lots(liquidity: int) -> int:
+    return (liquidity >> LOT_SIZE_BITS) << LOT_SIZE_BITS
+
+
+def base_for_liquidity(liquidity: int, sqrt_price: int, bid_sqrt_price: int, ask_sqrt_price: int) -> int:
+    sqrt_price = min(max(sqrt_price, bid_sqrt_price), ask_sqrt_price)
+
+    return _ceil_div(liquidity * (sqrt_price - bid_sqrt_price), Q64)
+
+
+def quote_for_liquidity(liquidity: int, sqrt_price: int, bid_sqrt_price: int, ask_sqrt_price: int) -> int:
+    sqrt_price = min(max(sqrt_price, bid_sqrt_price), ask_sqrt_price)
+
+    return _ceil_div(liquidity * Q64 * (ask_sqrt_price - sqrt_price), sqrt_price * ask_sqrt_price)
+
+
+def amounts_for_liquidity(liquidity: int, sqrt_price: int, bid_sqrt_price: int, ask_sqrt_price: int) -> Tuple[int, int]:
+    return (
+        base_for_liquidity(liquidity, sqrt_price, bid_sqrt_price, ask_sqrt_price),
+        quote_for_liquidity(liquidity, sqrt_price, bid_sqrt_price, ask_sqrt_price),
+    )
+
+
+def liquidity_for_base(base: int, sqrt_price: int, bid_sqrt_price: int, ask_sqrt_price: int) -> int:
+    sqrt_price = min(max(sqrt_price, bid_sqrt_price), ask_sqrt_price)
+    if sqrt_price == bid_sqrt_price:
+        raise ValueError("Range above the curve price takes only quote tokens")
+
+    return shave_lots(base * Q64 // (sqrt_price - bid_sqrt_price))
+
+
+def liquidity_for_quote(quote: int, sqrt_price: int, bid_sqrt_price: int, ask_sqrt_price: int) -> int:
+    sqrt_price = min(max(sqrt_price, bid_sqrt_price), ask_sqrt_price)
+    if sqrt_price == ask_sqrt_price:
+        raise ValueError("Range below the curve price takes only base tokens")
+
+    return shave_lots(quote * sqrt_price * ask_sqrt_price // (Q64 * (ask_sqrt_price - sqrt_price)))
+
+
+def liquidity_for_amounts(base: int, quote: int, sqrt_price: int, bid_sqrt_price: int, ask_sqrt_price: int) -> int:
+    """
+    Largest liquidity (in whole lots) the base and quote amounts can both pay for
+    """
+    if sqrt_price <= bid_sqrt_price:
+        return liquidity_for_quote(quote, sqrt_price, bid_sqrt_price, ask_sqrt_price)
+    if sqrt_price >= ask_sqrt_price:
+        return liquidity_for_base(base, sqrt_price, bid_sqrt_price, ask_sqrt_price)
+
+    liquidity = min(
+        liquidity_for_base(base, sqrt_price, bid_sqrt_price, ask_sqrt_price),
+        liquidity_for_quote(quote, sqrt_price, bid_sqrt_price, ask_sqrt_price),
+    )
+
+    # округление вверх долга может превысить сумму на 1 wei, уменьшаем на лот
+    while liquidity > 0:
+        owed_base, owed_quote = amounts_for_liquidity(liquidity, sqrt_price, bid_sqrt_price, ask_sqrt_price)
+        if owed_base <= base and owed_quote <= quote:
+            break
+        liquidity -= 1 << LOT_SIZE_BITS
+
+    return max(liquidity, 0)
+
+
+def solve_base_deposit(
+        base: int,
+        quote: int,
+        sqrt_price: int,
+        bid_sqrt_price: int,
+        ask_sqrt_price: int,
+        price_tolerance: float = 0
+) -> Tuple[int, int, int]:
+    """
+    Largest base quantity for a "fixed in base tokens" mint that the base and quote budgets pay for,
+    even if the price drops by price_tolerance before the transaction is mined.
+    Returns (base quantity, liquidity the pool will mint, quote amount it will take)
+    """
+    # при фиксированном base чем ниже цена, тем больше ликвидности и quote, считаем по худшей цене
+    worst_sqrt_price = sqrt_price * math.isqrt(int((1 - price_tolerance) * Q64 * Q64)) // Q64
+    worst_sqrt_price = max(worst_sqrt_price, bid_sqrt_price + 1)
+    if worst_sqrt_price >= ask_sqrt_price:
+        return 0, 0, 0
+
+    liquidity = liquidity_for_amounts(base, quote, worst_sqrt_price, bid_sqrt_price, ask_sqrt_price)
+
+    # пул сам пересчитывает ликвидность из base, поэтому округляем base вниз
+    base_qty = liquidity * (worst_sqrt_price - bid_sqrt_price) // Q64
+    if base_qty == 0:
+        return 0, 0, 0
+
+    liquidity = liquidity_for_base(base_qty, worst_sqrt_price, bid_sqrt_price, ask_sqrt_price)
+
+    return base_qty, liquidity, quote_for_liquidity(liquidity, worst_sqrt_price, bid_sqrt_price, ask_sqrt_price)
+
+
+def sqrt_prices_at_ticks(ticks: Iterable[int]) -> List[int]:
+    return [sqrt_price_at_tick(tick) for tick in ticks]
+
+
+def ticks_at_sqrt_prices(sqrt_prices: Iterable[int]) -> List[int]:
+    return [tick_at_sqrt_price(sqrt_price) for sqrt_price in sqrt_prices]
+
+
+def positions_amounts(sqrt_price: int, positions: Iterable[Tuple[int, int, int]]) -> List[Tuple[int, int]]:
+    """
+    (base, quote) of many (liquidity, bid_tick, ask_tick) positions at one curve price
+    """
+    return [
+        amounts_for_liquidity(liquidity, sqrt_price, sqrt_price_at_tick(bid_tick), sqrt_price_at_tick(ask_tick))
+        for liquidity, bid_tick, ask_tick in positions
+    ]
+
+
+def positions_in_range(sqrt_price: int, ranges: Iterable[Tuple[int, int]]) -> List[bool]:
+    """
+    Whether the curve price is inside each (bid_tick, ask_tick) range
+    """
+    tick = tick_at_sqrt_price(sqrt_price)
+
+    return [bid_tick <= tick < ask_tick for bid_tick, ask_tick in ranges]
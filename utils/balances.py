@@ -0,0 +1,52 @@
+import asyncio
+import random
+from typing import Dict, List, Optional
+
+from loguru import logger
+
+from config import RPC
+from settings import BALANCE_SCAN_TIMEOUT_S, BALANCE_SCAN_BATCH_SIZE
+from utils.rpc import get_w3, batch_request
+
+
+async def _get_batch_balances(chain: str, endpoints: List[str], addresses: List[str]) -> List[Optional[int]]:
+    for endpoint in endpoints:
+        try:
+            balances = await asyncio.wait_for(
+                batch_request(get_w3(chain, endpoint), [("eth_getBalance", [address, "latest"]) for address in addresses]),
+                BALANCE_SCAN_TIMEOUT_S
+            )
+
+            return [int(balance, 16) for balance in balances]
+        except Exception as e:
+            logger.warning(f"Failed to get {chain} balances from {endpoint}: {e or type(e).__name__}")
+
+    return [None] * len(addresses)
+
+
+async def get_chain_native_balances(chain: str, addresses: List[str]) -> List[Optional[int]]:
+    """
+    Native balances of many addresses on one chain as JSON-RPC batches of eth_getBalance.
+    Each batch gets BALANCE_SCAN_TIMEOUT_S per endpoint and moves to the next endpoint on error or timeout.
+    Returns None for the addresses of a batch that failed on every endpoint
+    """
+    endpoints = random.sample(RPC[chain]["rpc"], len(RPC[chain]["rpc"]))
+
+    chunks = await asyncio.gather(*[
+        _get_batch_balances(chain, endpoints, addresses[i:i + BALANCE_SCAN_BATCH_SIZE])
+        for i in range(0, len(addresses), BALANCE_SCAN_BATCH_SIZE)
+    ])
+
+    return [balance for chunk in chunks for balance in chunk]
+
+
+async def scan_native_balances(addresses: List[str], chains: List[str] = None) -> Dict[str, List[Optional[int]]]:
+    """
+    Native balances of the addresses on every chain (all chains from data/rpc.json by default),
+    all chains are queried concurrently
+    """
+    chains = chains or list(RPC)
+
+    balances = await asyncio.gather(*[get_chain_native_balances(chain, addresses) for chain in chains])
+
+    return dict(zip(chains, balances))
@@ -0,0 +1,41 @@
+from functools import lru_cache
+from typing import Dict, Tuple
+
+from web3 import AsyncWeb3, Web3
+from web3.contract import AsyncContract
+
+
+@lru_cache(maxsize=4096)
+def to_checksum(address: str) -> str:
+    return Web3.to_checksum_address(address)
+
+
+# (id(w3), id(abi), address) -> (abi, contract); abi хранится, чтобы id не переиспользовался
+_contracts: Dict[Tuple[int, int, str], Tuple[list, AsyncContract]] = {}
+# (id(w3), id(abi)) -> (abi, contract factory)
+_factories: Dict[Tuple[int, int], Tuple[list, type]] = {}
+
+
+def get_contract_factory(w3: AsyncWeb3, abi: list) -> type:
+    key = (id(w3), id(abi))
+
+    cached = _factories.get(key)
+    if cached is None or cached[0] is not abi:
+        cached = _factories[key] = (abi, w3.eth.contract(abi=abi))
+
+    return cached[1]
+
+
+def get_contract(w3: AsyncWeb3, address: str, abi: list) -> AsyncContract:
+    """
+    Contract bound to w3 and address. The ABI is processed once per (w3, abi object) and
+    instances are shared, so repeated lookups of the same contract cost a dict access
+    """
+    address = to_checksum(address)
+    key = (id(w3), id(abi), address)
+
+    cached = _contracts.get(key)
+    if cached is None or cached[0] is not abi:
+        cached = _contracts[key] = (abi, get_contract_factory(w3, abi)(address=address))
+
+    return cached[1]
@@ -0,0 +1,116 @@
+import asyncio
+import random
+from typing import Dict
+
+import aiohttp
+from loguru import logger
+
+from settings import (SCROLL_API_KEY,
+                      ETHEREUM_API_KEY,
+                      EXPLORER_REQUESTS_PER_S,
+                      EXPLORER_MAX_ATTEMPTS,
+                      EXPLORER_BACKOFF_S)
+from utils.pool import TokenBucket
+
+EXPLORERS = {
+    'zksync': {
+        'url': 'https://block-explorer-api.mainnet.zksync.io/api',
+    },
+    'scroll': {
+        'url': 'https://api.scrollscan.com/api',
+        'api_key': SCROLL_API_KEY
+    },
+    'ethereum': {
+        'url': 'https://api.etherscan.io/api',
+        'api_key': ETHEREUM_API_KEY
+    }
+}
+
+
+class ExplorerError(Exception):
+    pass
+
+
+class RateLimitError(ExplorerError):
+    pass
+
+
+class ExplorerClient:
+    """
+    Shared aiohttp session for explorer APIs with one token bucket per explorer matched to its quota
+    """
+
+    def __init__(self):
+        self.session = None
+        self.buckets: Dict[str, TokenBucket] = {}
+
+    def get_session(self) -> aiohttp.ClientSession:
+        if self.session is None or self.session.closed or self.session._loop.is_closed():
+            self.session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=60))
+
+        return self.session
+
+    def get_bucket(self, chain: str) -> TokenBucket:
+        if chain not in self.buckets:
+            self.buckets[chain] = TokenBucket(EXPLORER_REQUESTS_PER_S)
+
+        return self.buckets[chain]
+
+    async def _request(self, url: str, params: dict):
+        async with self.get_session().get(url, params=params) as response:
+            if response.status == 429:
+                retry_after = response.headers.get("Retry-After", "")
+                raise RateLimitError(float(retry_after) if retry_after.isdigit() else None)
+            response.raise_for_status()
+
+            data = await response.json(content_type=None)
+
+        if "result" not in data:
+            raise ExplorerError("Response does not contain 'result' field")
+
+        # при ошибке эксплорер кладёт её текст в result, успешные ответы - список или объект
+        if isinstance(data["result"], str):
+            if "rate limit" in data["result"].lower():
+                raise RateLimitError(None)
+            raise ExplorerError(f"{data.get('message', 'Explorer error')}: {data['result']}")
+
+        if "error" in data:
+            raise ExplorerError(data["error"])
+
+        return data["result"]
+
+    async def request(self, chain: str, params: dict):
+        explorer_data = EXPLORERS.get(chain)
+        if explorer_data is None:
+            raise ValueError(f"Unsupported chain: {chain}")
+
+        params = dict(params)
+        if explorer_data.get('api_key'):
+            params['apikey'] = explorer_data['api_key']
+
+        bucket = self.get_bucket(chain)
+
+        for attempt in range(1, EXPLORER_MAX_ATTEMPTS + 1):
+            await bucket.acquire()
+
+            try:
+                return await self._request(explorer_data['url'], params)
+            except RateLimitError as e:
+                delay = e.args[0] or EXPLORER_BACKOFF_S * 2 ** (attempt - 1)
+                bucket.block(delay)
+                logger.warning(f"Explorer {chain} rate limit reached, wait {delay} s. ({attempt}/{EXPLORER_MAX_ATTEMPTS})")
+            except (aiohttp.ClientError, asyncio.TimeoutError, ExplorerError) as e:
+                if attempt == EXPLORER_MAX_ATTEMPTS:
+                    raise
+                delay = EXPLORER_BACKOFF_S * 2 ** (attempt - 1) * random.uniform(1, 1.5)
+                logger.error(f"Explorer {chain} error: {e}, retry in {int(delay)} s. ({attempt}/{EXPLORER_MAX_ATTEMPTS})")
+                await asyncio.sleep(delay)
+
+        raise ExplorerError(f"Explorer {chain} request failed after {EXPLORER_MAX_ATTEMPTS} attempts")
+
+    async def close(self):
+        if self.session is not None and not self.session.closed:
+            await self.session.close()
+
+
+explorer_client = ExplorerClient()
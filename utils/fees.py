@@ -0,0 +1,128 @@
+import asyncio
+import time
+from typing import Dict, Tuple
+
+from loguru import logger
+from web3._utils.fee_utils import async_fee_history_priority_fee
+
+from settings import GAS_MULTIPLIER, FEE_ORACLE_POLL_S, FEE_ORACLE_MAX_AGE_S
+from utils.rpc import get_w3, batch_request, RPCResultError
+
+
+class FeeOracle:
+    """
+    Per-chain background task that refreshes base fee, priority fee and gas price once per new block
+    and serves the cached values to every Account of the chain
+    """
+
+    def __init__(self, chain: str):
+        self.chain = chain
+        self.w3 = get_w3(chain)
+        self.block_number = None
+        self.base_fee = None
+        self.priority_fee = None
+        self.gas_price = None
+        self.updated_at = 0
+        self.task = None
+        self.refresh_task = None
+        self.has_priority_fee_method = True
+
+    async def refresh(self):
+        calls = [
+            ("eth_blockNumber", []),
+            ("eth_feeHistory", [1, "latest", [10]]),
+            ("eth_gasPrice", []),
+        ]
+        if self.has_priority_fee_method:
+            calls.append(("eth_maxPriorityFeePerGas", []))
+
+        try:
+            results = await batch_request(self.w3, calls)
+        except RPCResultError as e:
+            if e.method != "eth_maxPriorityFeePerGas":
+                raise
+
+            logger.warning(f"Fee oracle {self.chain}: eth_maxPriorityFeePerGas is not supported, use fee history")
+            self.has_priority_fee_method = False
+            calls.pop()
+            results = await batch_request(self.w3, calls)
+
+        block_number, fee_history, gas_price = results[:3]
+
+        if self.has_priority_fee_method:
+            priority_fee = int(results[3], 16)
+        else:
+            # тот же запасной вариант, что и у web3 в w3.eth.max_priority_fee
+            priority_fee = await async_fee_history_priority_fee(self.w3.eth)
+
+        self.block_number = int(block_number, 16)
+        self.base_fee = int(int(fee_history["baseFeePerGas"][-1], 16) * GAS_MULTIPLIER)
+        self.priority_fee = priority_fee
+        self.gas_price = int(int(gas_price, 16) * GAS_MULTIPLIER)
+        self.updated_at = time.time()
+
+    async def update(self):
+        # одновременные запросы ждут одно и то же обновление
+        if self.refresh_task is None or self.refresh_task.done():
+            self.refresh_task = asyncio.ensure_future(self.refresh())
+
+        await asyncio.shield(self.refresh_task)
+
+    async def _run(self):
+        while True:
+            try:
+                block_number = await self.w3.eth.block_number
+
+                if block_number != self.block_number:
+                    await self.update()
+            except Exception as e:
+                logger.error(f"Fee oracle {self.chain} error: {e}")
+
+            await asyncio.sleep(FEE_ORACLE_POLL_S)
+
+    def _ensure_running(self):
+        if self.task is None or self.task.done() or self.task.get_loop() is not asyncio.get_running_loop():
+            self.task = asyncio.create_task(self._run(), name=f"fee-oracle-{self.chain}")
+
+    async def _ensure_fresh(self):
+        self._ensure_running()
+
+        # пока фоновая задача не прогрелась или отстала, обновляем сами
+        if time.time() - self.updated_at > FEE_ORACLE_MAX_AGE_S:
+            await self.update()
+
+    async def stop(self):
+        for task in (self.task, self.refresh_task):
+            if task is not None and not task.done():
+                task.cancel()
+                try:
+                    await task
+                except (asyncio.CancelledError, Exception):
+                    pass
+
+        self.task = None
+        self.refresh_task = None
+
+    async def get_fees(self) -> Tuple[int, int]:
+        await self._ensure_fresh()
+
+        return self.base_fee, self.priority_fee
+
+    async def get_gas_price(self) -> int:
+        await self._ensure_fresh()
+
+        return self.gas_price
+
+
+_oracles: Dict[str, FeeOracle] = {}
+
+
+def get_fee_oracle(chain: str) -> FeeOracle:
+    if chain not in _oracles:
+        _oracles[chain] = FeeOracle(chain)
+
+    return _oracles[chain]
+
+
+async def stop_fee_oracles():
+    await asyncio.gather(*[oracle.stop() for oracle in _oracles.values()])
@@ -1,39 +1,107 @@
 import asyncio
 import time
-import random
+from decimal import Decimal
 
 from web3 import Web3
-from web3.eth import AsyncEth
 
-from config import RPC
-from settings import CHECK_GWEI, MAX_GWEI
+from settings import CHECK_GWEI, MAX_GWEI, GAS_WATCHER_POLL_S, GAS_WATCHER_MAX_AGE_S
 from loguru import logger
+from utils.rpc import get_w3, batch_request
+
+
+class GasWatcher:
+    """
+    One background task polls Ethereum gas price once per block and wakes up every waiting
+    coroutine through a shared condition when it drops to MAX_GWEI. While the task is warm
+    a gas check is an in-memory read
+    """
+
+    def __init__(self, chain: str = "ethereum"):
+        self.chain = chain
+        self.w3 = get_w3(chain)
+        self.block_number = None
+        self.gwei = None
+        self.updated_at = 0
+        self.condition = None
+        self.task = None
+
+    async def refresh(self):
+        block_number, gas_price = await batch_request(self.w3, [
+            ("eth_blockNumber", []),
+            ("eth_gasPrice", []),
+        ])
+
+        self.updated_at = time.time()
+
+        if int(block_number, 16) != self.block_number:
+            self.block_number = int(block_number, 16)
+            self.gwei = Web3.from_wei(int(gas_price, 16), "gwei")
+
+            async with self.condition:
+                self.condition.notify_all()
+
+    async def _run(self):
+        while True:
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.error(f"Gas watcher error: {e}")
+
+            await asyncio.sleep(GAS_WATCHER_POLL_S)
+
+    def _ensure_running(self):
+        if self.task is None or self.task.done() or self.task.get_loop() is not asyncio.get_running_loop():
+            self.condition = asyncio.Condition()
+            self.task = asyncio.create_task(self._run(), name=f"gas-watcher-{self.chain}")
+
+    async def stop(self):
+        if self.task is not None and not self.task.done():
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+
+        self.task = None
+
+    def is_fresh(self) -> bool:
+        return self.gwei is not None and time.time() - self.updated_at <= GAS_WATCHER_MAX_AGE_S
+
+    def is_gas_ok(self) -> bool:
+        return self.is_fresh() and self.gwei <= Decimal(MAX_GWEI)
+
+    async def wait(self):
+        self._ensure_running()
+
+        if self.is_gas_ok():
+            return
+
+        async with self.condition:
+            if self.is_fresh():
+                logger.info(f"Current GWEI: {self.gwei} > {MAX_GWEI}")
+
+            await self.condition.wait_for(self.is_gas_ok)
+
+        logger.success(f"GWEI is normal | current: {self.gwei} < {MAX_GWEI}")
+
+
+gas_watcher = GasWatcher()
 
 
 async def get_gas():
     try:
-        w3 = Web3(
-            Web3.AsyncHTTPProvider(random.choice(RPC["ethereum"]["rpc"])),
-            modules={"eth": (AsyncEth,)},
-        )
-        gas_price = await w3.eth.gas_price
-        gwei = w3.from_wei(gas_price, 'gwei')
-        return gwei
+        gas_watcher._ensure_running()
+
+        if not gas_watcher.is_fresh():
+            await gas_watcher.refresh()
     except Exception as error:
         logger.error(error)
 
+    return gas_watcher.gwei
+
 
 async def wait_gas():
-    logger.info("Get GWEI")
-    while True:
-        gas = await get_gas()
-
-        if gas > MAX_GWEI:
-            logger.info(f'Current GWEI: {gas} > {MAX_GWEI}')
-            await asyncio.sleep(60)
-        else:
-            logger.success(f"GWEI is normal | current: {gas} < {MAX_GWEI}")
-            break
+    await gas_watcher.wait()
 
 
 def check_gas(func):
@@ -4,9 +4,6 @@ import time
 import traceback
 from decimal import Decimal, ROUND_DOWN
 
-import requests
-import json
-
 from itertools import chain as itertools_chain
 from typing import Tuple, Type
 from concurrent import futures
@@ -17,8 +14,11 @@ from onecache import AsyncCacheDecorator
 from loguru import logger
 from datetime import datetime
 
-from settings import RETRY_COUNT, SCROLL_API_KEY, EXPLORER_CACHE_MS, ETHEREUM_API_KEY
+from settings import RETRY_COUNT, EXPLORER_CACHE_MS
+from utils.explorer import explorer_client
+from utils.history import tx_history
 from utils.sleeping import sleep
+from utils.state import state_store
 
 
 def retry_sync(times: int, exceptions: Tuple[Type[Exception]] = Exception, sleep_from: int = 10, sleep_to: int = 20):
@@ -69,159 +69,42 @@ def retry(func, sleep_from: int = 10, sleep_to: int = 20):
     return wrapper
 
 
-def remove_wallet(private_key: str):
-    with open("accounts.txt", "r") as file:
-        lines = file.readlines()
-
-    with open("accounts.txt", "w") as file:
-        for line in lines:
-            if private_key not in line:
-                file.write(line)
+def remove_wallet(address: str):
+    # accounts.txt переписывается один раз в конце запуска, см. StateStore.export_accounts
+    state_store.remove_wallet(address)
 
 
 @AsyncCacheDecorator(ttl=EXPLORER_CACHE_MS)
 async def get_eth_usd_price(chain: str):
-    explorers_data = {
-        "scroll": {
-            "url": "https://api.scrollscan.com/api",
-            "api_key": SCROLL_API_KEY
-        }
-    }
-
-    explorer_data = explorers_data.get(chain)
-    if explorer_data is None:
+    if chain != "scroll":
         raise ValueError(f"Unsupported chain: {chain}")
 
-    explorer_api_url = explorer_data.get("url")
-    explorer_api_key = explorer_data.get("api_key")
-
-    params = {
+    result = await explorer_client.request(chain, {
         "module": "stats",
         "action": "ethprice",
-    }
-
-    if explorer_api_key:
-        params["apikey"] = explorer_api_key
-
-    while True:
-        try:
-            response = requests.get(explorer_api_url, params=params)
-            response.raise_for_status()
-            data = response.json()
-
-            if "result" not in data:
-                # logger.error("No 'result' field in the response")
-                raise Exception("Response does not contain 'result' field")
+    })
 
-            if "Invalid API Key" in data["result"]:
-                # logger.error("Invalid API Key")
-                print(explorer_api_url)
-                print(params)
-                print(data)
-                raise Exception(data["result"])
-            if "rate limit" in data["result"]:
-                # logger.error("Explorer api max rate limit reached")
-                raise Exception(data["result"])
+    return float(result["ethusd"])
 
-            if "error" in data:
-                raise Exception(data["error"])
 
-            return float(data["result"]["ethusd"])
-        except (requests.exceptions.HTTPError, json.decoder.JSONDecodeError, Exception) as e:
-            logger.error(f"Error get_eth_usd_price: {e}")
-            await sleep(10)
-
-
-@AsyncCacheDecorator(ttl=EXPLORER_CACHE_MS)
 async def get_account_transfer_tx_list(account_address: str, chain: str):
-    explorers_data = {
-        'zksync': {
-            'url': 'https://block-explorer-api.mainnet.zksync.io/api',
-        },
-        'scroll': {
-            'url': 'https://api.scrollscan.com/api',
-            'api_key': SCROLL_API_KEY
-        },
-        'ethereum': {
-            'url': 'https://api.etherscan.io/api',
-            'api_key': ETHEREUM_API_KEY
-        }
-    }
-
-    explorer_data = explorers_data.get(chain)
-    if explorer_data is None:
-        raise ValueError(f"Unsupported chain: {chain}")
-
-    explorer_api_url = explorer_data.get('url')
-    explorer_api_key = explorer_data.get('api_key')
+    tx_list = await tx_history.get_tx_list(account_address, chain)
 
-    params = {
-        "module": "account",
-        "action": "txlist",
-        "address": account_address,
-        "startblock": 0,
-        "endblock": 999999999,
-        "sort": "desc",
-    }
+    if tx_list:
+        last_tx = tx_list[0]
+        logger.info(f"Last known tx for address in block {last_tx['blockNumber']}, hash: {last_tx['hash']}")
 
-    if explorer_api_key:
-        params['apikey'] = explorer_api_key
-
-    while True:
-        try:
-            response = requests.get(explorer_api_url, params=params)
-            response.raise_for_status()
-            data = response.json()
-
-            if "result" not in data:
-                # logger.error("No 'result' field in the response")
-                raise Exception("Response does not contain 'result' field")
-
-            if "Invalid API Key" in data["result"]:
-                # logger.error("Invalid API Key")
-                print(explorer_api_url)
-                print(params)
-                print(data)                
-                raise Exception(data["result"])
-            if "rate limit" in data["result"]:
-                # logger.error("Explorer api max rate limit reached")
-                raise Exception(data["result"])
-
-            if "error" in data:
-                raise Exception(data["error"])
-
-            if data["result"]:
-                last_tx = data["result"][0]
-                logger.info(f"Last known tx for address in block {last_tx['blockNumber']}, hash: {last_tx['hash']}")
-                # await sleep(3)
-
-            return data["result"]
-
-        except (requests.exceptions.HTTPError, json.decoder.JSONDecodeError, Exception) as e:
-            logger.error(f"Error get_account_transfer_tx_list: {e}")
-            await sleep(7)
+    return tx_list
 
 
 async def get_last_action(address: str, dst: str, chain: str):
-    tx_list = await get_account_transfer_tx_list(account_address=address, chain=chain)
-    last = None
-
-    for tx in tx_list:
-        print(tx)
-        if tx["from"].lower() == address.lower() and tx["to"].lower() == dst.lower() and tx["isError"] == "0":
-            last = tx
-            break
-    return last
+    return await get_last_action_tx(address, dst, chain)
 
 
 async def get_action_tx_count(address: str, dst: str, chain: str):
-    tx_list = await get_account_transfer_tx_list(account_address=address, chain=chain)
-    action_tx_list = []
-    for tx in tx_list:
-        if tx["from"].lower() == address.lower() and tx["to"].lower() == dst.lower() and tx["isError"] == "0":
-            action_tx_list.append(tx)
+    actions = await tx_history.get_actions(address, chain)
 
-    return len(action_tx_list)
+    return actions.get(dst.lower(), {}).get("count", 0)
 
 
 async def get_last_tx(address: str, chain: str):
@@ -230,14 +113,9 @@ async def get_last_tx(address: str, chain: str):
 
 
 async def get_last_action_tx(address: str, dst: str, chain: str):
-    tx_list = await get_account_transfer_tx_list(account_address=address, chain=chain)
-    last = None
-    for tx in tx_list:
-        if tx["from"].lower() == address.lower() and tx["to"].lower() == dst.lower() and tx["isError"] == "0":
-            last = tx
-            break
+    actions = await tx_history.get_actions(address, chain)
 
-    return last
+    return actions.get(dst.lower(), {}).get("last_tx")
 
 
 async def checkLastIteration(interval: int,
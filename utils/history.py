@@ -0,0 +1,171 @@
+import asyncio
+import os
+import sqlite3
+import time
+from typing import Dict, List
+
+from settings import TX_HISTORY_DB, TX_HISTORY_TTL_S, TX_HISTORY_DIRTY_S
+from utils.explorer import explorer_client, ExplorerError
+
+
+class TxHistory:
+    """
+    Persistent per-address explorer txlist index in SQLite.
+    Only blocks newer than the last indexed one are downloaded. An address is re-synced when its entry
+    is older than TX_HISTORY_TTL_S, and on every read for TX_HISTORY_DIRTY_S after this process sent a
+    transaction from it (the explorer indexes new transactions with a delay)
+    """
+
+    def __init__(self, db_file: str = TX_HISTORY_DB):
+        self.db_file = db_file
+        self.conn = None
+        self.locks: Dict[str, asyncio.Lock] = {}
+        self.dirty_until: Dict[str, float] = {}
+        # (chain, address) -> {to: {"count": ..., "last_tx": ...}} успешных исходящих транзакций
+        self.actions: Dict[str, Dict[str, dict]] = {}
+
+    def get_conn(self) -> sqlite3.Connection:
+        if self.conn is None:
+            os.makedirs(os.path.dirname(self.db_file) or ".", exist_ok=True)
+
+            self.conn = sqlite3.connect(self.db_file)
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.executescript("""
+                CREATE TABLE IF NOT EXISTS txs (
+                    chain TEXT NOT NULL,
+                    address TEXT NOT NULL,
+                    hash TEXT NOT NULL,
+                    block_number INTEGER NOT NULL,
+                    nonce INTEGER NOT NULL,
+                    time_stamp INTEGER NOT NULL,
+                    tx_from TEXT NOT NULL,
+                    tx_to TEXT NOT NULL,
+                    is_error TEXT NOT NULL,
+                    PRIMARY KEY (chain, address, hash)
+                );
+                CREATE INDEX IF NOT EXISTS txs_address_block ON txs (chain, address, block_number);
+                CREATE TABLE IF NOT EXISTS synced (
+                    chain TEXT NOT NULL,
+                    address TEXT NOT NULL,
+                    last_block INTEGER NOT NULL,
+                    synced_at REAL NOT NULL,
+                    PRIMARY KEY (chain, address)
+                );
+            """)
+
+        return self.conn
+
+    @staticmethod
+    def get_key(chain: str, address: str) -> str:
+        return f"{chain}:{address.lower()}"
+
+    def invalidate(self, chain: str, address: str):
+        self.dirty_until[self.get_key(chain, address)] = time.time() + TX_HISTORY_DIRTY_S
+
+    def _need_sync(self, chain: str, address: str, synced_at: float, requested_at: float) -> bool:
+        # пока ждали блокировку, другой запрос уже синхронизировал адрес - его результат свежий и для нас
+        if synced_at >= requested_at:
+            return False
+
+        now = time.time()
+
+        return now - synced_at > TX_HISTORY_TTL_S or now < self.dirty_until.get(self.get_key(chain, address), 0)
+
+    async def sync(self, chain: str, address: str, start_block: int):
+        result = await explorer_client.request(chain, {
+            "module": "account",
+            "action": "txlist",
+            "address": address,
+            "startblock": start_block,
+            "endblock": 999999999,
+            "sort": "desc",
+        })
+        if not isinstance(result, list):
+            raise ExplorerError(f"Explorer {chain} txlist wrong response: {result}")
+
+        conn = self.get_conn()
+        with conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO txs VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (chain, address, tx["hash"], int(tx["blockNumber"]), int(tx["nonce"]), int(tx["timeStamp"]),
+                     tx["from"].lower(), (tx["to"] or "").lower(), tx["isError"])
+                    for tx in result
+                ]
+            )
+            last_block = max([int(tx["blockNumber"]) for tx in result], default=start_block)
+            conn.execute(
+                "INSERT OR REPLACE INTO synced VALUES (?, ?, ?, ?)",
+                (chain, address, last_block, time.time())
+            )
+
+        self.actions.pop(self.get_key(chain, address), None)
+
+    async def _ensure_synced(self, address: str, chain: str):
+        key = self.get_key(chain, address)
+        requested_at = time.time()
+
+        # параллельные запросы одного адреса ждут одну синхронизацию
+        async with self.locks.setdefault(key, asyncio.Lock()):
+            row = self.get_conn().execute(
+                "SELECT last_block, synced_at FROM synced WHERE chain = ? AND address = ?", (chain, address)
+            ).fetchone()
+
+            if row is None:
+                await self.sync(chain, address, 0)
+            elif self._need_sync(chain, address, row[1], requested_at):
+                # блок last_block берём ещё раз, вдруг он был проиндексирован не полностью
+                await self.sync(chain, address, row[0])
+
+    async def get_tx_list(self, address: str, chain: str) -> List[dict]:
+        address = address.lower()
+
+        await self._ensure_synced(address, chain)
+
+        return self._read_tx_list(address, chain)
+
+    def _read_tx_list(self, address: str, chain: str) -> List[dict]:
+        rows = self.get_conn().execute(
+            "SELECT hash, block_number, nonce, time_stamp, tx_from, tx_to, is_error FROM txs "
+            "WHERE chain = ? AND address = ? ORDER BY block_number DESC, nonce DESC",
+            (chain, address)
+        ).fetchall()
+
+        return [
+            {
+                "hash": tx_hash,
+                "blockNumber": str(block_number),
+                "nonce": str(nonce),
+                "timeStamp": str(time_stamp),
+                "from": tx_from,
+                "to": tx_to,
+                "isError": is_error,
+            }
+            for tx_hash, block_number, nonce, time_stamp, tx_from, tx_to, is_error in rows
+        ]
+
+    async def get_actions(self, address: str, chain: str) -> Dict[str, dict]:
+        """
+        Index of successful transactions sent from the address: destination -> count and last tx,
+        built in one pass over the history and kept until the next sync
+        """
+        address = address.lower()
+        key = self.get_key(chain, address)
+
+        await self._ensure_synced(address, chain)
+
+        if key not in self.actions:
+            actions = {}
+            for tx in self._read_tx_list(address, chain):
+                if tx["from"] != address or tx["isError"] != "0":
+                    continue
+
+                action = actions.setdefault(tx["to"], {"count": 0, "last_tx": tx})
+                action["count"] += 1
+
+            self.actions[key] = actions
+
+        return self.actions[key]
+
+
+tx_history = TxHistory()
@@ -0,0 +1,96 @@
+import time
+from contextlib import asynccontextmanager
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+import aiohttp
+from loguru import logger
+
+from settings import (HTTP_POOL_LIMIT,
+                      HTTP_POOL_LIMIT_PER_HOST,
+                      HTTP_KEEPALIVE_S,
+                      HTTP_TIMEOUT_S,
+                      HTTP_REQUESTS_PER_S,
+                      HTTP_HOST_REQUESTS_PER_S,
+                      HTTP_BACKOFF_S)
+from utils.pool import TokenBucket, SessionPool
+
+
+class HostStats:
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.total_s = 0.0
+        self.max_s = 0.0
+
+    def add(self, elapsed: float, failed: bool):
+        self.requests += 1
+        self.errors += failed
+        self.total_s += elapsed
+        self.max_s = max(self.max_s, elapsed)
+
+
+class HttpClient:
+    """
+    Shared keep-alive aiohttp sessions for aggregator, bridge and project APIs: one pooled session
+    per proxy (direct requests share one), a token bucket per host and request timings per host
+    """
+
+    def __init__(self):
+        self.sessions = SessionPool(HTTP_POOL_LIMIT, HTTP_POOL_LIMIT_PER_HOST, HTTP_KEEPALIVE_S, HTTP_TIMEOUT_S)
+        self.buckets: Dict[str, TokenBucket] = {}
+        self.stats: Dict[str, HostStats] = {}
+
+    def get_session(self, proxy: Optional[str] = None) -> aiohttp.ClientSession:
+        proxy = proxy.strip() if proxy and proxy.strip() else None
+
+        # прямые запросы идут через одну сессию, для каждого прокси - своя
+        return self.sessions.get(proxy, proxy)
+
+    def get_bucket(self, host: str) -> TokenBucket:
+        if host not in self.buckets:
+            self.buckets[host] = TokenBucket(HTTP_HOST_REQUESTS_PER_S.get(host, HTTP_REQUESTS_PER_S))
+
+        return self.buckets[host]
+
+    @asynccontextmanager
+    async def request(self, method: str, url: str, proxy: Optional[str] = None, **kwargs):
+        host = urlsplit(url).hostname
+        bucket = self.get_bucket(host)
+
+        await bucket.acquire()
+
+        started_at = time.monotonic()
+        failed = True
+        try:
+            async with self.get_session(proxy).request(method, url, **kwargs) as response:
+                if response.status == 429:
+                    retry_after = response.headers.get("Retry-After", "")
+                    delay = float(retry_after) if retry_after.isdigit() else HTTP_BACKOFF_S
+                    bucket.block(delay)
+                    logger.warning(f"{host} rate limit reached, pause requests to it for {delay} s.")
+
+                failed = response.status >= 400
+
+                yield response
+        finally:
+            self.stats.setdefault(host, HostStats()).add(time.monotonic() - started_at, failed)
+
+    def get(self, url: str, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    def report(self):
+        for host, stats in sorted(self.stats.items()):
+            logger.info(
+                f"{host}: {stats.requests} requests, {stats.errors} errors, "
+                f"avg {int(stats.total_s / stats.requests * 1000)} ms, max {int(stats.max_s * 1000)} ms"
+            )
+
+    async def close(self):
+        await self.sessions.close()
+
+
+http_client = HttpClient()
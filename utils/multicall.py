@@ -0,0 +1,91 @@
+import asyncio
+from typing import Dict, List, Tuple
+
+from eth_abi import decode
+from web3 import AsyncWeb3, Web3
+
+from config import ERC20_ABI, MULTICALL_ABI, MULTICALL_CONTRACTS
+from settings import MULTICALL_BATCH_SIZE
+from utils.contracts import get_contract, to_checksum
+from utils.tokens import token_registry
+
+# контракт без провайдера, используется только для кодирования calldata
+_erc20 = Web3().eth.contract(abi=ERC20_ABI)
+
+
+async def aggregate(
+        w3: AsyncWeb3,
+        chain: str,
+        calls: List[Tuple[str, str]],
+        block_identifier="latest"
+) -> List[Tuple[bool, bytes]]:
+    """
+    Run (target, calldata) calls through the chain's Multicall3.aggregate3 with allowFailure and
+    return (success, return_data) for each call, MULTICALL_BATCH_SIZE calls per eth_call
+    """
+    if chain not in MULTICALL_CONTRACTS:
+        raise ValueError(f"Multicall3 address is unknown for chain: {chain}")
+
+    multicall = get_contract(w3, MULTICALL_CONTRACTS[chain], MULTICALL_ABI)
+
+    chunks = [calls[i:i + MULTICALL_BATCH_SIZE] for i in range(0, len(calls), MULTICALL_BATCH_SIZE)]
+    chunks_results = await asyncio.gather(*[
+        multicall.functions.aggregate3(
+            [(to_checksum(target), True, Web3.to_bytes(hexstr=data)) for target, data in chunk]
+        ).call(block_identifier=block_identifier)
+        for chunk in chunks
+    ])
+
+    return [result for chunk_results in chunks_results for result in chunk_results]
+
+
+def _decode_symbol(data: bytes) -> str:
+    try:
+        return decode(["string"], data)[0]
+    except Exception:
+        # старые токены возвращают bytes32
+        return data[:32].rstrip(b"\x00").decode(errors="ignore")
+
+
+async def get_token_balances(w3: AsyncWeb3, chain: str, queries: List[Tuple[str, str]]) -> List[Dict]:
+    """
+    Get ERC-20 balances for many (token, holder) pairs in as few eth_calls as possible.
+    symbol/decimals are read only for tokens missing from the token registry.
+    Result items have the same format as Account.get_balance
+    """
+    unknown_tokens = list(dict.fromkeys(
+        token.lower() for token, _ in queries if token_registry.get(chain, token) is None
+    ))
+
+    calls = []
+    for token in unknown_tokens:
+        calls.append((token, _erc20.encodeABI(fn_name="symbol")))
+        calls.append((token, _erc20.encodeABI(fn_name="decimals")))
+    for token, holder in queries:
+        calls.append((token, _erc20.encodeABI(fn_name="balanceOf", args=[to_checksum(holder)])))
+
+    results = await aggregate(w3, chain, calls)
+
+    for index, token in enumerate(unknown_tokens):
+        (symbol_success, symbol_data), (decimals_success, decimals_data) = results[index * 2:index * 2 + 2]
+        if not symbol_success or not decimals_success:
+            raise ValueError(f"Failed to get symbol/decimals for token {token}")
+
+        token_registry.add(chain, token, _decode_symbol(symbol_data), decode(["uint8"], decimals_data)[0])
+
+    balances = []
+    for (token, holder), (success, data) in zip(queries, results[len(unknown_tokens) * 2:]):
+        if not success:
+            raise ValueError(f"Failed to get {token} balance of {holder}")
+
+        metadata = token_registry.get(chain, token)
+        balance_wei = decode(["uint256"], data)[0]
+
+        balances.append({
+            "balance_wei": balance_wei,
+            "balance": balance_wei / 10 ** metadata["decimal"],
+            "symbol": metadata["symbol"],
+            "decimal": metadata["decimal"]
+        })
+
+    return balances
@@ -0,0 +1,86 @@
+import json
+import os
+import time
+from typing import Dict, Tuple
+
+from loguru import logger
+
+from settings import NONCE_STATE_FILE, NONCE_RESERVE_TIMEOUT_S, NONCE_SENT_TIMEOUT_S
+
+
+class NonceManager:
+    """
+    Allocates nonces locally per (chain, address) so a wallet can have several transactions in flight.
+    A nonce is allocated right before signing, after the gas estimate, so a reverting build never holds one.
+
+    The node's pending transaction count is the lower bound: nonces between it and the local counter
+    that were neither sent nor recently reserved are gaps left by failed transactions and get reused first.
+    Only the local counter is persisted, in-flight state lives in memory.
+    """
+
+    def __init__(self, state_file: str = NONCE_STATE_FILE):
+        self.state_file = state_file
+        self.next_nonces: Dict[str, int] = {}
+        # nonce -> (время резервирования/отправки, отправлена ли транзакция)
+        self.in_flight: Dict[str, Dict[int, Tuple[float, bool]]] = {}
+
+        if os.path.exists(self.state_file):
+            with open(self.state_file, "r") as file:
+                self.next_nonces = json.load(file)
+
+    @staticmethod
+    def get_key(chain: str, address: str) -> str:
+        return f"{chain}:{address.lower()}"
+
+    def _save(self):
+        os.makedirs(os.path.dirname(self.state_file) or ".", exist_ok=True)
+
+        tmp_file = f"{self.state_file}.tmp"
+        with open(tmp_file, "w") as file:
+            json.dump(self.next_nonces, file)
+        os.replace(tmp_file, self.state_file)
+
+    def _is_gap(self, nonce_state: Tuple[float, bool], now: float) -> bool:
+        if nonce_state is None:
+            return True
+
+        reserved_at, sent = nonce_state
+        return now - reserved_at > (NONCE_SENT_TIMEOUT_S if sent else NONCE_RESERVE_TIMEOUT_S)
+
+    def allocate(self, chain: str, address: str, pending_count: int) -> int:
+        key = self.get_key(chain, address)
+        in_flight = self.in_flight.setdefault(key, {})
+        now = time.time()
+
+        # всё что ниже pending уже в мемпуле или в блоке
+        for nonce in [nonce for nonce in in_flight if nonce < pending_count]:
+            del in_flight[nonce]
+
+        next_nonce = max(self.next_nonces.get(key, 0), pending_count)
+
+        nonce = next(
+            (nonce for nonce in range(pending_count, next_nonce) if self._is_gap(in_flight.get(nonce), now)),
+            None
+        )
+        if nonce is not None:
+            logger.debug(f"[{address}] Fill nonce gap {nonce} on {chain} (pending {pending_count}, next {next_nonce})")
+        else:
+            nonce = next_nonce
+            next_nonce += 1
+
+        in_flight[nonce] = (now, False)
+
+        if self.next_nonces.get(key) != next_nonce:
+            self.next_nonces[key] = next_nonce
+            self._save()
+
+        return nonce
+
+    def mark_sent(self, chain: str, address: str, nonce: int):
+        self.in_flight.setdefault(self.get_key(chain, address), {})[nonce] = (time.time(), True)
+
+    def release(self, chain: str, address: str, nonce: int):
+        self.in_flight.get(self.get_key(chain, address), {}).pop(nonce, None)
+
+
+nonce_manager = NonceManager()
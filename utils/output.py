@@ -0,0 +1,35 @@
+import csv
+import json
+
+
+class ResultWriter:
+    """
+    Streams rows of a per-wallet table (#, address, one column per chain) to a .csv or .json file
+    as they are produced
+    """
+
+    def __init__(self, file_name: str, chains: list):
+        self.file = open(file_name, "w", newline="")
+        self.is_json = file_name.endswith(".json")
+        self.rows_written = 0
+
+        if self.is_json:
+            self.file.write("[\n")
+        else:
+            self.writer = csv.writer(self.file)
+            self.writer.writerow(["#", "Address", *chains])
+
+    def write(self, row: list, chains: list):
+        if self.is_json:
+            item = {"id": row[0], "address": row[1], **dict(zip(chains, row[2:]))}
+            self.file.write(("," if self.rows_written else "") + json.dumps(item) + "\n")
+        else:
+            self.writer.writerow(row)
+
+        self.rows_written += 1
+        self.file.flush()
+
+    def close(self):
+        if self.is_json:
+            self.file.write("]\n")
+        self.file.close()
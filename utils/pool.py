@@ -0,0 +1,82 @@
+import asyncio
+import time
+from typing import Dict, Hashable, Optional
+
+import aiohttp
+from aiohttp_socks import ProxyConnector
+
+
+class TokenBucket:
+    """
+    Requests-per-second limiter shared by all tasks talking to one API
+    """
+
+    def __init__(self, rate: float):
+        self.rate = rate
+        self.capacity = max(rate, 1)
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self.blocked_until = 0
+
+    async def acquire(self):
+        while True:
+            now = time.monotonic()
+
+            if now < self.blocked_until:
+                await asyncio.sleep(self.blocked_until - now)
+                continue
+
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+            self.updated_at = now
+
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+
+            await asyncio.sleep((1 - self.tokens) / self.rate)
+
+    def block(self, seconds: float):
+        # сервер сказал что лимит превышен - притормаживаем всех
+        self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+        self.tokens = 0
+
+
+class SessionPool:
+    """
+    Keep-alive aiohttp sessions by key with the same connection limits, a session is re-created
+    when it was closed or belongs to a finished event loop
+    """
+
+    def __init__(self, limit: int, limit_per_host: int, keepalive_s: float, timeout_s: float, **session_kwargs):
+        self.connector_params = {
+            "limit": limit,
+            "limit_per_host": limit_per_host,
+            "keepalive_timeout": keepalive_s,
+        }
+        self.timeout_s = timeout_s
+        self.session_kwargs = session_kwargs
+        self.sessions: Dict[Hashable, aiohttp.ClientSession] = {}
+
+    def get(self, key: Hashable, proxy: Optional[str] = None) -> aiohttp.ClientSession:
+        # вызывается только внутри event loop, между проверкой и созданием нет await - гонки нет
+        session = self.sessions.get(key)
+        if session is None or session.closed or session._loop.is_closed():
+            if proxy:
+                connector = ProxyConnector.from_url(proxy, **self.connector_params)
+            else:
+                connector = aiohttp.TCPConnector(**self.connector_params)
+
+            session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout_s),
+                **self.session_kwargs
+            )
+            self.sessions[key] = session
+
+        return session
+
+    async def close(self):
+        for session in list(self.sessions.values()):
+            if not session.closed:
+                await session.close()
+        self.sessions.clear()
@@ -0,0 +1,121 @@
+import asyncio
+import json
+from typing import Dict, Optional
+
+import aiohttp
+from loguru import logger
+
+from config import RPC
+from settings import RECEIPT_POLL_S, RECEIPT_BATCH_SIZE
+from utils.rpc import get_w3, batch_request
+
+
+class ReceiptWatcher:
+    """
+    One task per chain that tracks every pending transaction hash and resolves their receipts
+    in batches once per new block. New blocks come from a websocket newHeads subscription
+    when RPC[chain] has a "ws" endpoint, otherwise from eth_blockNumber polling
+    """
+
+    def __init__(self, chain: str):
+        self.chain = chain
+        self.w3 = get_w3(chain)
+        self.ws_uri = RPC[chain].get("ws")
+        self.pending: Dict[str, asyncio.Future] = {}
+        # сколько корутин ждут хэш, future удаляется когда уходит последняя
+        self.waiters: Dict[str, int] = {}
+        # хэши, добавленные после последней проверки
+        self.new_hashes = set()
+        self.block_number = None
+        self.task = None
+
+    async def wait(self, tx_hash: str, max_wait_time: float) -> Optional[dict]:
+        tx_hash = tx_hash.lower()
+
+        if tx_hash not in self.pending:
+            self.pending[tx_hash] = asyncio.get_running_loop().create_future()
+            self.new_hashes.add(tx_hash)
+
+        future = self.pending[tx_hash]
+        self.waiters[tx_hash] = self.waiters.get(tx_hash, 0) + 1
+
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self._run(), name=f"receipt-watcher-{self.chain}")
+
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), max_wait_time)
+        except asyncio.TimeoutError:
+            return None
+        finally:
+            self.waiters[tx_hash] -= 1
+            if self.waiters[tx_hash] == 0:
+                del self.waiters[tx_hash]
+                if self.pending.get(tx_hash) is future:
+                    self.pending.pop(tx_hash)
+
+    async def check_receipts(self):
+        hashes = list(self.pending)
+        self.new_hashes.clear()
+
+        for i in range(0, len(hashes), RECEIPT_BATCH_SIZE):
+            chunk = hashes[i:i + RECEIPT_BATCH_SIZE]
+            receipts = await batch_request(self.w3, [("eth_getTransactionReceipt", [tx_hash]) for tx_hash in chunk])
+
+            for tx_hash, receipt in zip(chunk, receipts):
+                future = self.pending.get(tx_hash)
+                if receipt is not None and future is not None and not future.done():
+                    future.set_result(receipt)
+                    self.pending.pop(tx_hash, None)
+
+    async def _poll_blocks(self):
+        while self.pending:
+            try:
+                block_number = await self.w3.eth.block_number
+
+                if block_number != self.block_number or self.new_hashes:
+                    self.block_number = block_number
+                    await self.check_receipts()
+            except Exception as e:
+                logger.error(f"Receipt watcher {self.chain} error: {e}")
+
+            await asyncio.sleep(RECEIPT_POLL_S)
+
+    async def _subscribe_blocks(self):
+        async with aiohttp.ClientSession() as session:
+            async with session.ws_connect(self.ws_uri, heartbeat=30) as ws:
+                await ws.send_json({"jsonrpc": "2.0", "id": 1, "method": "eth_subscribe", "params": ["newHeads"]})
+
+                # транзакция могла попасть в блок до подписки
+                await self.check_receipts()
+
+                async for message in ws:
+                    if message.type != aiohttp.WSMsgType.TEXT:
+                        break
+
+                    data = json.loads(message.data)
+                    if data.get("method") == "eth_subscription":
+                        await self.check_receipts()
+
+                    if not self.pending:
+                        return
+
+    async def _run(self):
+        while self.pending:
+            if self.ws_uri:
+                try:
+                    await self._subscribe_blocks()
+                    continue
+                except Exception as e:
+                    logger.error(f"Receipt watcher {self.chain} websocket error: {e}, fallback to polling")
+
+            await self._poll_blocks()
+
+
+_watchers: Dict[str, ReceiptWatcher] = {}
+
+
+def get_receipt_watcher(chain: str) -> ReceiptWatcher:
+    if chain not in _watchers:
+        _watchers[chain] = ReceiptWatcher(chain)
+
+    return _watchers[chain]
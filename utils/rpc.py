@@ -0,0 +1,120 @@
+import asyncio
+import json
+import random
+from typing import Any, Dict, List, Tuple
+
+import aiohttp
+from loguru import logger
+from web3 import AsyncWeb3
+from web3.providers.async_rpc import AsyncHTTPProvider
+from web3.middleware import async_simple_cache_middleware, async_geth_poa_middleware
+from web3.types import RPCEndpoint, RPCResponse
+
+from config import RPC
+from settings import RPC_POOL_LIMIT, RPC_POOL_LIMIT_PER_HOST, RPC_KEEPALIVE_S, RPC_TIMEOUT_S
+from utils.pool import SessionPool
+
+# один AsyncWeb3 на (chain, endpoint) и одна aiohttp сессия на endpoint на весь процесс
+_web3_pool: Dict[Tuple[str, str], AsyncWeb3] = {}
+_sessions = SessionPool(RPC_POOL_LIMIT, RPC_POOL_LIMIT_PER_HOST, RPC_KEEPALIVE_S, RPC_TIMEOUT_S, raise_for_status=True)
+
+
+def get_session(endpoint_uri: str) -> aiohttp.ClientSession:
+    return _sessions.get(endpoint_uri)
+
+
+async def close_sessions():
+    await _sessions.close()
+
+
+class PooledHTTPProvider(AsyncHTTPProvider):
+    """
+    AsyncHTTPProvider that sends requests through a process-wide keep-alive session per endpoint
+    instead of web3's unbounded per-endpoint session cache
+    """
+
+    batch_supported = True
+
+    def disable_batches(self, reason):
+        if self.batch_supported:
+            logger.warning(f"{self.endpoint_uri} does not support JSON-RPC batches, use single requests: {reason}")
+        self.batch_supported = False
+
+    async def post(self, request_data: bytes) -> bytes:
+        session = get_session(self.endpoint_uri)
+
+        async with session.post(self.endpoint_uri, data=request_data, headers=self.get_request_headers()) as response:
+            return await response.read()
+
+    async def make_request(self, method: RPCEndpoint, params: Any) -> RPCResponse:
+        request_data = self.encode_rpc_request(method, params)
+        raw_response = await self.post(request_data)
+
+        return self.decode_rpc_response(raw_response)
+
+
+class RPCBatchError(Exception):
+    pass
+
+
+class RPCResultError(RPCBatchError):
+    def __init__(self, method: str, error):
+        super().__init__(f"{method} failed: {error}")
+        self.method = method
+        self.error = error
+
+
+async def batch_request(w3: AsyncWeb3, calls: List[Tuple[str, list]]) -> List[Any]:
+    """
+    Send independent JSON-RPC reads as one batch request and return raw results in the same order.
+    Falls back to concurrent single requests if the provider or endpoint does not support batches;
+    an endpoint that rejects a batch is remembered and gets single requests from then on
+    """
+    provider = w3.provider
+
+    if isinstance(provider, PooledHTTPProvider) and provider.batch_supported:
+        payload = [
+            {"jsonrpc": "2.0", "id": request_id, "method": method, "params": params}
+            for request_id, (method, params) in enumerate(calls)
+        ]
+        try:
+            responses = json.loads(await provider.post(json.dumps(payload).encode()))
+
+            if not isinstance(responses, list) or len(responses) != len(calls):
+                raise RPCBatchError(f"Unexpected batch response: {responses}")
+        except aiohttp.ClientResponseError as e:
+            # 4xx - эндпоинт не принимает batch, 5xx - возможно временная ошибка, просто повторяем по одному
+            if e.status < 500:
+                provider.disable_batches(e)
+        except (RPCBatchError, ValueError) as e:
+            # ответ не JSON или не массив ответов
+            provider.disable_batches(e)
+        else:
+            responses = {response.get("id"): response for response in responses}
+
+            return [_get_result(method, responses.get(request_id)) for request_id, (method, _) in enumerate(calls)]
+
+    responses = await asyncio.gather(*[provider.make_request(method, params) for method, params in calls])
+
+    return [_get_result(method, response) for (method, _), response in zip(calls, responses)]
+
+
+def _get_result(method: str, response: dict) -> Any:
+    if response is None or "result" not in response:
+        raise RPCResultError(method, None if response is None else response.get("error"))
+
+    return response["result"]
+
+
+def get_w3(chain: str, endpoint_uri: str = None) -> AsyncWeb3:
+    if endpoint_uri is None:
+        endpoint_uri = random.choice(RPC[chain]["rpc"])
+
+    key = (chain, endpoint_uri)
+    if key not in _web3_pool:
+        _web3_pool[key] = AsyncWeb3(
+            PooledHTTPProvider(endpoint_uri),
+            middlewares=[async_simple_cache_middleware, async_geth_poa_middleware],
+        )
+
+    return _web3_pool[key]
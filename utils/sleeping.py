@@ -1,39 +1,90 @@
-import time
+import sys
 import asyncio
 import random
+from collections import defaultdict
+from typing import Dict, Tuple
 
 import aioconsole
+from loguru import logger
+
+
+class DelayScheduler:
+    """
+    Cooperative delays on top of the event loop timer heap: other wallets keep working while
+    one sleeps. The pending delay that ends first can be skipped from the console, waiting time is counted per worker task
+    """
+
+    def __init__(self):
+        # future -> (время окончания, воркер)
+        self.delays: Dict[asyncio.Future, Tuple[float, str]] = {}
+        self.waited: Dict[str, float] = defaultdict(float)
+        self.console_task = None
+
+    async def sleep(self, delay: float, key: str = 'q'):
+        loop = asyncio.get_running_loop()
+        task = asyncio.current_task()
+        worker = task.get_name() if task else "main"
+
+        self._listen_console(key)
+
+        future = loop.create_future()
+        deadline = loop.time() + delay
+        handle = loop.call_at(deadline, lambda: future.done() or future.set_result(False))
+        self.delays[future] = (deadline, worker)
+
+        start = loop.time()
+        try:
+            skipped = await future
+            if skipped:
+                print(f"Sleep interrupted! ({worker})")
+        finally:
+            handle.cancel()
+            self.delays.pop(future, None)
+            self.waited[worker] += loop.time() - start
+
+    def skip(self):
+        # одно нажатие прерывает одну паузу - ту, что закончилась бы раньше всех
+        pending = [(deadline, future) for future, (deadline, _) in self.delays.items() if not future.done()]
+        if pending:
+            min(pending, key=lambda item: item[0])[1].set_result(True)
+
+    def _listen_console(self, key: str):
+        if not sys.stdin or not sys.stdin.isatty():
+            return
+
+        if self.console_task is None or self.console_task.done() or \
+                self.console_task.get_loop() is not asyncio.get_running_loop():
+            self.console_task = asyncio.create_task(self._wait_for_key(key), name="sleep-console")
+
+    async def _wait_for_key(self, key: str):
+        while True:
+            key_pressed = await aioconsole.ainput()
+            if key_pressed.strip() == key:
+                self.skip()
+
+    async def stop(self):
+        if self.console_task is not None and not self.console_task.done():
+            self.console_task.cancel()
+            try:
+                await self.console_task
+            except asyncio.CancelledError:
+                pass
+
+        self.console_task = None
+
+    def report(self):
+        for worker, waited in sorted(self.waited.items()):
+            logger.info(f"{worker} waited {int(waited)} s.")
+        logger.info(f"Total wait time: {int(sum(self.waited.values()))} s.")
+
+
+scheduler = DelayScheduler()
 
 
 async def sleep(sleep_from, sleep_to=None, key='q'):
     if sleep_to is None:
         sleep_to = sleep_from
     delay = random.randint(sleep_from, sleep_to)
-    print(f"💤 Sleep {delay} s.")
-    time.sleep(delay)
-    """
     print(f"💤 Sleep {delay} s. Press '{key} and Enter' to interrupt.")
 
-    async def wait_for_key():
-        while True:
-            key_pressed = await aioconsole.ainput()
-            if key_pressed == key:
-                return True
-
-    async def sleep_task():
-        try:
-            for _ in range(delay):
-                await asyncio.sleep(1)
-        except asyncio.CancelledError:
-            print("Sleep interrupted!")
-            
-    # Запускаем задачи одновременно
-    done, pending = await asyncio.wait(
-        [sleep_task(), wait_for_key()],
-        return_when=asyncio.FIRST_COMPLETED
-    )
-
-    # Прерываем sleep_task, если она еще не завершена
-    for task in pending:
-        task.cancel()
-    """
+    await scheduler.sleep(delay, key)
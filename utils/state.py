@@ -0,0 +1,187 @@
+import hashlib
+import os
+import sqlite3
+import time
+from typing import Dict, List, Optional, Set
+
+from loguru import logger
+
+from settings import STATE_DB
+
+
+class StateStore:
+    """
+    Wallet progress in SQLite (WAL): named address sets (e.g. ambient badge current/finished accounts)
+    and wallets removed after processing. Every update is a single-row transaction, so a crash
+    never leaves a half-written file and other processes can read the state while a run is going.
+
+    Text files stay the import/export format: a set is re-imported from its file whenever the file
+    was edited since the last run, and export_files() writes all attached files back in one pass
+    """
+
+    def __init__(self, db_file: str = STATE_DB):
+        self.db_file = db_file
+        self.conn = None
+        # set name -> text file
+        self.files: Dict[str, str] = {}
+
+    def get_conn(self) -> sqlite3.Connection:
+        if self.conn is None:
+            os.makedirs(os.path.dirname(self.db_file) or ".", exist_ok=True)
+
+            self.conn = sqlite3.connect(self.db_file, timeout=30)
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.executescript("""
+                CREATE TABLE IF NOT EXISTS wallet_sets (
+                    name TEXT NOT NULL,
+                    address TEXT NOT NULL,
+                    added_at REAL NOT NULL,
+                    PRIMARY KEY (name, address)
+                );
+                CREATE TABLE IF NOT EXISTS imported_files (
+                    name TEXT PRIMARY KEY,
+                    file_name TEXT NOT NULL,
+                    file_hash TEXT
+                );
+                CREATE TABLE IF NOT EXISTS removed_wallets (
+                    address TEXT PRIMARY KEY,
+                    removed_at REAL NOT NULL
+                );
+            """)
+
+            # базы до появления file_hash: пустой хэш - файл будет импортирован заново
+            columns = [column[1] for column in self.conn.execute("PRAGMA table_info(imported_files)")]
+            if "file_hash" not in columns:
+                self.conn.execute("ALTER TABLE imported_files ADD COLUMN file_hash TEXT")
+
+        return self.conn
+
+    @staticmethod
+    def _file_hash(file_name: str) -> Optional[str]:
+        if not os.path.exists(file_name):
+            return None
+
+        with open(file_name, "rb") as file:
+            return hashlib.sha256(file.read()).hexdigest()
+
+    def attach_file(self, name: str, file_name: str):
+        """
+        Use file_name as the import/export format of the set. The file is imported on first use
+        and again whenever it changed since the last import or export, so edits between runs are kept
+        """
+        if self.files.get(name) == file_name:
+            return
+
+        self.files[name] = file_name
+
+        conn = self.get_conn()
+        file_hash = self._file_hash(file_name)
+        row = conn.execute("SELECT file_hash FROM imported_files WHERE name = ?", (name,)).fetchone()
+        if row is not None and (file_hash is None or row[0] == file_hash):
+            return
+
+        addresses = []
+        if file_hash is not None:
+            with open(file_name, "r") as file:
+                addresses = list(dict.fromkeys(line.strip().lower() for line in file if line.strip() != ""))
+
+        now = time.time()
+        with conn:
+            # файл - источник правды: удалённые из него адреса убираем, порядок новых сохраняем
+            conn.execute("CREATE TEMP TABLE IF NOT EXISTS file_addresses (address TEXT PRIMARY KEY)")
+            conn.execute("DELETE FROM file_addresses")
+            conn.executemany("INSERT INTO file_addresses VALUES (?)", [(address,) for address in addresses])
+            conn.execute(
+                "DELETE FROM wallet_sets WHERE name = ? AND address NOT IN (SELECT address FROM file_addresses)", (name,)
+            )
+            conn.executemany(
+                "INSERT OR IGNORE INTO wallet_sets VALUES (?, ?, ?)",
+                [(name, address, now + index * 1e-6) for index, address in enumerate(addresses)]
+            )
+            conn.execute("INSERT OR REPLACE INTO imported_files VALUES (?, ?, ?)", (name, file_name, file_hash))
+
+        logger.debug(f"Imported {len(addresses)} addresses from {file_name}")
+
+    def add(self, name: str, address: str) -> bool:
+        with self.get_conn() as conn:
+            cursor = conn.execute(
+                "INSERT OR IGNORE INTO wallet_sets VALUES (?, ?, ?)", (name, address.lower(), time.time())
+            )
+
+        return cursor.rowcount > 0
+
+    def remove(self, name: str, address: str) -> bool:
+        with self.get_conn() as conn:
+            cursor = conn.execute("DELETE FROM wallet_sets WHERE name = ? AND address = ?", (name, address.lower()))
+
+        return cursor.rowcount > 0
+
+    def move(self, address: str, from_name: str, to_name: str):
+        # в одной транзакции, чтобы аккаунт не потерялся между множествами
+        with self.get_conn() as conn:
+            conn.execute("DELETE FROM wallet_sets WHERE name = ? AND address = ?", (from_name, address.lower()))
+            conn.execute("INSERT OR IGNORE INTO wallet_sets VALUES (?, ?, ?)", (to_name, address.lower(), time.time()))
+
+    def contains(self, name: str, address: str) -> bool:
+        return self.get_conn().execute(
+            "SELECT 1 FROM wallet_sets WHERE name = ? AND address = ?", (name, address.lower())
+        ).fetchone() is not None
+
+    def members(self, name: str) -> List[str]:
+        rows = self.get_conn().execute(
+            "SELECT address FROM wallet_sets WHERE name = ? ORDER BY added_at", (name,)
+        ).fetchall()
+
+        return [address for address, in rows]
+
+    def remove_wallet(self, address: str):
+        with self.get_conn() as conn:
+            conn.execute("INSERT OR IGNORE INTO removed_wallets VALUES (?, ?)", (address.lower(), time.time()))
+
+    def removed_wallets(self) -> Set[str]:
+        return {address for address, in self.get_conn().execute("SELECT address FROM removed_wallets").fetchall()}
+
+    @staticmethod
+    def _write_lines(file_name: str, lines: List[str]):
+        os.makedirs(os.path.dirname(file_name) or ".", exist_ok=True)
+
+        tmp_file = f"{file_name}.tmp"
+        with open(tmp_file, "w") as file:
+            file.writelines(f"{line}\n" for line in lines)
+        os.replace(tmp_file, file_name)
+
+    def export_files(self):
+        conn = self.get_conn()
+
+        for name, file_name in self.files.items():
+            self._write_lines(file_name, self.members(name))
+
+            # свой экспорт не считается правкой файла
+            with conn:
+                conn.execute(
+                    "UPDATE imported_files SET file_hash = ? WHERE name = ?", (self._file_hash(file_name), name)
+                )
+
+    def export_accounts(self, file_name: str, addresses: Dict[str, str]):
+        """
+        Rewrite the key file without removed wallets, once per run instead of once per wallet.
+        addresses maps private key -> address
+        """
+        removed = self.removed_wallets()
+        if not removed or not os.path.exists(file_name):
+            return
+
+        with open(file_name, "r") as file:
+            keys = [row.strip() for row in file if row.strip() != ""]
+
+        kept = [key for key in keys if addresses.get(key, "").lower() not in removed]
+        if len(kept) != len(keys):
+            self._write_lines(file_name, kept)
+            logger.info(f"Removed {len(keys) - len(kept)} processed wallets from {file_name}")
+
+        # ключей больше нет в файле, если их добавят обратно - снова будут в работе
+        with self.get_conn() as conn:
+            conn.executemany("DELETE FROM removed_wallets WHERE address = ?", [(address,) for address in removed])
+
+
+state_store = StateStore()
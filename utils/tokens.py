@@ -0,0 +1,45 @@
+import json
+import os
+from typing import Dict, Optional
+
+from config import SCROLL_TOKENS, SCROLL_TOKENS_METADATA
+from settings import TOKENS_METADATA_FILE
+
+
+class TokenRegistry:
+    """
+    Persistent (chain, token) -> symbol/decimals cache, pre-seeded from SCROLL_TOKENS.
+    Unknown tokens are added once after the first on-chain read
+    """
+
+    def __init__(self, state_file: str = TOKENS_METADATA_FILE):
+        self.state_file = state_file
+        self.tokens: Dict[str, Dict] = {}
+
+        for name, address in SCROLL_TOKENS.items():
+            if name in SCROLL_TOKENS_METADATA:
+                self.tokens[self.get_key("scroll", address)] = SCROLL_TOKENS_METADATA[name]
+
+        if os.path.exists(self.state_file):
+            with open(self.state_file, "r") as file:
+                self.tokens.update(json.load(file))
+
+    @staticmethod
+    def get_key(chain: str, address: str) -> str:
+        return f"{chain}:{address.lower()}"
+
+    def get(self, chain: str, address: str) -> Optional[Dict]:
+        return self.tokens.get(self.get_key(chain, address))
+
+    def add(self, chain: str, address: str, symbol: str, decimal: int):
+        self.tokens[self.get_key(chain, address)] = {"symbol": symbol, "decimal": decimal}
+
+        os.makedirs(os.path.dirname(self.state_file) or ".", exist_ok=True)
+
+        tmp_file = f"{self.state_file}.tmp"
+        with open(tmp_file, "w") as file:
+            json.dump(self.tokens, file)
+        os.replace(tmp_file, self.state_file)
+
+
+token_registry = TokenRegistry()
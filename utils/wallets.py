@@ -0,0 +1,152 @@
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Set
+
+from eth_account import Account as EthereumAccount
+from eth_account.signers.local import LocalAccount
+from loguru import logger
+
+from config import ACCOUNTS
+from settings import WALLETS_INDEX_FILE, WALLETS_DERIVE_PROCESSES, WALLETS_PARALLEL_MIN
+
+
+def derive_addresses(keys: List[str]) -> List[str]:
+    return [EthereumAccount.from_key(key).address for key in keys]
+
+
+class WalletRegistry:
+    """
+    Private keys with their addresses derived once per process and indexed by key, address and id.
+
+    Large key lists are derived in a process pool. The id <-> address list is persisted to
+    WALLETS_INDEX_FILE together with a sha256 of the keys, so the same keys are not derived again
+    on the next start. Private keys are never written anywhere
+    """
+
+    def __init__(self, keys: List[str], index_file: str = WALLETS_INDEX_FILE):
+        self.keys = keys
+        self.index_file = index_file
+        self.wallets: List[Dict] = []
+        self.by_key: Dict[str, Dict] = {}
+        self.by_address: Dict[str, Dict] = {}
+        self.accounts: Dict[str, LocalAccount] = {}
+
+    def _keys_stamp(self) -> str:
+        # хэш самих ключей: размер и mtime файла совпадают и после cp -p / восстановления из бэкапа
+        return hashlib.sha256("\n".join(self.keys).encode()).hexdigest()
+
+    def _load_index(self, stamp: str) -> Optional[List[str]]:
+        if not self.index_file or not os.path.exists(self.index_file):
+            return None
+
+        try:
+            with open(self.index_file, "r") as file:
+                index = json.load(file)
+        except (OSError, ValueError):
+            return None
+
+        return index["addresses"] if index.get("stamp") == stamp else None
+
+    def _save_index(self, stamp: str, addresses: List[str]):
+        if not self.index_file:
+            return
+
+        os.makedirs(os.path.dirname(self.index_file) or ".", exist_ok=True)
+
+        tmp_file = f"{self.index_file}.tmp"
+        with open(tmp_file, "w") as file:
+            json.dump({"stamp": stamp, "addresses": addresses}, file)
+        os.replace(tmp_file, self.index_file)
+
+    def _derive(self) -> List[str]:
+        processes = WALLETS_DERIVE_PROCESSES or os.cpu_count() or 1
+
+        if len(self.keys) < WALLETS_PARALLEL_MIN or processes < 2:
+            return derive_addresses(self.keys)
+
+        chunk_size = -(-len(self.keys) // (processes * 4))
+        chunks = [self.keys[i:i + chunk_size] for i in range(0, len(self.keys), chunk_size)]
+
+        logger.info(f"Derive {len(self.keys)} addresses in {processes} processes")
+
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            return [address for addresses in executor.map(derive_addresses, chunks) for address in addresses]
+
+    def load(self):
+        if self.wallets or not self.keys:
+            return
+
+        stamp = self._keys_stamp()
+        addresses = self._load_index(stamp)
+
+        if addresses is None:
+            addresses = self._derive()
+            self._save_index(stamp, addresses)
+
+        for _id, (key, address) in enumerate(zip(self.keys, addresses), start=1):
+            wallet = {"id": _id, "key": key, "address": address}
+
+            self.wallets.append(wallet)
+            self.by_key.setdefault(key, wallet)
+            self.by_address.setdefault(address.lower(), wallet)
+
+    def get_wallets(self) -> List[Dict]:
+        self.load()
+
+        return self.wallets
+
+    def get_address(self, key: str) -> str:
+        self.load()
+
+        wallet = self.by_key.get(key)
+        if wallet is None:
+            # ключ не из accounts.txt
+            wallet = {"id": None, "key": key, "address": derive_addresses([key])[0]}
+            self.by_key[key] = wallet
+
+        return wallet["address"]
+
+    def get_account(self, key: str) -> LocalAccount:
+        if key not in self.accounts:
+            self.accounts[key] = EthereumAccount.from_key(key)
+
+        return self.accounts[key]
+
+    def get_by_address(self, address: str) -> Optional[Dict]:
+        self.load()
+
+        return self.by_address.get(address.lower())
+
+    def get_by_id(self, _id: int) -> Optional[Dict]:
+        self.load()
+
+        return self.wallets[_id - 1] if 0 < _id <= len(self.wallets) else None
+
+    @staticmethod
+    def load_whitelist(file_name: str = "wl.txt") -> Optional[Set[str]]:
+        if not os.path.exists(file_name):
+            return None
+
+        with open(file_name, "r") as file:
+            return {line.strip().lower() for line in file if line.strip()}
+
+    def filter_addresses(self, wallets: List[Dict], addresses: Set[str]) -> List[Dict]:
+        """
+        Keep wallets whose address is in the lowercase address set, one wallet per address
+        """
+        seen = set()
+        result = []
+
+        for wallet in wallets:
+            address = self.get_address(wallet["key"]).lower()
+
+            if address in addresses and address not in seen:
+                seen.add(address)
+                result.append(wallet)
+
+        return result
+
+
+wallet_registry = WalletRegistry(ACCOUNTS)